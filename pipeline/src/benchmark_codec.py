@@ -0,0 +1,81 @@
+"""
+Benchmark da gravação e leitura de NDJSON: stdlib (json.dumps por registro, como era antes do utils.codec)
+contra o utils.codec (orjson + gravação em lotes).
+
+Uso (a partir de pipeline/): PYTHONPATH=src python src/benchmark_codec.py [arquivo.ndjson]
+Sem arquivo, gera registros sintéticos no formato das despesas de deputados.
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from utils import codec
+from utils.io import load_ndjson, save_ndjson
+
+
+def synthetic_records(n: int = 200_000) -> list[dict]:
+    return [
+        {
+            "ano": 2024,
+            "mes": i % 12 + 1,
+            "tipoDespesa": "COMBUSTÍVEIS E LUBRIFICANTES.",
+            "codDocumento": 7_000_000 + i,
+            "tipoDocumento": "Nota Fiscal Eletrônica",
+            "dataDocumento": "2024-03-05T00:00:00",
+            "numDocumento": str(100_000 + i),
+            "valorDocumento": 250.37 + i % 100,
+            "urlDocumento": f"https://www.camara.leg.br/cota-parlamentar/nota-fiscal-eletronica?ideDocumentoFiscal={i}",
+            "nomeFornecedor": "AUTO POSTO SÃO JOÃO LTDA",
+            "cnpjCpfFornecedor": "12345678000190",
+            "valorLiquido": 250.37,
+            "valorGlosa": 0.0,
+            "numRessarcimento": "",
+            "codLote": 1_900_000 + i // 10,
+            "parcela": 0,
+        }
+        for i in range(n)
+    ]
+
+
+def stdlib_save(records: list[dict], path: Path):
+    with open(path, "w", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+
+def stdlib_load(path: Path) -> list[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def measure(label: str, n: int, fn):
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {n / elapsed:>14,.0f} registros/s ({elapsed:.2f}s)")
+
+
+def main():
+    if len(sys.argv) > 1:
+        records = stdlib_load(Path(sys.argv[1]))
+    else:
+        records = synthetic_records()
+
+    n = len(records)
+    print(f"{n} registros, backend do codec: {codec.BACKEND}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = Path(tmp) / "stdlib.ndjson"
+        after = Path(tmp) / "codec.ndjson"
+
+        measure("gravação stdlib", n, lambda: stdlib_save(records, before))
+        measure("gravação codec", n, lambda: save_ndjson(records, after))
+        measure("leitura stdlib", n, lambda: stdlib_load(before))
+        measure("leitura codec", n, lambda: load_ndjson(after))
+
+
+if __name__ == "__main__":
+    main()
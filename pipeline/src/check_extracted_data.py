@@ -5,38 +5,39 @@ import pandas as pd
 from config.parameters import ExtractOutDir
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_ndjson
+from utils.ndjson_index import indexed_ids
+
+
+def missing_orgaos_ids(eventos: list[dict], ids_orgaos: set[str]) -> list[int]:
+    """
+    Ids dos órgãos citados nos eventos que não existem no NDJSON de órgãos.
+    """
+    df_eventos = pd.json_normalize(eventos)
+    if "orgaos" not in df_eventos:
+        return []
+
+    df_eventos_orgaos = df_eventos.explode("orgaos")
+    # Eventos sem órgãos viram NaN no explode, o que tornaria a coluna float (180 -> "180.0")
+    id_orgao = (
+        df_eventos_orgaos["orgaos"]
+        .apply(lambda x: x.get("id") if isinstance(x, dict) else None)
+        .dropna()
+        .astype("Int64")
+    )
+    return sorted(id_orgao[~id_orgao.astype(str).isin(ids_orgaos)].unique().tolist())
 
 
 async def start():
-    jsons_orgaos = load_ndjson(ExtractOutDir.CAMARA.ORGAOS)
+    # Os ids dos órgãos vêm do índice do NDJSON, sem decodificar o arquivo
+    ids_orgaos = indexed_ids(ExtractOutDir.CAMARA.ORGAOS)
     jsons_eventos = load_ndjson(ExtractOutDir.CAMARA.EVENTOS)
 
-    lista_orgaos = []
     lista_eventos = []
-    for item in jsons_orgaos:
-        for orgao in item.get("dados", []):
-            lista_orgaos.append(orgao)
-
     for item in jsons_eventos:
         for evento in item.get("dados", []):
             lista_eventos.append(evento)
 
-    df_orgaos = pd.json_normalize(lista_orgaos)
-    df_eventos = pd.json_normalize(lista_eventos)
-
-    df_eventos_orgaos = df_eventos.explode("orgaos")
-    df_eventos_orgaos["id_orgao"] = df_eventos_orgaos["orgaos"].apply(
-        lambda x: x.get("id") if isinstance(x, dict) else None
-    )
-    ids_missing = (
-        df_eventos_orgaos.loc[
-            ~df_eventos_orgaos["id_orgao"].isin(df_orgaos["id"]), "id_orgao"
-        ]
-        .dropna()
-        .unique()
-    )
-
-    print(ids_missing)
+    print(missing_orgaos_ids(lista_eventos, ids_orgaos))
 
 
 if __name__ == "__main__":
@@ -21,13 +21,33 @@ class FlowConfig(BaseModel):
     TIMEOUT: int
 
 
+class HttpCacheConfig(BaseModel):
+    DIR: str
+    MAX_SIZE_MB: int
+    PAGE_COUNTS_FILE: str
+
+
+class ArchiveConfig(BaseModel):
+    DIR: str
+
+
 class LoadConfig(BaseModel):
     USE_FILES: bool
+    PARQUET: bool
+    PARQUET_PARTITIONS: dict[str, list[str]]
+    ZSTD: bool
+    ZSTD_LEVEL: int
+    ZSTD_DICT_DIR: str
+    ZSTD_DICT_SIZE: int
+    ASYNC_DB: bool
 
 
 class AllEndpointsConfig(BaseModel):
     FETCH_MAX_RETRIES: int
     FETCH_RETRY_DELAY: int
+    FETCH_RETRY_MAX_DELAY: float
+    FETCH_P95_LATENCY_TARGET: float
+    FETCH_MAX_ERROR_RATE: float
 
 
 class TSEConfig(BaseModel):
@@ -37,6 +57,9 @@ class TSEConfig(BaseModel):
     TASK_RETRY_DELAY: int
     CACHE_POLICY: str
     CACHE_EXPIRATION: int
+    DOWNLOAD_SEGMENTS: int
+    RATE_LIMIT_RPS: float
+    RATE_LIMIT_BURST: int
 
 
 class CamaraConfig(BaseModel):
@@ -46,6 +69,9 @@ class CamaraConfig(BaseModel):
     TASK_RETRIES: int
     TASK_RETRY_DELAY: int
     FETCH_LIMIT: int
+    FETCH_LIMIT_MAX: int
+    RATE_LIMIT_RPS: float
+    RATE_LIMIT_BURST: int
 
 
 class SenadoConfig(BaseModel):
@@ -54,12 +80,17 @@ class SenadoConfig(BaseModel):
     TASK_RETRIES: int
     TASK_RETRY_DELAY: int
     FETCH_LIMIT: int
+    FETCH_LIMIT_MAX: int
+    RATE_LIMIT_RPS: float
+    RATE_LIMIT_BURST: int
 
 
 class AppConfig(BaseModel):
     FLOW: FlowConfig
     ALLENDPOINTS: AllEndpointsConfig
+    HTTP_CACHE: HttpCacheConfig
     LOAD: LoadConfig
+    ARCHIVE: ArchiveConfig
     TSE: TSEConfig
     CAMARA: CamaraConfig
     SENADO: SenadoConfig
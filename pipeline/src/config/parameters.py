@@ -143,6 +143,8 @@ class ExtractOutDir:
         )
         DEPUTADOS_ASSIDUIDADE_PLENARIO = f"{APP_SETTINGS.CAMARA.OUTPUT_EXTRACT_DIR}/deputados_assiduidade_plenario.zip"
         DEPUTADOS_ASSIDUIDADE_COMISSOES = f"{APP_SETTINGS.CAMARA.OUTPUT_EXTRACT_DIR}/deputados_assiduidade_comissoes.zip"
+        DEPUTADOS_ASSIDUIDADE_PLENARIO_PRESENCAS = f"{APP_SETTINGS.CAMARA.OUTPUT_EXTRACT_DIR}/deputados_assiduidade_plenario.ndjson"
+        DEPUTADOS_ASSIDUIDADE_COMISSOES_PRESENCAS = f"{APP_SETTINGS.CAMARA.OUTPUT_EXTRACT_DIR}/deputados_assiduidade_comissoes.ndjson"
         FRENTES = f"{APP_SETTINGS.CAMARA.OUTPUT_EXTRACT_DIR}/frentes.ndjson"
         FRENTES_MEMBROS = (
             f"{APP_SETTINGS.CAMARA.OUTPUT_EXTRACT_DIR}/frentes_membros.ndjson"
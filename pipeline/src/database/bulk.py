@@ -0,0 +1,283 @@
+import csv
+import datetime
+import io
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY, Insert, insert
+from sqlalchemy.sql.elements import ColumnElement
+
+from database.models.base import LoteProveniencia
+from utils import codec
+from utils.db import CONTROL_COLUMNS, key_hash, row_hash
+
+# Bytes lidos por vez pelo COPY a partir do gerador de linhas CSV
+COPY_BUFFER_SIZE = 1024 * 1024
+# Coluna da staging com a ordem de chegada das linhas, usada para desempatar chaves repetidas
+ORDER_COLUMN = "_ordem"
+HASH_COLUMN = "hash_linha"
+
+lote_proveniencia = LoteProveniencia.__table__
+
+_preparer = postgresql.dialect().identifier_preparer
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return codec.dumps(value).decode("utf-8")
+    return value
+
+
+class CsvCopyStream:
+    """
+    Arquivo somente leitura que gera, sob demanda, as linhas CSV para o COPY ... FROM STDIN.
+    As linhas nunca ficam todas em memória: o driver lê alguns bytes por vez e o gerador de registros avança junto.
+    None vira campo vazio sem aspas (NULL no COPY) e texto vazio vira "", para os dois não se confundirem.
+    """
+
+    def __init__(self, rows: Iterable[Sequence[Any]]):
+        self.count = 0
+        self._rows = iter(rows)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(
+            self._buffer, quoting=csv.QUOTE_NOTNULL, lineterminator="\n"
+        )
+        self._pending = b""
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._pending) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._writer.writerow([_csv_value(v) for v in row])
+            self.count += 1
+            if self._buffer.tell() >= COPY_BUFFER_SIZE:
+                self._flush()
+        self._flush()
+
+        if size < 0:
+            data, self._pending = self._pending, b""
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def _flush(self):
+        if self._buffer.tell():
+            self._pending += self._buffer.getvalue().encode("utf-8")
+            self._buffer.seek(0)
+            self._buffer.truncate()
+
+
+class HashDiff:
+    """
+    Diferença, feita no cliente, entre as linhas do load (tuplas na ordem de `columns`) e as já gravadas.
+    Os hashes da tabela são lidos uma vez por load. Só seguem para o COPY as linhas novas ou com hash diferente,
+    com o hash_linha acrescentado ao final da tupla. As demais são contadas em `unchanged`.
+    """
+
+    def __init__(
+        self, known: dict[tuple, str], key: Sequence[str], columns: Sequence[str]
+    ):
+        self.known = known
+        self._key = [columns.index(k) for k in key]
+        self._values = [i for i, c in enumerate(columns) if c not in CONTROL_COLUMNS]
+        self.unchanged = 0
+
+    @staticmethod
+    def statement(table: sa.Table, key: Sequence[str]) -> sa.Select:
+        return sa.select(*[table.c[k] for k in key], table.c[HASH_COLUMN]).where(
+            table.c[HASH_COLUMN].isnot(None)
+        )
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[Sequence[Any]], key: Sequence[str], columns: Sequence[str]
+    ) -> "HashDiff":
+        """
+        Monta a diferença a partir das linhas (chave..., hash_linha) retornadas por `statement`.
+        """
+        return cls({tuple(row[:-1]): row[-1] for row in rows}, key, columns)
+
+    @classmethod
+    def load(
+        cls,
+        conn: sa.Connection,
+        table: sa.Table,
+        key: Sequence[str],
+        columns: Sequence[str],
+    ) -> "HashDiff":
+        return cls.from_rows(conn.execute(cls.statement(table, key)), key, columns)
+
+    def row_hash(self, row: Sequence[Any]) -> str:
+        return row_hash([row[i] for i in self._values])
+
+    def filter(self, rows: Iterable[tuple]) -> Iterator[tuple]:
+        for row in rows:
+            digest = self.row_hash(row)
+            if self.known.get(tuple(row[i] for i in self._key)) == digest:
+                self.unchanged += 1
+                continue
+            yield (*row, digest)
+
+
+class Provenance:
+    """
+    Coleta o hash da chave natural de cada linha do load, inclusive das que o HashDiff não envia ao banco.
+    """
+
+    def __init__(self, key: Sequence[str], columns: Sequence[str]):
+        self._key = [columns.index(k) for k in key]
+        self.hashes: set[str] = set()
+
+    def track(self, rows: Iterable[tuple]) -> Iterator[tuple]:
+        for row in rows:
+            self.hashes.add(key_hash([row[i] for i in self._key]))
+            yield row
+
+
+def provenance_statement(
+    table: sa.Table, id_lote: int, hashes: Iterable[str]
+) -> Insert:
+    """
+    Marca as linhas como vistas no lote, em um único comando (os hashes vão em um só parâmetro, como array).
+    Linhas novas na tabela lote_proveniencia recebem o lote como primeiro e último; as demais só têm o
+    último lote atualizado.
+    """
+    keys = (
+        sa.func.unnest(sa.bindparam("hashes", list(hashes), type_=ARRAY(sa.Text)))
+        .table_valued("chave_hash")
+        .render_derived(name="chaves")
+    )
+
+    stmt = insert(lote_proveniencia).from_select(
+        ["tabela", "chave_hash", "primeiro_lote", "ultimo_lote"],
+        sa.select(
+            sa.literal(table.name),
+            keys.c.chave_hash,
+            sa.literal(id_lote),
+            sa.literal(id_lote),
+        ),
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=["tabela", "chave_hash"],
+        set_={"ultimo_lote": stmt.excluded.ultimo_lote},
+        where=lote_proveniencia.c.ultimo_lote < stmt.excluded.ultimo_lote,
+    )
+
+
+def record_provenance(
+    conn: sa.Connection, table: sa.Table, id_lote: int, hashes: Iterable[str]
+):
+    conn.execute(provenance_statement(table, id_lote, hashes))
+
+
+def staging_sql(
+    table: sa.Table, staging: str, columns: Sequence[str]
+) -> tuple[list[str], str]:
+    """
+    Comandos que criam a staging temporária (sem WAL, descartada no commit) com os tipos das colunas da tabela
+    de destino, e o COPY ... FROM STDIN (CSV) que a preenche.
+    """
+    quote = _preparer.quote
+    cols = ", ".join(quote(c) for c in columns)
+    ddl = [
+        f"DROP TABLE IF EXISTS {quote(staging)}",
+        f"CREATE TEMP TABLE {quote(staging)} ON COMMIT DROP AS "
+        f"SELECT {cols} FROM {_preparer.format_table(table)} WITH NO DATA",
+        f"ALTER TABLE {quote(staging)} ADD COLUMN {ORDER_COLUMN} bigint GENERATED ALWAYS AS IDENTITY",
+    ]
+    copy = f"COPY {quote(staging)} ({cols}) FROM STDIN WITH (FORMAT csv)"
+    return ddl, copy
+
+
+def copy_to_staging(
+    conn: sa.Connection, ddl: Sequence[str], copy: str, rows: Iterable[tuple]
+) -> int:
+    """
+    Cria a staging e a preenche com as linhas. Retorna o número de linhas copiadas.
+    """
+    for stmt in ddl:
+        conn.execute(sa.text(stmt))
+
+    stream = CsvCopyStream(rows)
+    # Mesmo cursor DBAPI (psycopg2) da conexão, então o COPY faz parte da mesma transação
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(copy, stream, size=COPY_BUFFER_SIZE)  # type: ignore
+    finally:
+        cursor.close()
+
+    return stream.count
+
+
+def merge_statement(
+    table: sa.Table,
+    staging: str,
+    columns: Sequence[str],
+    index_elements: Sequence[str],
+    update: Sequence[str] | None = None,
+    where: Callable[[Insert], ColumnElement[bool]] | None = None,
+    prefer_not_null: Sequence[str] = (),
+) -> sa.Select:
+    """
+    Monta o INSERT ... SELECT ... ON CONFLICT da staging para a tabela de destino, em um único comando.
+    - Chaves repetidas na staging ficam uma vez só (DISTINCT ON): a primeira que chegou, a não ser que outra tenha
+      as colunas de `prefer_not_null` preenchidas.
+    - Sem `update`, é ON CONFLICT DO NOTHING. Com `update`, atualiza essas colunas quando `where` for verdadeiro
+      (padrão: o hash_linha mudou ou, sem ele, alguma das colunas que não são de controle mudou).
+      Colunas de `update` que não foram carregadas são ignoradas.
+    - Retorna (inseridas, atualizadas), contando pelo xmax das linhas do RETURNING:
+      xmax = 0 indica linha nova, senão linha atualizada.
+    """
+    stg = sa.table(staging, *[sa.column(c) for c in [*columns, ORDER_COLUMN]])
+    keys = [stg.c[k] for k in index_elements]
+
+    src = (
+        sa.select(*[stg.c[c] for c in columns])
+        .distinct(*keys)
+        .order_by(
+            *keys, *[stg.c[c].is_(None) for c in prefer_not_null], stg.c[ORDER_COLUMN]
+        )
+        .cte("src")
+    )
+
+    stmt = insert(table).from_select(
+        list(columns), sa.select(*[src.c[c] for c in columns])
+    )
+
+    update_columns = [table.c[c] for c in update or [] if c in columns]
+    # Com hash_linha, a linha mudou se o hash mudou
+    compare = (
+        [table.c[HASH_COLUMN]]
+        if HASH_COLUMN in (update or [])
+        else [c for c in update_columns if c.name not in CONTROL_COLUMNS]
+    )
+    if update_columns:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(index_elements),
+            set_={c.name: stmt.excluded[c.name] for c in update_columns},
+            where=(
+                where(stmt)
+                if where is not None
+                else sa.or_(
+                    *[c.is_distinct_from(stmt.excluded[c.name]) for c in compare]
+                )
+            ),
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=list(index_elements))
+
+    merged = stmt.returning(sa.literal_column("xmax")).cte("merged")
+    xmax = sa.cast(sa.cast(merged.c.xmax, sa.Text), sa.BigInteger)
+
+    return sa.select(
+        sa.func.count().filter(xmax == 0),
+        sa.func.count().filter(xmax != 0),
+    ).select_from(merged)
@@ -1,12 +1,16 @@
 import os
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 
 load_dotenv()
 
 _engine = None
+_async_engine = None
+
+# Driver do engine assíncrono: psycopg 3, que tem modo pipeline e COPY assíncrono
+ASYNC_DRIVER = "postgresql+psycopg"
 
 
 def get_engine(database_url: str = os.getenv("DATABASE_URL", "")):
@@ -43,3 +47,44 @@ def get_connection():
         raise ValueError("Não existe uma Engine aberta para utilizar uma Conexão.")
     with engine.begin() as conn:
         yield conn
+
+
+def async_engine_available() -> bool:
+    try:
+        import greenlet  # noqa: F401
+        import psycopg  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_async_engine(database_url: str = os.getenv("DATABASE_URL", "")):
+    """
+    Retorna o engine assíncrono singleton (psycopg 3), usado pelos loads. O engine síncrono continua sendo
+    o usado pelos scripts e pelas migrations.
+    A pool é separada da pool do engine síncrono: somando as duas, cuidado com o limite de conexões do banco.
+    """
+    global _async_engine
+
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        _async_engine = create_async_engine(
+            url=make_url(database_url).set(drivername=ASYNC_DRIVER),
+            echo=False,
+            pool_size=5,
+            max_overflow=5,
+            pool_timeout=30,
+        )
+
+    return _async_engine
+
+
+@asynccontextmanager
+async def get_async_connection():
+    """
+    Versão assíncrona do get_connection: uma conexão do pool assíncrono, em uma transação.
+    """
+    engine = get_async_engine()
+    async with engine.begin() as conn:
+        yield conn
@@ -58,6 +58,7 @@ class RowsModified(TypedDict):
     inserted: int
     updated: int
     ignored: int
+    unchanged: int
     total: int
 
 
@@ -125,4 +126,19 @@ class LogLinhas(Base):
     inseridos = sa.Column(sa.Integer, nullable=False)
     atualizados = sa.Column(sa.Integer, nullable=False)
     ignorados = sa.Column(sa.Integer, nullable=False)
+    inalterados = sa.Column(sa.Integer, nullable=False, server_default="0")
     total = sa.Column(sa.Integer, nullable=False)
+
+
+class LoteProveniencia(Base):
+    """
+    Primeiro e último lote em que cada linha (tabela + hash da chave natural) foi vista.
+    Fica fora das tabelas de domínio para que elas só sejam reescritas quando o conteúdo da linha muda.
+    """
+
+    __tablename__ = "lote_proveniencia"
+
+    tabela = sa.Column(sa.Text, primary_key=True)
+    chave_hash = sa.Column(sa.CHAR(32), primary_key=True)
+    primeiro_lote = sa.Column(sa.Integer, sa.ForeignKey("lote.id"), nullable=False)
+    ultimo_lote = sa.Column(sa.Integer, sa.ForeignKey("lote.id"), nullable=False)
@@ -2,7 +2,7 @@ import sqlalchemy as sa
 from pydantic import BaseModel
 
 from database.models.base import Base
-from database.models.mixins import BaseMixin
+from database.models.mixins import BaseMixin, HashMixin
 
 
 class CamaraBlocosArg(BaseModel):
@@ -46,7 +46,7 @@ class CamaraBlocos(Base, BaseMixin):
     federacao = sa.Column(sa.Boolean, nullable=False)
 
 
-class CamaraBlocosPartidos(Base, BaseMixin):
+class CamaraBlocosPartidos(Base, BaseMixin, HashMixin):
     __tablename__ = "camara_blocos_partidos"
 
     id_bloco = sa.Column(sa.Integer, nullable=False)
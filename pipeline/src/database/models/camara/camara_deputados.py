@@ -4,7 +4,7 @@ import sqlalchemy as sa
 from pydantic import BaseModel
 
 from database.models.base import Base
-from database.models.mixins import BaseMixin
+from database.models.mixins import BaseMixin, HashMixin
 
 
 class CamaraDeputadosArg(BaseModel):
@@ -164,7 +164,7 @@ class CamaraDeputadosProfissoesArg(BaseModel):
     titulo: str
 
 
-class CamaraDeputados(Base, BaseMixin):
+class CamaraDeputados(Base, BaseMixin, HashMixin):
     __tablename__ = "camara_deputados"
 
     id_deputado = sa.Column(sa.Integer, unique=True, nullable=False)
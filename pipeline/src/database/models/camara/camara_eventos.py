@@ -4,7 +4,7 @@ import sqlalchemy as sa
 from pydantic import BaseModel
 
 from database.models.base import Base
-from database.models.mixins import BaseMixin
+from database.models.mixins import BaseMixin, HashMixin
 
 
 class CamaraEventosArg(BaseModel):
@@ -45,7 +45,7 @@ class CamaraEventosOrgaosArg(BaseModel):
     id_orgao: int
 
 
-class CamaraEventos(Base, BaseMixin):
+class CamaraEventos(Base, BaseMixin, HashMixin):
     __tablename__ = "camara_eventos"
 
     id_evento = sa.Column(sa.Integer, nullable=False, unique=True)
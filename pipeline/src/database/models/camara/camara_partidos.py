@@ -4,7 +4,7 @@ import sqlalchemy as sa
 from pydantic import BaseModel
 
 from database.models.base import Base
-from database.models.mixins import BaseMixin
+from database.models.mixins import BaseMixin, HashMixin
 
 
 class CamaraPartidosArg(BaseModel):
@@ -33,7 +33,7 @@ class CamaraPartidosArg(BaseModel):
     id_lider: int | None
 
 
-class CamaraPartidos(Base, BaseMixin):
+class CamaraPartidos(Base, BaseMixin, HashMixin):
     __tablename__ = "camara_partidos"
 
     id_partido = sa.Column(sa.Integer, unique=True, nullable=False)
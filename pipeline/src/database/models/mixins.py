@@ -4,3 +4,8 @@ import sqlalchemy as sa
 class BaseMixin:
     id_lote = sa.Column(sa.Integer, sa.ForeignKey("lote.id"), nullable=False)
     id = sa.Column(sa.Integer, sa.Identity(start=1, cycle=False), primary_key=True)
+
+
+class HashMixin:
+    # Hash das colunas de negócio da linha. No load, as linhas com o mesmo hash não são enviadas ao banco
+    hash_linha = sa.Column(sa.CHAR(32), nullable=True)
@@ -1,97 +1,25 @@
-import sqlalchemy as sa
-from sqlalchemy.dialects.postgresql import insert
+from typing import Iterable
 
-from database.engine import get_connection
 from database.models.camara.camara_blocos import (
-    CamaraBlocos,
     CamaraBlocosArg,
-    CamaraBlocosPartidos,
     CamaraBlocosPartidosArg,
 )
-from database.repository.logs import insert_log_linhas_db
-
-camara_blocos = CamaraBlocos.__table__
-camara_blocos_partidos = CamaraBlocosPartidos.__table__
-
-
-def insert_camara_blocos_db(data: list[CamaraBlocosArg]):
-    with get_connection() as conn:
-        stmt = (
-            insert(camara_blocos)
-            .values(
-                [
-                    {
-                        "id_lote": item.id_lote,
-                        "id_bloco": item.id_bloco,
-                        "nome": item.nome,
-                        "id_legislatura": item.id_legislatura,
-                        "federacao": item.federacao,
-                    }
-                    for item in data
-                ]
-            )
-            .on_conflict_do_nothing(index_elements=["id_bloco"])
-        )
-
-        result = conn.execute(stmt)
+from database.upsert import ConflictPolicy, TableSpec, upsert_async
+
+CAMARA_BLOCOS = TableSpec("camara_blocos", key=("id_bloco",))
+CAMARA_BLOCOS_PARTIDOS = TableSpec(
+    "camara_blocos_partidos",
+    key=("sigla",),
+    policy=ConflictPolicy.UPDATE,
+    immutable=("nome",),
+)
 
-        total = len(data)
-        inserted = result.rowcount
-        updated = 0  # Não atualiza
-        ignored = total - inserted
 
-        insert_log_linhas_db(
-            id_lote=data[0].id_lote,
-            table=camara_blocos.name,
-            inserted=inserted,
-            updated=updated,
-            ignored=ignored,
-            total=total,
-        )
+async def insert_camara_blocos_db(data: Iterable[CamaraBlocosArg]):
+    await upsert_async(CAMARA_BLOCOS, data)
 
 
-def insert_camara_blocos_partidos_db(
-    data: list[CamaraBlocosPartidosArg],
+async def insert_camara_blocos_partidos_db(
+    data: Iterable[CamaraBlocosPartidosArg],
 ):
-    with get_connection() as conn:
-        stmt = insert(camara_blocos_partidos).values(
-            [
-                {
-                    "id_lote": item.id_lote,
-                    "id_bloco": item.id_bloco,
-                    "sigla": item.sigla,
-                    "nome": item.nome,
-                }
-                for item in data
-            ]
-        )
-
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["sigla"],
-            set_={
-                "id_bloco": stmt.excluded.id_bloco,
-            },
-            where=stmt.excluded.id_bloco.is_distinct_from(
-                camara_blocos_partidos.c.id_bloco
-            ),
-        )
-
-        stmt = stmt.returning(camara_blocos_partidos.c.id, sa.text("xmax"))
-
-        result = conn.execute(stmt)
-
-        rows = result.fetchall()
-
-        total = len(data)
-        inserted = sum(1 for row in rows if int(row.xmax) == 0)
-        updated = sum(1 for row in rows if int(row.xmax) != 0)
-        ignored = total - len(rows)
-
-        insert_log_linhas_db(
-            id_lote=data[0].id_lote,
-            table=camara_blocos_partidos.name,
-            inserted=inserted,
-            updated=updated,
-            ignored=ignored,
-            total=total,
-        )
+    await upsert_async(CAMARA_BLOCOS_PARTIDOS, data)
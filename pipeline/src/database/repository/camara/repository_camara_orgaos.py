@@ -1,140 +1,36 @@
-from sqlalchemy import and_, text
-from sqlalchemy.dialects.postgresql import insert
+from typing import Iterable
 
-from database.engine import get_connection
 from database.models.camara.camara_orgaos import (
-    CamaraOrgaos,
     CamaraOrgaosArg,
-    CamaraOrgaosMembros,
     CamaraOrgaosMembrosArg,
-    CamaraOrgaosTipos,
     CamaraOrgaosTiposArg,
 )
-from database.repository.logs import insert_log_linhas_db
-
-camara_orgaos_tipos = CamaraOrgaosTipos.__table__
-camara_orgaos = CamaraOrgaos.__table__
-camara_orgaos_membros = CamaraOrgaosMembros.__table__
-
-
-def insert_camara_orgaos_tipos_db(data: list[CamaraOrgaosTiposArg]):
-    with get_connection() as conn:
-        stmt = (
-            insert(camara_orgaos_tipos)
-            .values(
-                [
-                    {
-                        "id_lote": tipo.id_lote,
-                        "id_tipo_orgao": tipo.id_tipo_orgao,
-                        "nome": tipo.nome,
-                    }
-                    for tipo in data
-                ]
-            )
-            .on_conflict_do_nothing(index_elements=["id_tipo_orgao", "nome"])
-        )
-
-        result = conn.execute(stmt)
-
-        total = len(data)
-        inserted = result.rowcount
-        updated = 0  # Não atualiza
-        ignored = total - inserted
-
-        insert_log_linhas_db(
-            id_lote=data[0].id_lote,
-            table=camara_orgaos_tipos.name,
-            inserted=inserted,
-            updated=updated,
-            ignored=ignored,
-            total=total,
-        )
-
-    return
-
-
-def insert_camara_orgaos_db(data: list[CamaraOrgaosArg]):
-    with get_connection() as conn:
-        stmt = (
-            insert(camara_orgaos)
-            .values(
-                [
-                    {
-                        "id_lote": orgao.id_lote,
-                        "id_orgao": orgao.id_orgao,
-                        "sigla": orgao.sigla,
-                        "nome": orgao.nome,
-                        "apelido": orgao.apelido,
-                        "id_tipo_orgao": orgao.id_tipo_orgao,
-                        "nome_publicacao": orgao.nome_publicacao,
-                        "nome_resumido": orgao.nome_resumido,
-                    }
-                    for orgao in data
-                ]
-            )
-            .on_conflict_do_nothing(index_elements=["id_orgao"])
-        )
-
-        result = conn.execute(stmt)
-
-        total = len(data)
-        inserted = result.rowcount
-        updated = 0  # Não atualiza
-        ignored = total - inserted
-
-        insert_log_linhas_db(
-            id_lote=data[0].id_lote,
-            table=camara_orgaos.name,
-            inserted=inserted,
-            updated=updated,
-            ignored=ignored,
-            total=total,
-        )
-
-    return
+from database.upsert import ConflictPolicy, TableSpec, upsert_async
+
+CAMARA_ORGAOS_TIPOS = TableSpec("camara_orgaos_tipos", key=("id_tipo_orgao", "nome"))
+CAMARA_ORGAOS = TableSpec("camara_orgaos", key=("id_orgao",))
+CAMARA_ORGAOS_MEMBROS = TableSpec(
+    "camara_orgaos_membros",
+    key=("id_orgao", "id_deputado", "titulo", "data_inicio"),
+    policy=ConflictPolicy.CLOSE,
+    close_column="data_fim",
+)
 
 
-def insert_camara_orgaos_membros_db(data: list[CamaraOrgaosMembrosArg]):
-    with get_connection() as conn:
-        stmt = insert(camara_orgaos_membros).values(
-            [
-                {
-                    "id_lote": item.id_lote,
-                    "id_orgao": item.id_orgao,
-                    "id_deputado": item.id_deputado,
-                    "id_legislatura": item.id_legislatura,
-                    "titulo": item.titulo,
-                    "data_inicio": item.data_inicio,
-                    "data_fim": item.data_fim,
-                }
-                for item in data
-            ]
-        )
+async def insert_camara_orgaos_tipos_db(data: Iterable[CamaraOrgaosTiposArg]):
+    await upsert_async(CAMARA_ORGAOS_TIPOS, data)
 
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["id_orgao", "id_deputado", "titulo", "data_inicio"],
-            set_={"data_fim": stmt.excluded.data_fim, "id_lote": stmt.excluded.id_lote},
-            where=and_(
-                stmt.excluded.data_fim.isnot(None),
-                camara_orgaos_membros.c.data_fim.is_(None),
-            ),
-        )
 
-        stmt_ocupacoes = stmt.returning(camara_orgaos_membros.c.id, text("xmax"))
-        result = conn.execute(stmt_ocupacoes)
-        rows = result.fetchall()
-        total = len(data)
-        inserted = sum(1 for row in rows if int(row.xmax) == 0)
-        updated = sum(1 for row in rows if int(row.xmax) != 0)
-        ignored = total - len(rows)
+async def insert_camara_orgaos_db(data: Iterable[CamaraOrgaosArg]):
+    await upsert_async(CAMARA_ORGAOS, data)
 
-        insert_log_linhas_db(
-            id_lote=data[0].id_lote,
-            table=camara_orgaos_membros.name,
-            inserted=inserted,
-            updated=updated,
-            ignored=ignored,
-            total=total,
-        )
 
-    return
+async def insert_camara_orgaos_membros_db(
+    data: Iterable[CamaraOrgaosMembrosArg],
+) -> int:
+    """
+    Carrega os membros dos órgãos via COPY. Retorna o total de linhas processadas.
+    Entre registros com a mesma chave, fica o que tem data_fim preenchida.
+    """
+    counts = await upsert_async(CAMARA_ORGAOS_MEMBROS, data)
+    return counts.total
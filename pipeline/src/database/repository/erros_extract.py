@@ -58,15 +58,44 @@ def verify_not_downloaded_urls_in_task_db(task: str) -> list[ErrorExtract]:
         return [ErrorExtract(id=row.id, url=row.url) for row in rows]
 
 
-def update_not_downloaded_urls_db(error_id: int, id_lote: int):
+def insert_extract_errors_bulk_db(id_lote: int, errors: list[dict]):
     """
-    Atualiza o registro no banco de dados da URL que havia falhado na hora de baixar.
-    Atualiza a coluna "baixado" e "data_baixado"
+    Versão em lote do insert_extract_error_db: grava todas as URLs que falharam em um único INSERT multi-linhas
+    e atualiza a tabela de Lote uma única vez.
+    Cada item de errors possui as chaves task, status_code, mensagem e url.
     """
+    if not errors:
+        return
+
+    with get_connection() as conn:
+        stmt_error = (
+            insert(erros_extract)
+            .values([{"id_lote": id_lote, **error} for error in errors])
+            .on_conflict_do_nothing(index_elements=["url"])
+        )
+        conn.execute(stmt_error)
+
+        # Atualizar tabela de Lote
+        stmt_lote = (
+            update(lote)
+            .where(lote.c.id == id_lote)
+            .where(lote.c.urls_nao_baixadas.is_(False))
+            .values(urls_nao_baixadas=True)
+        )
+        conn.execute(stmt_lote)
+
+
+def update_not_downloaded_urls_bulk_db(error_ids: list[int], id_lote: int):
+    """
+    Marca como baixadas, em um único UPDATE, as URLs que haviam falhado, registrando a data e o lote do download.
+    """
+    if not error_ids:
+        return
+
     with get_connection() as conn:
         stmt = (
             update(erros_extract)
-            .where(erros_extract.c.id == error_id)
+            .where(erros_extract.c.id.in_(error_ids))
             .values(
                 baixado=True,
                 data_hora_baixado=datetime.now(timezone.utc),
@@ -1,4 +1,4 @@
-from sqlalchemy import insert
+from sqlalchemy import Connection, Insert, insert
 
 from database.engine import get_connection
 from database.models.base import InsertLogDB, LogLinhas, Logs
@@ -31,19 +31,47 @@ def insert_log_db(logs: list[InsertLogDB]):
         conn.execute(stmt)
 
 
+def log_linhas_statement(
+    id_lote: int,
+    table: str,
+    inserted: int,
+    updated: int,
+    ignored: int,
+    total: int,
+    unchanged: int = 0,
+) -> Insert:
+    return insert(log_linhas).values(
+        id_lote=id_lote,
+        tabela=table,
+        inseridos=inserted,
+        atualizados=updated,
+        ignorados=ignored,
+        inalterados=unchanged,
+        total=total,
+    )
+
+
 def insert_log_linhas_db(
-    id_lote: int, table: str, inserted: int, updated: int, ignored: int, total: int
+    id_lote: int,
+    table: str,
+    inserted: int,
+    updated: int,
+    ignored: int,
+    total: int,
+    unchanged: int = 0,
+    conn: Connection | None = None,
 ):
     """
     Insere na tabela log_linhas o número de registros modificados na operação de load em cada tabela
+    `unchanged` são as linhas que nem foram enviadas ao banco, por terem o mesmo hash da linha já gravada.
+    Com `conn`, o log entra na mesma transação do load, sem abrir outra conexão do pool.
     """
+    stmt = log_linhas_statement(
+        id_lote, table, inserted, updated, ignored, total, unchanged
+    )
+    if conn is not None:
+        conn.execute(stmt)
+        return
+
     with get_connection() as conn:
-        stmt = insert(log_linhas).values(
-            id_lote=id_lote,
-            tabela=table,
-            inseridos=inserted,
-            atualizados=updated,
-            ignorados=ignored,
-            total=total,
-        )
         conn.execute(stmt)
@@ -0,0 +1,431 @@
+import asyncio
+from contextlib import nullcontext
+from dataclasses import dataclass
+from enum import Enum
+from functools import cached_property, lru_cache
+from itertools import chain
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+import sqlalchemy as sa
+from prefect.logging import get_logger
+from pydantic import BaseModel
+from sqlalchemy.dialects.postgresql import Insert
+
+from config.loader import load_config
+from database.bulk import (
+    COPY_BUFFER_SIZE,
+    HASH_COLUMN,
+    CsvCopyStream,
+    HashDiff,
+    Provenance,
+    copy_to_staging,
+    merge_statement,
+    provenance_statement,
+    record_provenance,
+    staging_sql,
+)
+from database.engine import (
+    async_engine_available,
+    get_async_connection,
+    get_connection,
+)
+from database.models.base import Base
+from utils.db import CONTROL_COLUMNS, RowCounts
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+# Colunas que nunca são carregadas: o id é gerado pelo banco e o hash_linha é calculado no load
+GENERATED_COLUMNS = ("id", HASH_COLUMN)
+
+
+class ConflictPolicy(Enum):
+    """
+    O que fazer quando a chave natural da linha já existe na tabela.
+    - IGNORE: mantém a linha gravada (ON CONFLICT DO NOTHING).
+    - UPDATE: atualiza as colunas que não são chave nem imutáveis, se a linha mudou.
+    - CLOSE: só preenche a coluna de encerramento (ex.: data_fim), se ela ainda estiver vazia.
+    """
+
+    IGNORE = "ignore"
+    UPDATE = "update"
+    CLOSE = "close"
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """
+    Descrição de como carregar uma tabela. As colunas e os tipos vêm do Base.metadata.
+    Ex.: TableSpec("camara_eventos", key=("id_evento",), policy=ConflictPolicy.UPDATE)
+    """
+
+    name: str
+    key: tuple[str, ...]
+    policy: ConflictPolicy = ConflictPolicy.IGNORE
+    immutable: tuple[str, ...] = ()
+    close_column: str | None = None
+
+    def __post_init__(self):
+        if self.policy is ConflictPolicy.CLOSE and self.close_column is None:
+            raise ValueError(
+                f"A tabela {self.name} usa ConflictPolicy.CLOSE e precisa de close_column"
+            )
+
+    @property
+    def table(self) -> sa.Table:
+        return Base.metadata.tables[self.name]
+
+    @cached_property
+    def columns(self) -> tuple[str, ...]:
+        """
+        Colunas que podem ser carregadas, na ordem da tabela.
+        """
+        return tuple(c.name for c in self.table.c if c.name not in GENERATED_COLUMNS)
+
+    @cached_property
+    def hashed(self) -> bool:
+        return self.policy is ConflictPolicy.UPDATE and HASH_COLUMN in self.table.c
+
+    @cached_property
+    def update_columns(self) -> tuple[str, ...]:
+        if self.policy is ConflictPolicy.UPDATE:
+            return tuple(
+                c
+                for c in self.columns
+                if c not in self.key
+                and c not in self.immutable
+                and c not in CONTROL_COLUMNS
+            )
+        if self.policy is ConflictPolicy.CLOSE:
+            return (self.close_column,)  # type: ignore
+        return ()
+
+
+@dataclass(frozen=True)
+class _Compiled:
+    ddl: list[str]
+    copy: str
+    merge: sa.Select
+
+
+@lru_cache(maxsize=None)
+def _compile(spec: TableSpec, columns: tuple[str, ...]) -> _Compiled:
+    """
+    Monta, uma vez por tabela e conjunto de colunas, os comandos da staging e o INSERT ... ON CONFLICT.
+    Reusar o mesmo objeto de statement também aproveita o cache de compilação do SQLAlchemy.
+    """
+    table = spec.table
+    update = list(spec.update_columns)
+    if spec.hashed:
+        columns = (*columns, HASH_COLUMN)
+        update.append(HASH_COLUMN)
+
+    where: Callable[[Insert], Any] | None = None
+    prefer_not_null: tuple[str, ...] = ()
+    if spec.policy is ConflictPolicy.CLOSE:
+        close = spec.close_column
+
+        def where(stmt: Insert):
+            return sa.and_(stmt.excluded[close].isnot(None), table.c[close].is_(None))
+
+        # Entre linhas repetidas no load, fica a que já está encerrada
+        prefer_not_null = (close,)  # type: ignore
+
+    staging = f"stg_{table.name}"
+    ddl, copy = staging_sql(table, staging, columns)
+    merge = merge_statement(
+        table,
+        staging,
+        columns,
+        spec.key,
+        update=update,
+        where=where,
+        prefer_not_null=prefer_not_null,
+    )
+    return _Compiled(ddl, copy, merge)
+
+
+# ============= LINHAS =============
+
+
+def _is_arrow(rows: Any) -> bool:
+    return hasattr(rows, "schema")
+
+
+def _arrow_tuples(rows: Any, columns: Sequence[str]) -> Iterator[tuple]:
+    """
+    Linhas de uma pyarrow.Table, RecordBatch ou RecordBatchReader, convertidas coluna a coluna.
+    """
+    batches = rows.to_batches() if hasattr(rows, "to_batches") else rows
+    if hasattr(batches, "num_rows"):
+        batches = [batches]
+    for batch in batches:
+        yield from zip(*[batch.column(c).to_pylist() for c in columns])
+
+
+@lru_cache(maxsize=None)
+def _model_columns(model: type[BaseModel], table_columns: tuple[str, ...]) -> tuple:
+    return tuple(c for c in model.model_fields if c in table_columns)
+
+
+def _getter(columns: Sequence[str], factory: Callable) -> Callable[[Any], tuple]:
+    get = factory(*columns)
+    if len(columns) == 1:
+        return lambda row: (get(row),)
+    return get
+
+
+def _as_tuples(
+    spec: TableSpec, rows: Iterable[Any], columns: Sequence[str] | None
+) -> tuple[tuple[str, ...], Iterator[tuple]] | None:
+    """
+    Colunas carregadas e linhas como tuplas na ordem dessas colunas.
+    Aceita tuplas (com `columns`), dicts, modelos *Arg ou lotes do Arrow.
+    Sem `columns`, carrega os campos do primeiro registro que existem na tabela.
+    """
+    if _is_arrow(rows):
+        columns = columns or [c for c in rows.schema.names if c in spec.columns]
+        return tuple(columns), _arrow_tuples(rows, columns)
+
+    iterator = iter(rows)
+    first = next(iterator, None)
+    if first is None:
+        return None
+    rows = chain([first], iterator)
+
+    if isinstance(first, tuple):
+        if columns is None:
+            raise ValueError(
+                f"Linhas em tuplas precisam de `columns` para carregar {spec.name}"
+            )
+        return tuple(columns), rows
+
+    if isinstance(first, dict):
+        columns = columns or [c for c in first if c in spec.columns]
+        return tuple(columns), map(_getter(columns, itemgetter), rows)
+
+    columns = columns or _model_columns(type(first), spec.columns)
+    return tuple(columns), map(_getter(columns, attrgetter), rows)
+
+
+def _prepare(
+    spec: TableSpec, rows: Iterable[Any], columns: Sequence[str] | None
+) -> tuple[tuple[str, ...], Iterator[tuple], int | None] | None:
+    """
+    Colunas, linhas (tuplas) e id_lote do load, ou None se não houver linhas.
+    """
+    loaded = _as_tuples(spec, rows, columns)
+    if loaded is None:
+        return None
+    columns, tuples = loaded
+
+    iterator = iter(tuples)
+    first = next(iterator, None)
+    if first is None:
+        return None
+    id_lote = first[columns.index("id_lote")] if "id_lote" in columns else None
+
+    return columns, chain([first], iterator), id_lote
+
+
+# ============= LOAD =============
+
+
+def upsert(
+    spec: TableSpec,
+    rows: Iterable[Any],
+    conn: sa.Connection | None = None,
+    columns: Sequence[str] | None = None,
+    log: bool = True,
+) -> RowCounts:
+    """
+    Carrega as linhas na tabela da spec em dois comandos, independentemente do número de linhas:
+    COPY para uma staging temporária e um INSERT ... SELECT ... ON CONFLICT para a tabela de destino.
+    As linhas são consumidas como um iterador. Em tabelas com hash_linha e ConflictPolicy.UPDATE, só as linhas
+    novas ou alteradas são enviadas (HashDiff). Todas as chaves do load são marcadas como vistas no lote em
+    lote_proveniencia e as contagens vão para a tabela log_linhas (a não ser que `log` seja falso), tudo na
+    mesma transação. Sem `conn`, usa uma conexão própria.
+    """
+    if conn is None:
+        with get_connection() as conn:
+            return upsert(spec, rows, conn=conn, columns=columns, log=log)
+
+    counts = RowCounts()
+    prepared = _prepare(spec, rows, columns)
+    if prepared is None:
+        return counts
+    columns, records, id_lote = prepared
+
+    compiled = _compile(spec, columns)
+    provenance = Provenance(spec.key, columns)
+    records = provenance.track(records)
+
+    diff = None
+    if spec.hashed:
+        diff = HashDiff.load(conn, spec.table, spec.key, columns)
+        records = diff.filter(records)
+
+    copied = copy_to_staging(conn, compiled.ddl, compiled.copy, records)
+    inserted, updated = conn.execute(compiled.merge).one()
+    # Linhas repetidas no mesmo load contam como ignoradas, assim como as que não mudaram
+    counts.add(id_lote, total=copied, inserted=inserted, updated=updated)
+    if diff is not None:
+        counts.unchanged = diff.unchanged
+        counts.total += diff.unchanged
+
+    if id_lote is not None:
+        record_provenance(conn, spec.table, id_lote, provenance.hashes)
+
+    if log:
+        counts.log(table=spec.name, conn=conn)
+
+    return counts
+
+
+# ============= LOAD ASSÍNCRONO =============
+
+Load = tuple[TableSpec, Iterable[Any], Sequence[str] | None]
+
+
+def use_async_engine() -> bool:
+    if not APP_SETTINGS.LOAD.ASYNC_DB:
+        return False
+    if not async_engine_available():
+        logger.warning(
+            "LOAD.ASYNC_DB está ativo, mas o psycopg (3) não está instalado (extra `async-db` do projeto). O load usará o engine síncrono."
+        )
+        return False
+    return True
+
+
+@lru_cache(maxsize=1)
+def _psycopg_dialect():
+    from sqlalchemy.dialects.postgresql.psycopg import dialect
+
+    return dialect()
+
+
+def _sql(stmt: sa.Executable) -> tuple[str, dict]:
+    compiled = stmt.compile(dialect=_psycopg_dialect())
+    return str(compiled), compiled.params
+
+
+@lru_cache(maxsize=None)
+def _merge_sql(spec: TableSpec, columns: tuple[str, ...]) -> tuple[str, dict]:
+    return _sql(_compile(spec, columns).merge)
+
+
+def _pipeline(aconn):
+    """
+    Modo pipeline do psycopg: os comandos são enviados sem esperar a resposta do anterior e o cliente só
+    espera quando precisa de um resultado ou ao sair do bloco. Sem suporte da libpq, os comandos vão um a um.
+    """
+    from psycopg import AsyncPipeline
+
+    return aconn.pipeline() if AsyncPipeline.is_supported() else nullcontext()
+
+
+async def _upsert_pipelined(
+    aconn,
+    spec: TableSpec,
+    rows: Iterable[Any],
+    columns: Sequence[str] | None,
+    log: bool,
+) -> RowCounts:
+    """
+    O mesmo load do `upsert`, na conexão psycopg assíncrona, em três idas ao banco além do COPY:
+    leitura dos hashes + criação da staging; merge + proveniência; log das linhas.
+    """
+    counts = RowCounts()
+    prepared = _prepare(spec, rows, columns)
+    if prepared is None:
+        return counts
+    columns, records, id_lote = prepared
+
+    compiled = _compile(spec, columns)
+    provenance = Provenance(spec.key, columns)
+    records = provenance.track(records)
+
+    diff = None
+    async with _pipeline(aconn):
+        hashes = (
+            await aconn.execute(*_sql(HashDiff.statement(spec.table, spec.key)))
+            if spec.hashed
+            else None
+        )
+        for stmt in compiled.ddl:
+            await aconn.execute(stmt)
+        if hashes is not None:
+            diff = HashDiff.from_rows(await hashes.fetchall(), spec.key, columns)
+            records = diff.filter(records)
+
+    # O COPY não pode ser feito em modo pipeline
+    stream = CsvCopyStream(records)
+    async with aconn.cursor() as cursor:
+        async with cursor.copy(compiled.copy) as copy:
+            while data := stream.read(COPY_BUFFER_SIZE):
+                await copy.write(data)
+
+    async with _pipeline(aconn):
+        merged = await aconn.execute(*_merge_sql(spec, columns))
+        if id_lote is not None:
+            await aconn.execute(
+                *_sql(provenance_statement(spec.table, id_lote, provenance.hashes))
+            )
+        inserted, updated = await merged.fetchone()
+
+        counts.add(id_lote, total=stream.count, inserted=inserted, updated=updated)
+        if diff is not None:
+            counts.unchanged = diff.unchanged
+            counts.total += diff.unchanged
+
+        if log and id_lote is not None:
+            await aconn.execute(*_sql(counts.log_statement(spec.name)))
+
+    return counts
+
+
+def _upsert_many(loads: Sequence[Load], log: bool) -> list[RowCounts]:
+    with get_connection() as conn:
+        return [
+            upsert(spec, rows, conn=conn, columns=columns, log=log)
+            for spec, rows, columns in loads
+        ]
+
+
+async def _upsert_many_async(loads: Sequence[Load], log: bool) -> list[RowCounts]:
+    if not use_async_engine():
+        return await asyncio.to_thread(_upsert_many, loads, log)
+
+    async with get_async_connection() as conn:
+        raw = await conn.get_raw_connection()
+        return [
+            await _upsert_pipelined(raw.driver_connection, spec, rows, columns, log)
+            for spec, rows, columns in loads
+        ]
+
+
+async def upsert_many_async(
+    loads: Sequence[tuple[TableSpec, Iterable[Any]]], log: bool = True
+) -> list[RowCounts]:
+    """
+    Carrega várias tabelas, na ordem, em uma única transação, sem bloquear a thread da task.
+    Com LOAD.ASYNC_DB, usa o engine assíncrono (psycopg 3) em modo pipeline. Senão, roda o `upsert` síncrono
+    em uma thread separada.
+    """
+    return await _upsert_many_async([(spec, rows, None) for spec, rows in loads], log)
+
+
+async def upsert_async(
+    spec: TableSpec,
+    rows: Iterable[Any],
+    columns: Sequence[str] | None = None,
+    log: bool = True,
+) -> RowCounts:
+    """
+    Versão assíncrona do `upsert`, em uma transação própria (ver upsert_many_async).
+    """
+    [counts] = await _upsert_many_async([(spec, rows, columns)], log)
+    return counts
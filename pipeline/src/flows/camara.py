@@ -4,6 +4,7 @@ from typing import cast
 from prefect import flow, get_run_logger, task
 from prefect.runtime import flow_run
 
+from config.loader import load_config
 from config.parameters import FlowsNames
 from tasks.extract.camara import (
     extract_camara_blocos,
@@ -56,8 +57,12 @@ from tasks.load.camara import (
     load_camara_orgaos_tipos,
     load_camara_partidos,
 )
+from utils.http_cache import set_http_cache_bypass
+from utils.http_clients import close_http_clients
 from utils.logs import save_logs
 
+APP_SETTINGS = load_config()
+
 
 @flow(
     name="Câmara Flow",
@@ -68,13 +73,17 @@ from utils.logs import save_logs
 def camara_flow(
     start_date: date,
     end_date: date,
+    refresh_cache: bool,
     ignore_tasks: list[str],
     id_lote: int,
     use_files: bool,
+    replay_lote: int | None = None,
 ):
     logger = get_run_logger()
     logger.info(f"Iniciando execução da Flow da Câmara - Lote {id_lote}")
 
+    set_http_cache_bypass(refresh_cache)
+
     futures = []
 
     ## EXTRACT LEGISLATURA
@@ -82,6 +91,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
 
     ## LOAD LEGISLATURA
@@ -98,6 +108,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_partidos_f.result()  # type: ignore
 
@@ -107,6 +118,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_partidos_detalhes_f.result()  # type: ignore
 
@@ -124,6 +136,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_deputados_f = extract_camara_deputados_f.result()  # type: ignore
 
@@ -133,6 +146,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_detalhes_deputados_f.result()  # type: ignore
 
@@ -151,13 +165,14 @@ def camara_flow(
         deputados_ids=extract_camara_deputados_f,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_deputados_historico_f.result()  # type: ignore
 
     ## LOAD HISTORICO DEPUTADOS
     load_camara_deputados_historico_f = load_camara_deputados_historico.submit(
         id_lote=id_lote,
-        historico_deputados=cast(list[dict], extract_camara_deputados_historico_f),
+        historico_deputados_path=extract_camara_deputados_historico_f,  # type: ignore
         ignore_tasks=ignore_tasks,
         _load_deputados=load_camara_deputados_f,
     )
@@ -170,6 +185,7 @@ def camara_flow(
             deputados_ids=extract_camara_deputados_f,
             ignore_tasks=ignore_tasks,
             use_files=use_files,
+            replay_lote=replay_lote,
         )
     )
     extract_camara_deputados_mandatos_externos_f.result()  # type: ignore
@@ -193,6 +209,7 @@ def camara_flow(
         deputados_ids=extract_camara_deputados_f,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_deputados_ocupacoes_f.result()  # type: ignore
 
@@ -211,6 +228,7 @@ def camara_flow(
         deputados_ids=extract_camara_deputados_f,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_deputados_profissoes_f.result()  # type: ignore
 
@@ -229,6 +247,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_legislaturas_lideres_f.result()  # type: ignore
 
@@ -247,6 +266,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_legislaturas_mesa_f.result()
 
@@ -265,6 +285,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     futures.append(extract_camara_blocos_f)
 
@@ -282,6 +303,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     futures.append(extract_camara_blocos_partidos_f)
 
@@ -295,7 +317,9 @@ def camara_flow(
 
     ## EXTRACT TIPOS ÓRGÃOS
     extract_camara_orgaos_tipos_f = extract_camara_orgaos_tipos.submit(
-        ignore_tasks=ignore_tasks, use_files=use_files
+        ignore_tasks=ignore_tasks,
+        use_files=use_files,
+        replay_lote=replay_lote,
     )
     futures.append(extract_camara_orgaos_tipos_f)
 
@@ -314,6 +338,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     futures.append(extract_camara_orgaos_f)
 
@@ -323,6 +348,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_orgaos_detalhes_f.result()  # type: ignore
 
@@ -343,12 +369,13 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     futures.append(extract_camara_orgaos_membros_f)
 
     ## LOAD MEMBROS ÓRGÃOS
     load_camara_orgaos_membros_f = load_camara_orgaos_membros.submit(
-        membros_orgaos=extract_camara_orgaos_membros_f,  # type: ignore
+        membros_orgaos_path=extract_camara_orgaos_membros_f,  # type: ignore
         legislaturas=extract_camara_legislaturas_f,  # type: ignore
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
@@ -364,13 +391,14 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     futures.append(extract_camara_eventos_f)
 
     ## LOAD EVENTOS
     load_camara_eventos_f = load_camara_eventos.submit(
         id_lote=id_lote,
-        eventos=extract_camara_eventos_f,  # type: ignore
+        eventos_path=extract_camara_eventos_f,  # type: ignore
         ignore_tasks=ignore_tasks,
         _load_orgaos=load_camara_orgaos_f,
     )
@@ -385,6 +413,7 @@ def camara_flow(
             id_lote=id_lote,
             ignore_tasks=ignore_tasks,
             use_files=use_files,
+            replay_lote=replay_lote,
         )
     )
     futures.append(extract_camara_deputados_assiduidade_plenario_f)
@@ -398,6 +427,7 @@ def camara_flow(
             id_lote=id_lote,
             ignore_tasks=ignore_tasks,
             use_files=use_files,
+            replay_lote=replay_lote,
         )
     )
     futures.append(extract_camara_deputados_assiduidade_comissoes_f)
@@ -408,6 +438,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_frentes_f.result()  # type: ignore
 
@@ -417,6 +448,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_frentes_detalhes_f.result()  # type: ignore
 
@@ -426,6 +458,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_frentes_membros_f.result()  # type: ignore
 
@@ -437,6 +470,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_discursos_deputados_f.result()  # type: ignore
 
@@ -447,6 +481,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_proposicoes_f.result()  # type: ignore
 
@@ -456,6 +491,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_detalhes_proposicoes_f.result()  # type: ignore
 
@@ -465,6 +501,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_autores_proposicoes_f.result()  # type: ignore
 
@@ -475,6 +512,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_votacoes_f.result()  # type: ignore
 
@@ -484,6 +522,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_detalhes_votacoes_f.result()  # type: ignore
 
@@ -493,6 +532,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_orientacoes_votacoes_f.result()  # type: ignore
 
@@ -502,6 +542,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_votos_votacoes_f.result()  # type: ignore
 
@@ -513,6 +554,7 @@ def camara_flow(
         id_lote=id_lote,
         ignore_tasks=ignore_tasks,
         use_files=use_files,
+        replay_lote=replay_lote,
     )
     extract_camara_despesas_deputados_f.result()  # type: ignore
 
@@ -521,6 +563,11 @@ def camara_flow(
     for future in futures:
         future.result()
 
+    # Encerra as conexões mantidas abertas pelos clientes HTTP compartilhados
+    close_http_clients(
+        [APP_SETTINGS.CAMARA.REST_BASE_URL, APP_SETTINGS.CAMARA.PORTAL_BASE_URL]
+    )
+
     save_logs(
         flow_run_name=FlowsNames.CAMARA.value,
         flow_run_id=flow_run.id,
@@ -538,10 +585,20 @@ def camara_flow(
 def run_camara_flow(
     start_date: date,
     end_date: date,
+    refresh_cache: bool,
     ignore_tasks: list[str],
     id_lote: int,
     use_files: bool,
     ignore_flows: list[str],
+    replay_lote: int | None = None,
 ):
     if FlowsNames.CAMARA.value not in ignore_flows:
-        camara_flow(start_date, end_date, ignore_tasks, id_lote, use_files)
+        camara_flow(
+            start_date,
+            end_date,
+            refresh_cache,
+            ignore_tasks,
+            id_lote,
+            use_files,
+            replay_lote,
+        )
@@ -1,3 +1,4 @@
+import time
 from datetime import date, datetime, timedelta
 
 from prefect import flow, get_run_logger
@@ -9,6 +10,7 @@ from config.parameters import FlowsNames
 from database.models.base import PipelineParams
 from database.repository.lote import end_lote_in_db, start_lote_in_db
 from utils.logs import save_logs
+from utils.lote_archive import archive_extracts
 
 from .camara import run_camara_flow
 from .senado import run_senado_flow
@@ -97,10 +99,14 @@ def pipeline(
     ignore_flows: list[str] = ["tse", "senado"],
     message: str | None = None,
     use_files: bool = False,
+    replay_lote: int | None = None,
 ):
     logger = get_run_logger()
     logger.info("Iniciando Pipeline ETL.")
 
+    # Início do lote: só os arquivos de extract gravados a partir daqui pertencem a ele
+    started_ns = time.time_ns()
+
     id_lote = start_lote_in_db(
         start_date_extract=start_date,
         end_date_extract=end_date,
@@ -131,10 +137,12 @@ def pipeline(
         run_camara_flow.submit(
             start_date=start_date,
             end_date=end_date,
+            refresh_cache=refresh_cache,
             ignore_tasks=ignore_tasks,
             id_lote=id_lote,
             use_files=use_files,
             ignore_flows=ignore_flows,
+            replay_lote=replay_lote,
         )
     )
 
@@ -142,10 +150,12 @@ def pipeline(
         run_senado_flow.submit(
             start_date=start_date,
             end_date=end_date,
+            refresh_cache=refresh_cache,
             ignore_tasks=ignore_tasks,
             id_lote=id_lote,
             use_files=use_files,
             ignore_flows=ignore_flows,
+            replay_lote=replay_lote,
         )
     )
 
@@ -154,6 +164,18 @@ def pipeline(
 
     all_flows_ok = all(s.is_completed() for s in states)  # type:ignore
 
+    ## Com use_files nada foi extraído: os arquivos já pertencem a outro lote
+    if not use_files:
+        try:
+            archive_extracts(
+                id_lote,
+                since_ns=started_ns,
+                skipped_tasks=ignore_tasks,
+                skipped_flows=ignore_flows,
+            )
+        except Exception as e:
+            logger.error(f"Erro ao arquivar os extracts do lote {id_lote}: {e}")
+
     id_lote_end = end_lote_in_db(id_lote, all_flows_ok)
     logger.info(f"Lote {id_lote_end} finalizou com sucesso")
 
@@ -0,0 +1,50 @@
+from prefect import flow, get_run_logger
+
+from config.loader import load_config
+from utils.lote_archive import archived_lotes, check_lote, load_lote_manifest
+
+from .pipeline import pipeline
+
+APP_SETTINGS = load_config()
+
+
+@flow(
+    name="Replay Flow",
+    flow_run_name="replay_flow",
+    description="Recarrega no banco os extracts arquivados de lotes anteriores, sem acessar as APIs.",
+    log_prints=True,
+    timeout_seconds=APP_SETTINGS.FLOW.TIMEOUT,
+)
+def replay(
+    lotes: list[int] | None = None,
+    ignore_tasks: list[str] = [],
+    ignore_flows: list[str] = ["tse"],
+):
+    """
+    Roda o pipeline com use_files lendo os arquivos de extract direto do diretório de cada lote, depois de conferir
+    o SHA-256 com o manifest. O ExtractOutDir não é alterado.
+    - As tasks e os flows ignorados no lote original também são ignorados no replay. Um arquivo necessário que não
+      faz parte do lote faz a task falhar, em vez de ler o arquivo de outro lote.
+    - Sem `lotes`, todos os lotes arquivados são recarregados.
+    - Os lotes rodam um de cada vez, em ordem crescente: os upserts de um lote dependem do estado deixado
+      pelo anterior. Dentro de cada lote, os flows e tasks continuam rodando em paralelo.
+    - O TSE fica de fora por padrão, já que as tasks dele não leem os arquivos de extract.
+    """
+    logger = get_run_logger()
+
+    lotes = sorted(lotes) if lotes else archived_lotes()
+    if not lotes:
+        logger.warning("Nenhum lote arquivado para recarregar.")
+        return
+
+    for id_lote in lotes:
+        logger.info(f"Replay do lote {id_lote}.")
+        check_lote(id_lote)
+        manifest = load_lote_manifest(id_lote)
+        pipeline(
+            ignore_tasks=sorted({*ignore_tasks, *manifest.get("skipped_tasks", [])}),
+            ignore_flows=sorted({*ignore_flows, *manifest.get("skipped_flows", [])}),
+            message=f"Replay do lote {id_lote}",
+            use_files=True,
+            replay_lote=id_lote,
+        )
@@ -3,6 +3,7 @@ from datetime import date
 from prefect import flow, get_run_logger, task
 from prefect.runtime import flow_run
 
+from config.loader import load_config
 from config.parameters import FlowsNames
 from tasks.extract.senado import (
     extract_senado_colegiados,
@@ -14,8 +15,12 @@ from tasks.extract.senado import (
     extract_senado_senadores_discursos,
     extract_senado_votacoes,
 )
+from utils.http_cache import set_http_cache_bypass
+from utils.http_clients import close_http_clients
 from utils.logs import save_logs
 
+APP_SETTINGS = load_config()
+
 
 @flow(
     name="Senado Flow",
@@ -24,17 +29,26 @@ from utils.logs import save_logs
     log_prints=True,
 )
 def senado_flow(
-    start_date: date, end_date: date, ignore_tasks: list[str], id_lote, use_files: bool
+    start_date: date,
+    end_date: date,
+    refresh_cache: bool,
+    ignore_tasks: list[str],
+    id_lote,
+    use_files: bool,
+    replay_lote: int | None = None,
 ):
     logger = get_run_logger()
     logger.info(f"Iniciando execução da Flow do Senado - Lote {id_lote}")
 
+    set_http_cache_bypass(refresh_cache)
+
     futures = []
 
     ## COLEGIADOS
     extract_senado_colegiados_f = extract_senado_colegiados.submit(
         id_lote=id_lote,
         use_files=use_files,
+        replay_lote=replay_lote,
         ignore_tasks=ignore_tasks,
     )
     futures.append(extract_senado_colegiados_f)
@@ -43,6 +57,7 @@ def senado_flow(
     extract_senado_senadores_f = extract_senado_senadores.submit(
         id_lote=id_lote,
         use_files=use_files,
+        replay_lote=replay_lote,
         ignore_tasks=ignore_tasks,
     )
     extract_senado_senadores_f.result()
@@ -52,6 +67,7 @@ def senado_flow(
         ids_senadores=extract_senado_senadores_f,  # type: ignore
         id_lote=id_lote,
         use_files=use_files,
+        replay_lote=replay_lote,
         ignore_tasks=ignore_tasks,
     )
     extract_senado_senadores_detalhes_f.result()  # type: ignore
@@ -63,6 +79,7 @@ def senado_flow(
         end_date=end_date,
         id_lote=id_lote,
         use_files=use_files,
+        replay_lote=replay_lote,
         ignore_tasks=ignore_tasks,
     )
     extract_senado_senadores_discursos_f.result()  # type: ignore
@@ -73,6 +90,7 @@ def senado_flow(
         end_date=end_date,
         id_lote=id_lote,
         use_files=use_files,
+        replay_lote=replay_lote,
         ignore_tasks=ignore_tasks,
     )
     futures.append(extract_senado_senadores_despesas_f)
@@ -83,6 +101,7 @@ def senado_flow(
         end_date=end_date,
         id_lote=id_lote,
         use_files=use_files,
+        replay_lote=replay_lote,
         ignore_tasks=ignore_tasks,
     )
     extract_senado_processos_f.result()  # type: ignore
@@ -92,6 +111,7 @@ def senado_flow(
         ids_processos=extract_senado_processos_f,  # type: ignore
         id_lote=id_lote,
         use_files=use_files,
+        replay_lote=replay_lote,
         ignore_tasks=ignore_tasks,
     )
     extract_senado_processos_detalhes_f.result()  # type: ignore
@@ -102,6 +122,7 @@ def senado_flow(
         end_date=end_date,
         id_lote=id_lote,
         use_files=use_files,
+        replay_lote=replay_lote,
         ignore_tasks=ignore_tasks,
     )
     futures.append(extract_senado_votacoes_f)
@@ -110,6 +131,9 @@ def senado_flow(
     for future in futures:
         future.result()
 
+    # Encerra as conexões mantidas abertas pelos clientes HTTP compartilhados
+    close_http_clients([APP_SETTINGS.SENADO.REST_BASE_URL])
+
     save_logs(
         flow_run_name=FlowsNames.SENADO.value,
         flow_run_id=flow_run.id,
@@ -127,10 +151,20 @@ def senado_flow(
 def run_senado_flow(
     start_date: date,
     end_date: date,
+    refresh_cache: bool,
     ignore_tasks: list[str],
     id_lote: int,
     use_files: bool,
     ignore_flows: list[str],
+    replay_lote: int | None = None,
 ):
     if FlowsNames.SENADO.value not in ignore_flows:
-        senado_flow(start_date, end_date, ignore_tasks, id_lote, use_files)
+        senado_flow(
+            start_date,
+            end_date,
+            refresh_cache,
+            ignore_tasks,
+            id_lote,
+            use_files,
+            replay_lote,
+        )
@@ -3,6 +3,7 @@ from datetime import date
 from prefect import flow, get_run_logger, task
 from prefect.runtime import flow_run
 
+from config.loader import load_config
 from config.parameters import FlowsNames
 from tasks.extract.tse import (
     extract_tse_candidatos,
@@ -11,8 +12,11 @@ from tasks.extract.tse import (
     extract_tse_votacao,
 )
 from utils.br_data import BR_UFS, get_election_years
+from utils.http_clients import close_http_clients
 from utils.logs import save_logs
 
+APP_SETTINGS = load_config()
+
 
 @flow(
     name="TSE Flow",
@@ -85,6 +89,9 @@ def tse_flow(
     for future in futures:
         future.result()
 
+    # Encerra as conexões mantidas abertas pelos clientes HTTP compartilhados
+    close_http_clients([APP_SETTINGS.TSE.BASE_URL])
+
     save_logs(
         flow_run_name=FlowsNames.TSE.value,
         flow_run_id=flow_run.id,
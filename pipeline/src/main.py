@@ -1,4 +1,10 @@
+from prefect import serve
+
 from flows.pipeline import pipeline
+from flows.replay import replay
 
 if __name__ == "__main__":
-    pipeline.serve(name="prisma-do-congresso-pipeline")
+    serve(
+        pipeline.to_deployment(name="prisma-do-congresso-pipeline"),
+        replay.to_deployment(name="prisma-do-congresso-replay"),
+    )
@@ -8,6 +8,7 @@ from config.parameters import ExtractOutDir, TasksNames
 from utils.camara import get_current_legislatura
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -18,7 +19,11 @@ APP_SETTINGS = load_config()
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
 async def extract_camara_blocos(
-    legislaturas: dict, id_lote: int, ignore_tasks: list[str], use_files: bool
+    legislaturas: dict,
+    id_lote: int,
+    ignore_tasks: list[str],
+    use_files: bool,
+    replay_lote: int | None = None,
 ) -> list[dict] | None:
     logger = get_run_logger()
 
@@ -29,7 +34,7 @@ async def extract_camara_blocos(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.BLOCOS} irá retornar os dados à partir do arquivo em disco."
         )
-        return load_ndjson(ExtractOutDir.CAMARA.BLOCOS)
+        return load_ndjson(extract_path(ExtractOutDir.CAMARA.BLOCOS, replay_lote))
     if not legislaturas:
         logger.warning(
             f"Não foi possível executar a task '{TasksNames.CAMARA.EXTRACT.BLOCOS}' pois o argumento do parâmetro 'legislaturas' é nulo"
@@ -7,6 +7,7 @@ from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from utils.camara import get_current_legislatura
 from utils.io import fetch_json, load_json, save_json
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -31,7 +32,11 @@ def get_ids_deputados(json: dict) -> list[int]:
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
 def extract_camara_deputados(
-    legislaturas: dict | None, id_lote: int, ignore_tasks: list[str], use_files: bool
+    legislaturas: dict | None,
+    id_lote: int,
+    ignore_tasks: list[str],
+    use_files: bool,
+    replay_lote: int | None = None,
 ) -> list[int] | None:
     logger = get_run_logger()
 
@@ -42,7 +47,9 @@ def extract_camara_deputados(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.DEPUTADOS} irá retornar os dados à partir do arquivo em disco."
         )
-        return get_ids_deputados(load_json(ExtractOutDir.CAMARA.DEPUTADOS))
+        return get_ids_deputados(
+            load_json(extract_path(ExtractOutDir.CAMARA.DEPUTADOS, replay_lote))
+        )
     if not legislaturas:
         logger.warning(
             f"Não foi possível executar a task '{TasksNames.CAMARA.EXTRACT.DEPUTADOS}' pois o argumento do parâmetro 'legislaturas' é nulo"
@@ -51,7 +58,11 @@ def extract_camara_deputados(
 
     url = deputados_url(legislaturas)
     logger.info(f"Câmara: buscando Deputados de {url}")
-    json = fetch_json(url=url, max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES)
+    json = fetch_json(
+        url=url,
+        max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
+        task=TasksNames.CAMARA.EXTRACT.DEPUTADOS,
+    )
     json = cast(dict, json)
 
     save_json(json, Path(ExtractOutDir.CAMARA.DEPUTADOS))
@@ -1,18 +1,17 @@
-import re
 from datetime import date
 from logging import Logger
-from pathlib import Path
-from typing import cast
 
 from prefect import get_run_logger, task
 from prefect.logging.loggers import LoggingAdapter
-from selectolax.parser import HTMLParser
 
 from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
-from utils.io import fetch_html_many_async, save_htmls_in_zip
+from utils.camara import assiduidade_archive_key, parse_assiduidade_html
+from utils.io import fetch_html_many_to_zip
+from utils.lote_archive import extract_path
+from utils.parsing import ParseStage
 
 APP_SETTINGS = load_config()
 
@@ -57,11 +56,13 @@ async def extract_camara_deputados_assiduidade_comissoes(
     id_lote: int,
     ignore_tasks: list[str],
     use_files: bool,
+    replay_lote: int | None = None,
 ) -> str | None:
     logger = get_run_logger()
 
     """
     Baixa páginas HTML com os dados sobre a assiduidade dos Deputados em Comissões
+    e extrai os registros de presença de cada sessão para um NDJSON.
     """
     if TasksNames.CAMARA.EXTRACT.DEPUTADOS_ASSIDUIDADE_COMISSOES in ignore_tasks:
         logger.warning(
@@ -72,7 +73,9 @@ async def extract_camara_deputados_assiduidade_comissoes(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.DEPUTADOS_ASSIDUIDADE_COMISSOES} irá retornar os dados à partir do arquivo em disco."
         )
-        return load_ndjson()  # CONTINUAR AQUI RETORNAR OS JSONS
+        return extract_path(
+            ExtractOutDir.CAMARA.DEPUTADOS_ASSIDUIDADE_COMISSOES, replay_lote
+        )
     if not deputados_ids:
         logger.warning(
             f"Não foi possível executar a task '{TasksNames.CAMARA.EXTRACT.DEPUTADOS_ASSIDUIDADE_COMISSOES}' pois o argumento do parâmetro 'deputados_ids' é nulo"
@@ -85,49 +88,22 @@ async def extract_camara_deputados_assiduidade_comissoes(
         f"Câmara: buscando Assiduidade Comissões de {len(deputados_ids)} deputados."
     )
 
-    htmls = await fetch_html_many_async(
-        urls=urls["urls_to_download"],
-        not_downloaded_urls=urls["not_downloaded_urls"],
-        limit=APP_SETTINGS.CAMARA.FETCH_LIMIT,
-        max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
-        id_lote=id_lote,
-        task=TasksNames.CAMARA.EXTRACT.DEPUTADOS_ASSIDUIDADE_COMISSOES,
-    )
-
-    href_pattern = re.compile(r"https://www\.camara\.leg\.br/deputados/\d+")
-    id_ano_pattern = r"/deputados/(?P<id>\d+)\?.*ano=(?P<ano>\d+)"
-
-    htmls_list = []
-
-    # Caso ocorra erro na hora do download do HTML, eles podem retornar como None
-    # Para evitar erro, limpar os None. O erro já deve ter sido pêgo no download.
-    htmls = list(filter(None, htmls))
-
-    for html in htmls:
-        tree = HTMLParser(cast(str, html))
-        all_links = tree.css("a")
-        for link in all_links:
-            href = link.attributes.get("href", "")
-            if isinstance(href, str):
-                if href_pattern.match(href):
-                    match = re.search(id_ano_pattern, href)
-                    if match:
-                        deputado_id = int(match.group("id"))
-                        year = int(match.group("ano"))
-
-                        htmls_list.append(
-                            {"deputado_id": deputado_id, "ano": year, "html": html}
-                        )
-
-                    else:
-                        logger.warning(
-                            "Não foram encontrados dados suficientes na página HTML"
-                        )
-            else:
-                logger.warning(f"O href {href} não é string")
-
-    dest_path = save_htmls_in_zip(
-        htmls_list, Path(ExtractOutDir.CAMARA.DEPUTADOS_ASSIDUIDADE_COMISSOES)
-    )
+    # Cada página é gravada no zip assim que chega, indexada pela chave derivada da URL requisitada,
+    # e enviada ao pool de processos que extrai os registros de presença enquanto os downloads continuam
+    async with ParseStage(
+        parse_assiduidade_html,
+        ExtractOutDir.CAMARA.DEPUTADOS_ASSIDUIDADE_COMISSOES_PRESENCAS,
+    ) as parser:
+        dest_path = await fetch_html_many_to_zip(
+            urls=urls["urls_to_download"],
+            not_downloaded_urls=urls["not_downloaded_urls"],
+            limit=APP_SETTINGS.CAMARA.FETCH_LIMIT,
+            max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
+            id_lote=id_lote,
+            task=TasksNames.CAMARA.EXTRACT.DEPUTADOS_ASSIDUIDADE_COMISSOES,
+            zip_path=ExtractOutDir.CAMARA.DEPUTADOS_ASSIDUIDADE_COMISSOES,
+            key=assiduidade_archive_key,
+            on_page=parser.submit,
+        )
 
-    return str(dest_path)
+    return dest_path
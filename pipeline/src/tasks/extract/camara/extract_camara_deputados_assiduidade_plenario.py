@@ -1,19 +1,17 @@
-import re
 from datetime import date
 from logging import Logger
-from pathlib import Path
-from typing import cast
 
 from prefect import get_run_logger, task
-from prefect.artifacts import acreate_table_artifact
 from prefect.logging.loggers import LoggingAdapter
-from selectolax.parser import HTMLParser
 
 from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
-from utils.io import fetch_html_many_async, save_htmls_in_zip
+from utils.camara import assiduidade_archive_key, parse_assiduidade_html
+from utils.io import fetch_html_many_to_zip
+from utils.lote_archive import extract_path
+from utils.parsing import ParseStage
 
 APP_SETTINGS = load_config()
 
@@ -58,9 +56,11 @@ async def extract_camara_deputados_assiduidade_plenario(
     id_lote: int,
     ignore_tasks: list[str],
     use_files: bool,
+    replay_lote: int | None = None,
 ) -> str | None:
     """
     Baixa páginas HTML com os dados sobre a assiduidade dos Deputados em Plenário
+    e extrai os registros de presença de cada sessão para um NDJSON.
     """
     logger = get_run_logger()
 
@@ -73,7 +73,9 @@ async def extract_camara_deputados_assiduidade_plenario(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.DEPUTADOS_ASSIDUIDADE_PLENARIO} irá retornar os dados à partir do arquivo em disco."
         )
-        return load_ndjson()  # CONTINUAR AQUI DEPOIS RETORNANDO OS HTMLS
+        return extract_path(
+            ExtractOutDir.CAMARA.DEPUTADOS_ASSIDUIDADE_PLENARIO, replay_lote
+        )
     if not deputados_ids:
         logger.warning(
             f"Não foi possível executar a task '{TasksNames.CAMARA.EXTRACT.DEPUTADOS_ASSIDUIDADE_PLENARIO}' pois o argumento do parâmetro 'deputados_ids' é nulo"
@@ -86,52 +88,22 @@ async def extract_camara_deputados_assiduidade_plenario(
         f"Câmara: buscando Assiduidade Plenário de {len(deputados_ids)} deputados."
     )
 
-    htmls = await fetch_html_many_async(
-        urls=urls["urls_to_download"],
-        not_downloaded_urls=urls["not_downloaded_urls"],
-        limit=APP_SETTINGS.CAMARA.FETCH_LIMIT,
-        max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
-        id_lote=id_lote,
-        task=TasksNames.CAMARA.EXTRACT.DEPUTADOS_ASSIDUIDADE_PLENARIO,
-    )
-
-    href_pattern = re.compile(r"https://www\.camara\.leg\.br/deputados/\d+")
-    id_ano_pattern = r"/deputados/(?P<id>\d+)\?.*ano=(?P<ano>\d+)"
-
-    # Montando os resultados JSON e o artefato
-    artifact_data = []
-    htmls_list = []
-
-    # Caso ocorra erro na hora do download do HTML, eles podem retornar como None
-    # Para evitar erro, limpar os None. O erro já deve ter sido pêgo no download.
-    htmls = list(filter(None, htmls))
-
-    for html in htmls:
-        tree = HTMLParser(cast(str, html))
-        all_links = tree.css("a")
-        for link in all_links:
-            href = link.attributes.get("href", "")
-            if isinstance(href, str):
-                if href_pattern.match(href):
-                    match = re.search(id_ano_pattern, href)
-                    if match:
-                        deputado_id = int(match.group("id"))
-                        year = int(match.group("ano"))
-
-                        htmls_list.append(
-                            {"deputado_id": deputado_id, "ano": year, "html": html}
-                        )
-            else:
-                logger.warning(f"O href {href} não é string")
-
-    await acreate_table_artifact(
-        key="assiduidade-plenario",
-        table=artifact_data,
-        description="Assiduidade de deputados Plenário",
-    )
-
-    dest_path = save_htmls_in_zip(
-        htmls_list, Path(ExtractOutDir.CAMARA.DEPUTADOS_ASSIDUIDADE_PLENARIO)
-    )
+    # Cada página é gravada no zip assim que chega, indexada pela chave derivada da URL requisitada,
+    # e enviada ao pool de processos que extrai os registros de presença enquanto os downloads continuam
+    async with ParseStage(
+        parse_assiduidade_html,
+        ExtractOutDir.CAMARA.DEPUTADOS_ASSIDUIDADE_PLENARIO_PRESENCAS,
+    ) as parser:
+        dest_path = await fetch_html_many_to_zip(
+            urls=urls["urls_to_download"],
+            not_downloaded_urls=urls["not_downloaded_urls"],
+            limit=APP_SETTINGS.CAMARA.FETCH_LIMIT,
+            max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
+            id_lote=id_lote,
+            task=TasksNames.CAMARA.EXTRACT.DEPUTADOS_ASSIDUIDADE_PLENARIO,
+            zip_path=ExtractOutDir.CAMARA.DEPUTADOS_ASSIDUIDADE_PLENARIO,
+            key=assiduidade_archive_key,
+            on_page=parser.submit,
+        )
 
-    return str(dest_path)
+    return dest_path
@@ -1,7 +1,6 @@
 from datetime import date
 from logging import Logger
 from pathlib import Path
-from typing import cast
 
 from prefect import get_run_logger, task
 from prefect.logging.loggers import LoggingAdapter
@@ -10,8 +9,9 @@ from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
-from utils.fetch_many_jsons import fetch_many_jsons
-from utils.io import load_ndjson, save_ndjson
+from utils.fetch_many_jsons import iter_many_jsons
+from utils.io import save_ndjson_async
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -116,7 +116,8 @@ async def extract_camara_deputados_despesas(
     id_lote: int,
     ignore_tasks: list[str],
     use_files: bool,
-) -> list[dict] | None:
+    replay_lote: int | None = None,
+) -> str | None:
     logger = get_run_logger()
 
     if TasksNames.CAMARA.EXTRACT.DEPUTADOS_DESPESAS in ignore_tasks:
@@ -128,7 +129,7 @@ async def extract_camara_deputados_despesas(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.DEPUTADOS_DESPESAS} irá retornar os dados à partir do arquivo em disco."
         )
-        return load_ndjson(ExtractOutDir.CAMARA.DEPUTADOS_DESPESAS)
+        return extract_path(ExtractOutDir.CAMARA.DEPUTADOS_DESPESAS, replay_lote)
     if not deputados_ids:
         logger.warning(
             f"Não foi possível executar a task '{TasksNames.CAMARA.EXTRACT.DEPUTADOS_DESPESAS}' pois o argumento do parâmetro 'deputados_ids' é nulo"
@@ -138,7 +139,8 @@ async def extract_camara_deputados_despesas(
     urls = urls_despesas(deputados_ids, start_date, end_date, logger)
     logger.info(f"Câmara: buscando despesas de {len(urls)} URLs")
 
-    jsons = await fetch_many_jsons(
+    # As páginas são gravadas no NDJSON à medida que chegam, sem manter a lista inteira em memória
+    pages = iter_many_jsons(
         urls=urls["urls_to_download"],
         not_downloaded_urls=urls["not_downloaded_urls"],
         limit=APP_SETTINGS.CAMARA.FETCH_LIMIT,
@@ -149,6 +151,8 @@ async def extract_camara_deputados_despesas(
         id_lote=id_lote,
     )
 
-    save_ndjson(cast(list[dict], jsons), Path(ExtractOutDir.CAMARA.DEPUTADOS_DESPESAS))
+    dest_path = await save_ndjson_async(
+        pages, Path(ExtractOutDir.CAMARA.DEPUTADOS_DESPESAS)
+    )
 
-    return cast(list[dict], jsons)
+    return dest_path
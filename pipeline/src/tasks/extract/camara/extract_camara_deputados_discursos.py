@@ -12,6 +12,7 @@ from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -58,6 +59,7 @@ async def extract_camara_deputados_discursos(
     id_lote: int,
     ignore_tasks: list[str],
     use_files: bool,
+    replay_lote: int | None = None,
 ) -> list[dict] | None:
     logger = get_run_logger()
 
@@ -70,7 +72,9 @@ async def extract_camara_deputados_discursos(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.DEPUTADOS_DISCURSOS} irá retornar os dados à partir do arquivo em disco."
         )
-        return load_ndjson(ExtractOutDir.CAMARA.DEPUTADOS_DISCURSOS)
+        return load_ndjson(
+            extract_path(ExtractOutDir.CAMARA.DEPUTADOS_DISCURSOS, replay_lote)
+        )
     if not deputados_ids:
         logger.warning(
             f"Não foi possível executar a task '{TasksNames.CAMARA.EXTRACT.DEPUTADOS_DISCURSOS}' pois o argumento do parâmetro 'deputados_ids' é nulo"
@@ -11,6 +11,7 @@ from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -47,6 +48,7 @@ async def extract_camara_deputados_ocupacoes(
     id_lote: int,
     ignore_tasks: list[str],
     use_files: bool,
+    replay_lote: int | None = None,
 ) -> list[dict] | None:
     logger = get_run_logger()
 
@@ -59,7 +61,9 @@ async def extract_camara_deputados_ocupacoes(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.DEPUTADOS_OCUPACOES} irá retornar os dados à partir do arquivo em disco."
         )
-        return load_ndjson(ExtractOutDir.CAMARA.DEPUTADOS_OCUPACOES)
+        return load_ndjson(
+            extract_path(ExtractOutDir.CAMARA.DEPUTADOS_OCUPACOES, replay_lote)
+        )
     if not deputados_ids:
         logger.warning(
             f"Não foi possível executar a task '{TasksNames.CAMARA.EXTRACT.DEPUTADOS_OCUPACOES}' pois o argumento do parâmetro 'deputados_ids' é nulo"
@@ -7,7 +7,8 @@ from prefect import get_run_logger, task
 from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from utils.fetch_many_jsons import fetch_many_jsons
-from utils.io import load_ndjson, save_ndjson
+from utils.io import existing_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -31,7 +32,11 @@ async def extract_camara_eventos(
     id_lote: int,
     ignore_tasks: list[str],
     use_files: bool,
-) -> list[dict] | None:
+    replay_lote: int | None = None,
+) -> str | None:
+    """
+    Retorna o caminho do NDJSON gravado: a task de load lê os eventos linha a linha, sem receber a lista inteira.
+    """
     logger = get_run_logger()
 
     if TasksNames.CAMARA.EXTRACT.EVENTOS in ignore_tasks:
@@ -39,9 +44,9 @@ async def extract_camara_eventos(
         return
     if use_files:
         logger.warning(
-            f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.EVENTOS} irá retornar os dados à partir do arquivo em disco."
+            f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.EVENTOS} irá retornar o caminho do arquivo em disco."
         )
-        return load_ndjson(ExtractOutDir.CAMARA.EVENTOS)
+        return existing_ndjson(extract_path(ExtractOutDir.CAMARA.EVENTOS, replay_lote))
 
     logger.info("Baixando Eventos Câmara")
     url = get_url(start_date=start_date, end_date=end_date)
@@ -58,6 +63,4 @@ async def extract_camara_eventos(
         id_lote=id_lote,
     )
 
-    save_ndjson(cast(list[dict], jsons), Path(ExtractOutDir.CAMARA.EVENTOS))
-
-    return cast(list[dict], jsons)
+    return save_ndjson(cast(list[dict], jsons), Path(ExtractOutDir.CAMARA.EVENTOS))
@@ -8,6 +8,7 @@ from config.parameters import ExtractOutDir, TasksNames
 from utils.camara import get_current_legislatura
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -32,7 +33,11 @@ def get_ids_frentes(jsons: list[dict]) -> list[str]:
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
 async def extract_camara_frentes(
-    legislaturas: dict | None, id_lote: int, ignore_tasks: list[str], use_files: bool
+    legislaturas: dict | None,
+    id_lote: int,
+    ignore_tasks: list[str],
+    use_files: bool,
+    replay_lote: int | None = None,
 ) -> list[str] | None:
     logger = get_run_logger()
 
@@ -43,7 +48,9 @@ async def extract_camara_frentes(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.FRENTES} irá retornar os dados à partir do arquivo em disco."
         )
-        return get_ids_frentes(load_ndjson(ExtractOutDir.CAMARA.FRENTES))
+        return get_ids_frentes(
+            load_ndjson(extract_path(ExtractOutDir.CAMARA.FRENTES, replay_lote))
+        )
     if not legislaturas:
         logger.warning(
             f"Não foi possível executar a task '{TasksNames.CAMARA.EXTRACT.FRENTES}' pois o argumento do parâmetro 'legislatura' é nulo"
@@ -11,6 +11,7 @@ from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -47,6 +48,7 @@ async def extract_camara_frentes_detalhes(
     id_lote: int,
     ignore_tasks: list[str],
     use_files: bool,
+    replay_lote: int | None = None,
 ) -> list[dict] | None:
     logger = get_run_logger()
 
@@ -59,7 +61,9 @@ async def extract_camara_frentes_detalhes(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.FRENTES_DETALHES} irá retornar os dados à partir do arquivo em disco."
         )
-        return load_ndjson(ExtractOutDir.CAMARA.FRENTES_DETALHES)
+        return load_ndjson(
+            extract_path(ExtractOutDir.CAMARA.FRENTES_DETALHES, replay_lote)
+        )
     if TasksNames.CAMARA.EXTRACT.FRENTES_DETALHES in ignore_tasks:
         logger.warning(
             f"A Task {TasksNames.CAMARA.EXTRACT.FRENTES_DETALHES} foi ignorada"
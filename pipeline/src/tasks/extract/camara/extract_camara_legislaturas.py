@@ -5,6 +5,7 @@ from prefect import get_run_logger, task
 from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from utils.io import fetch_json, load_json, save_json
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -19,7 +20,10 @@ def get_url() -> str:
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
 def extract_camara_legislaturas(
-    id_lote: int, ignore_tasks: list[str], use_files: bool
+    id_lote: int,
+    ignore_tasks: list[str],
+    use_files: bool,
+    replay_lote: int | None = None,
 ) -> dict | None:
     logger = get_run_logger()
 
@@ -30,14 +34,16 @@ def extract_camara_legislaturas(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.LEGISLATURAS} irá retornar os dados à partir do arquivo em disco."
         )
-        return load_json(ExtractOutDir.CAMARA.LEGISLATURAS)
+        return load_json(extract_path(ExtractOutDir.CAMARA.LEGISLATURAS, replay_lote))
 
     LEGISLATURA_URL = get_url()
 
     logger.info(f"CÂMARA: Baixando Legislaturas de {LEGISLATURA_URL}")
 
     json = fetch_json(
-        url=LEGISLATURA_URL, max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES
+        url=LEGISLATURA_URL,
+        max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
+        task=TasksNames.CAMARA.EXTRACT.LEGISLATURAS,
     )
     json = cast(dict, json)
 
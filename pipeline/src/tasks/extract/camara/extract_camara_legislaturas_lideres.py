@@ -8,6 +8,7 @@ from config.parameters import ExtractOutDir, TasksNames
 from utils.camara import get_current_legislatura
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -23,7 +24,11 @@ def lideres_url(legislaturas: dict) -> str:
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
 async def extract_camara_legislaturas_lideres(
-    legislaturas: dict | None, id_lote: int, ignore_tasks: list[str], use_files: bool
+    legislaturas: dict | None,
+    id_lote: int,
+    ignore_tasks: list[str],
+    use_files: bool,
+    replay_lote: int | None = None,
 ) -> list[dict] | None:
     logger = get_run_logger()
 
@@ -36,7 +41,9 @@ async def extract_camara_legislaturas_lideres(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.LEGISLATURAS_LIDERES} irá retornar os dados à partir do arquivo em disco."
         )
-        return load_ndjson(ExtractOutDir.CAMARA.LEGISLATURAS_LIDERES)
+        return load_ndjson(
+            extract_path(ExtractOutDir.CAMARA.LEGISLATURAS_LIDERES, replay_lote)
+        )
     if not legislaturas:
         logger.warning(
             f"Não foi possível executar a task '{TasksNames.CAMARA.EXTRACT.LEGISLATURAS_LIDERES}' pois o argumento do parâmetro 'legislaturas' é nulo"
@@ -7,6 +7,7 @@ from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from utils.camara import get_current_legislatura
 from utils.io import fetch_json, load_json, save_json
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -22,7 +23,11 @@ def mesa_url(legislaturas: dict) -> str:
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
 def extract_camara_legislaturas_mesa(
-    legislaturas: dict | None, id_lote: int, ignore_tasks: list[str], use_files: bool
+    legislaturas: dict | None,
+    id_lote: int,
+    ignore_tasks: list[str],
+    use_files: bool,
+    replay_lote: int | None = None,
 ) -> dict | None:
     logger = get_run_logger()
 
@@ -35,7 +40,9 @@ def extract_camara_legislaturas_mesa(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.LEGISLATURAS_MESA} irá retornar os dados à partir do arquivo em disco."
         )
-        return load_json(ExtractOutDir.CAMARA.LEGISLATURAS_MESA)
+        return load_json(
+            extract_path(ExtractOutDir.CAMARA.LEGISLATURAS_MESA, replay_lote)
+        )
     if not legislaturas:
         logger.warning(
             f"Não foi possível executar a task '{TasksNames.CAMARA.EXTRACT.LEGISLATURAS_MESA}' pois o argumento do parâmetro 'legislaturas' é nulo"
@@ -46,7 +53,11 @@ def extract_camara_legislaturas_mesa(
     url = mesa_url(legislaturas)
     logger.info(f"Buscando Mesa Legislatura da URL {url}")
 
-    json = fetch_json(url=url, max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES)
+    json = fetch_json(
+        url=url,
+        max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
+        task=TasksNames.CAMARA.EXTRACT.LEGISLATURAS_MESA,
+    )
 
     json = cast(dict, json)
 
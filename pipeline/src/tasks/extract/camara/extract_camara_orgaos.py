@@ -8,6 +8,7 @@ from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -30,6 +31,7 @@ async def extract_camara_orgaos(
     id_lote: int,
     ignore_tasks: list[str],
     use_files: bool,
+    replay_lote: int | None = None,
 ) -> list[dict] | None:
     logger = get_run_logger()
 
@@ -40,7 +42,7 @@ async def extract_camara_orgaos(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.ORGAOS} irá retornar os dados à partir do arquivo em disco."
         )
-        return load_ndjson(ExtractOutDir.CAMARA.ORGAOS)
+        return load_ndjson(extract_path(ExtractOutDir.CAMARA.ORGAOS, replay_lote))
 
     logger.info("Baixando Órgãos Câmara")
     url = get_url(start_date=start_date, end_date=end_date)
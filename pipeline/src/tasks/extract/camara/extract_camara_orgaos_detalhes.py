@@ -11,6 +11,7 @@ from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -62,6 +63,7 @@ async def extract_camara_orgaos_detalhes(
     id_lote: int,
     ignore_tasks: list[str],
     use_files: bool,
+    replay_lote: int | None = None,
 ) -> list[dict] | None:
     logger = get_run_logger()
 
@@ -74,7 +76,9 @@ async def extract_camara_orgaos_detalhes(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.ORGAOS_DETALHES} irá retornar os dados à partir do arquivo em disco."
         )
-        return load_ndjson(ExtractOutDir.CAMARA.ORGAOS_DETALHES)
+        return load_ndjson(
+            extract_path(ExtractOutDir.CAMARA.ORGAOS_DETALHES, replay_lote)
+        )
     if not orgaos:
         logger.warning(
             f"Não foi possível executar a task '{TasksNames.CAMARA.EXTRACT.ORGAOS_DETALHES}' pois o argumento do parâmetro 'orgaos' é nulo"
@@ -11,7 +11,8 @@ from config.parameters import ExtractOutDir, TasksNames
 from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
 from utils.fetch_many_jsons import fetch_many_jsons
-from utils.io import load_ndjson, save_ndjson
+from utils.io import existing_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -64,7 +65,11 @@ async def extract_camara_orgaos_membros(
     id_lote: int,
     ignore_tasks: list[str],
     use_files: bool,
-) -> list[dict] | None:
+    replay_lote: int | None = None,
+) -> str | None:
+    """
+    Retorna o caminho do NDJSON gravado: a task de load lê os membros linha a linha, sem receber a lista inteira.
+    """
     logger = get_run_logger()
 
     if TasksNames.CAMARA.EXTRACT.ORGAOS_MEMBROS in ignore_tasks:
@@ -74,9 +79,11 @@ async def extract_camara_orgaos_membros(
         return
     if use_files:
         logger.warning(
-            f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.ORGAOS_MEMBROS} irá retornar os dados à partir do arquivo em disco."
+            f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.ORGAOS_MEMBROS} irá retornar o caminho do arquivo em disco."
+        )
+        return existing_ndjson(
+            extract_path(ExtractOutDir.CAMARA.ORGAOS_MEMBROS, replay_lote)
         )
-        return load_ndjson(ExtractOutDir.CAMARA.ORGAOS_MEMBROS)
     if not orgaos:
         logger.warning(
             f"Não foi possível executar a task '{TasksNames.CAMARA.EXTRACT.ORGAOS_MEMBROS}' pois o argumento do parâmetro 'orgaos' é nulo"
@@ -102,6 +109,6 @@ async def extract_camara_orgaos_membros(
         id_lote=id_lote,
     )
 
-    save_ndjson(cast(list[dict], jsons), Path(ExtractOutDir.CAMARA.ORGAOS_MEMBROS))
-
-    return cast(list[dict], jsons)
+    return save_ndjson(
+        cast(list[dict], jsons), Path(ExtractOutDir.CAMARA.ORGAOS_MEMBROS)
+    )
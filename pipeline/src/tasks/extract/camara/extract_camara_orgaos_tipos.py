@@ -5,6 +5,7 @@ from prefect import get_run_logger, task
 from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from utils.io import fetch_json, load_json, save_json
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -15,7 +16,7 @@ APP_SETTINGS = load_config()
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
 def extract_camara_orgaos_tipos(
-    ignore_tasks: list[str], use_files: bool
+    ignore_tasks: list[str], use_files: bool, replay_lote: int | None = None
 ) -> dict | None:
     logger = get_run_logger()
 
@@ -26,14 +27,16 @@ def extract_camara_orgaos_tipos(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.ORGAOS_TIPOS} irá retornar os dados à partir do arquivo em disco."
         )
-        return load_json(ExtractOutDir.CAMARA.ORGAOS_TIPOS)
+        return load_json(extract_path(ExtractOutDir.CAMARA.ORGAOS_TIPOS, replay_lote))
 
     ORGAOS_TIPOS_URL = f"{APP_SETTINGS.CAMARA.REST_BASE_URL}referencias/tiposOrgao"
 
     logger.info(f"Baixando Tipos Órgãos de {len(ORGAOS_TIPOS_URL)}")
 
     json = fetch_json(
-        url=ORGAOS_TIPOS_URL, max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES
+        url=ORGAOS_TIPOS_URL,
+        max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
+        task=TasksNames.CAMARA.EXTRACT.ORGAOS_TIPOS,
     )
     json = cast(dict, json)
 
@@ -8,6 +8,7 @@ from config.parameters import ExtractOutDir, TasksNames
 from utils.camara import get_current_legislatura
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -31,7 +32,11 @@ def get_partidos_ids(jsons: list[dict]) -> list[int]:
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
 async def extract_camara_partidos(
-    legislaturas: dict | None, id_lote: int, ignore_tasks: list[str], use_files: bool
+    legislaturas: dict | None,
+    id_lote: int,
+    ignore_tasks: list[str],
+    use_files: bool,
+    replay_lote: int | None = None,
 ) -> list[int] | None:
     logger = get_run_logger()
 
@@ -42,7 +47,7 @@ async def extract_camara_partidos(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.PARTIDOS} irá retornar os dados à partir do arquivo em disco."
         )
-        jsons = load_ndjson(ExtractOutDir.CAMARA.PARTIDOS)
+        jsons = load_ndjson(extract_path(ExtractOutDir.CAMARA.PARTIDOS, replay_lote))
         return get_partidos_ids(jsons)
     if not legislaturas:
         logger.warning(
@@ -7,6 +7,7 @@ from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -26,6 +27,7 @@ async def extract_camara_proposicoes(
     id_lote: int,
     ignore_tasks: list[str],
     use_files: bool,
+    replay_lote: int | None = None,
 ) -> list[int] | None:
     logger = get_run_logger()
 
@@ -36,7 +38,9 @@ async def extract_camara_proposicoes(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.PROPOSICOES} irá retornar os dados à partir do arquivo em disco."
         )
-        return get_ids_proposicoes(load_ndjson(ExtractOutDir.CAMARA.PROPOSICOES))
+        return get_ids_proposicoes(
+            load_ndjson(extract_path(ExtractOutDir.CAMARA.PROPOSICOES, replay_lote))
+        )
 
     # url = f"{APP_SETTINGS.CAMARA.REST_BASE_URL}proposicoes?dataInicio={start_date}&dataFim={end_date}&itens=100&ordem=ASC&ordenarPor=id"
     ## Retiirando dataFim pois está bugando
@@ -8,6 +8,7 @@ from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -51,6 +52,7 @@ async def extract_camara_votacoes(
     id_lote: int,
     ignore_tasks: list[str],
     use_files: bool,
+    replay_lote: int | None = None,
 ) -> list[str] | None:
     logger = get_run_logger()
 
@@ -61,7 +63,9 @@ async def extract_camara_votacoes(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.VOTACOES} irá retornar os dados à partir do arquivo em disco."
         )
-        return get_ids_votacoes(load_ndjson(ExtractOutDir.CAMARA.VOTACOES))
+        return get_ids_votacoes(
+            load_ndjson(extract_path(ExtractOutDir.CAMARA.VOTACOES, replay_lote))
+        )
 
     urls = generate_urls(start_date, end_date)
 
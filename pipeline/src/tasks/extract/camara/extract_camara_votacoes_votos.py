@@ -1,6 +1,5 @@
 from logging import Logger
 from pathlib import Path
-from typing import cast
 
 from prefect import get_run_logger, task
 from prefect.logging.loggers import LoggingAdapter
@@ -9,8 +8,9 @@ from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
-from utils.fetch_many_jsons import fetch_many_jsons
-from utils.io import load_ndjson, save_ndjson
+from utils.fetch_many_jsons import iter_many_jsons
+from utils.io import save_ndjson_async
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -47,7 +47,8 @@ async def extract_camara_votacoes_votos(
     id_lote: int,
     ignore_tasks: list[str],
     use_files: bool,
-) -> list[dict] | None:
+    replay_lote: int | None = None,
+) -> str | None:
     logger = get_run_logger()
 
     if TasksNames.CAMARA.EXTRACT.VOTACOES_VOTOS in ignore_tasks:
@@ -59,7 +60,7 @@ async def extract_camara_votacoes_votos(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.CAMARA.EXTRACT.VOTACOES_VOTOS} irá retornar os dados à partir do arquivo em disco."
         )
-        return load_ndjson(ExtractOutDir.CAMARA.VOTACOES_VOTOS)
+        return extract_path(ExtractOutDir.CAMARA.VOTACOES_VOTOS, replay_lote)
     if not votacoes_ids:
         logger.warning(
             f"Não foi possível executar a task '{TasksNames.CAMARA.EXTRACT.VOTACOES_VOTOS}' pois o argumento do parâmetro 'votacoes_ids' é nulo"
@@ -70,7 +71,8 @@ async def extract_camara_votacoes_votos(
 
     logger.info(f"Baixando votos de votações da Câmara de {len(urls)} URLs")
 
-    jsons = await fetch_many_jsons(
+    # As páginas são gravadas no NDJSON à medida que chegam, sem manter a lista inteira em memória
+    pages = iter_many_jsons(
         urls=urls["urls_to_download"],
         not_downloaded_urls=urls["not_downloaded_urls"],
         limit=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
@@ -80,6 +82,8 @@ async def extract_camara_votacoes_votos(
         id_lote=id_lote,
     )
 
-    save_ndjson(cast(list[dict], jsons), Path(ExtractOutDir.CAMARA.VOTACOES_VOTOS))
+    dest_path = await save_ndjson_async(
+        pages, Path(ExtractOutDir.CAMARA.VOTACOES_VOTOS)
+    )
 
-    return cast(list[dict], jsons)
+    return dest_path
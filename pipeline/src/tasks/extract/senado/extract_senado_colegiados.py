@@ -5,6 +5,7 @@ from prefect import get_run_logger, task
 from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from utils.io import fetch_json, load_json, save_json
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -15,7 +16,10 @@ APP_SETTINGS = load_config()
     retry_delay_seconds=APP_SETTINGS.SENADO.TASK_RETRY_DELAY,
 )
 def extract_senado_colegiados(
-    id_lote: int, use_files: bool, ignore_tasks: list[str]
+    id_lote: int,
+    use_files: bool,
+    ignore_tasks: list[str],
+    replay_lote: int | None = None,
 ) -> dict | None:
     logger = get_run_logger()
 
@@ -26,14 +30,18 @@ def extract_senado_colegiados(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.SENADO.EXTRACT.COLEGIADOS} irá retornar os dados à partir do arquivo em disco."
         )
-        json = load_json(ExtractOutDir.SENADO.COLEGIADOS)
+        json = load_json(extract_path(ExtractOutDir.SENADO.COLEGIADOS, replay_lote))
         return json
 
     url = f"{APP_SETTINGS.SENADO.REST_BASE_URL}comissao/lista/colegiados"
 
     logger.info(f"Baixando Colegiados do Senado: {url}")
 
-    json = fetch_json(url=url, max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES)
+    json = fetch_json(
+        url=url,
+        max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
+        task=TasksNames.SENADO.EXTRACT.COLEGIADOS,
+    )
 
     json = cast(dict, json)
 
@@ -7,6 +7,7 @@ from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_json, save_json
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -41,6 +42,7 @@ async def extract_senado_processos(
     id_lote: int,
     use_files: bool,
     ignore_tasks: list[str],
+    replay_lote: int | None = None,
 ) -> list[str] | None:
     logger = get_run_logger()
 
@@ -51,7 +53,9 @@ async def extract_senado_processos(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.SENADO.EXTRACT.PROCESSOS} irá retornar os dados à partir do arquivo em disco."
         )
-        return get_processos_ids(load_json(ExtractOutDir.SENADO.PROCESSOS))
+        return get_processos_ids(
+            load_json(extract_path(ExtractOutDir.SENADO.PROCESSOS, replay_lote))
+        )
 
     url = get_processos_url(start_date, end_date, logger)
 
@@ -10,6 +10,7 @@ from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -42,7 +43,11 @@ def processos_detalhes_urls(
     retry_delay_seconds=APP_SETTINGS.SENADO.TASK_RETRY_DELAY,
 )
 async def extract_senado_processos_detalhes(
-    ids_processos: list[str], id_lote: int, use_files: bool, ignore_tasks: list[str]
+    ids_processos: list[str],
+    id_lote: int,
+    use_files: bool,
+    ignore_tasks: list[str],
+    replay_lote: int | None = None,
 ) -> list[dict] | None:
     logger = get_run_logger()
 
@@ -55,7 +60,9 @@ async def extract_senado_processos_detalhes(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.SENADO.EXTRACT.PROCESSOS_DETALHES} irá retornar os dados à partir do arquivo em disco."
         )
-        jsons = load_ndjson(ExtractOutDir.SENADO.PROCESSOS_DETALHES)
+        jsons = load_ndjson(
+            extract_path(ExtractOutDir.SENADO.PROCESSOS_DETALHES, replay_lote)
+        )
         return jsons
 
     urls = processos_detalhes_urls(ids_processos, logger)
@@ -5,6 +5,7 @@ from prefect import get_run_logger, task
 from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from utils.io import fetch_json, load_json, save_json
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -33,7 +34,10 @@ def get_ids_senadores(json_exercicio: dict, json_afastados: dict) -> list[int]:
     retry_delay_seconds=APP_SETTINGS.SENADO.TASK_RETRY_DELAY,
 )
 def extract_senado_senadores(
-    id_lote: int, use_files: bool, ignore_tasks: list[str]
+    id_lote: int,
+    use_files: bool,
+    ignore_tasks: list[str],
+    replay_lote: int | None = None,
 ) -> list[int] | None:
     logger = get_run_logger()
 
@@ -44,8 +48,12 @@ def extract_senado_senadores(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.SENADO.EXTRACT.SENADORES} irá retornar os dados à partir do arquivo em disco."
         )
-        json_exercicio = load_json(ExtractOutDir.SENADO.SENADORES_EXERCICIO)
-        json_afastados = load_json(ExtractOutDir.SENADO.SENADORES_AFASTADOS)
+        json_exercicio = load_json(
+            extract_path(ExtractOutDir.SENADO.SENADORES_EXERCICIO, replay_lote)
+        )
+        json_afastados = load_json(
+            extract_path(ExtractOutDir.SENADO.SENADORES_AFASTADOS, replay_lote)
+        )
         ids_senadores = get_ids_senadores(
             json_exercicio=json_exercicio, json_afastados=json_afastados
         )
@@ -58,10 +66,14 @@ def extract_senado_senadores(
     logger.info(f"Baixando Senadores afastados: {url_afast}")
 
     json_exerc = fetch_json(
-        url=url_exerc, max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES
+        url=url_exerc,
+        max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
+        task=TasksNames.SENADO.EXTRACT.SENADORES,
     )
     json_afast = fetch_json(
-        url=url_afast, max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES
+        url=url_afast,
+        max_retries=APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
+        task=TasksNames.SENADO.EXTRACT.SENADORES,
     )
 
     json_exerc = cast(dict, json_exerc)
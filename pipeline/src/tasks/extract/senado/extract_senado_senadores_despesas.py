@@ -11,6 +11,7 @@ from database.models.base import UrlsResult
 from database.repository.erros_extract import verify_not_downloaded_urls_in_task_db
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 
 APP_SETTINGS = load_config()
 
@@ -54,6 +55,7 @@ async def extract_senado_senadores_despesas(
     id_lote: int,
     use_files: bool,
     ignore_tasks: list[str],
+    replay_lote: int | None = None,
 ) -> list[dict] | None:
     logger = get_run_logger()
 
@@ -66,7 +68,9 @@ async def extract_senado_senadores_despesas(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.SENADO.EXTRACT.SENADORES_DESPESAS} irá retornar os dados à partir do arquivo em disco."
         )
-        jsons = load_ndjson(ExtractOutDir.SENADO.SENADORES_DESPESAS)
+        jsons = load_ndjson(
+            extract_path(ExtractOutDir.SENADO.SENADORES_DESPESAS, replay_lote)
+        )
         return jsons
 
     urls = despesas_senadores_urls(start_date, end_date, logger)
@@ -7,6 +7,7 @@ from config.loader import load_config
 from config.parameters import ExtractOutDir, TasksNames
 from utils.fetch_many_jsons import fetch_many_jsons
 from utils.io import load_ndjson, save_ndjson
+from utils.lote_archive import extract_path
 from utils.url_utils import generate_date_urls_senado
 
 APP_SETTINGS = load_config()
@@ -34,6 +35,7 @@ async def extract_senado_votacoes(
     id_lote: int,
     use_files: bool,
     ignore_tasks: list[str],
+    replay_lote: int | None = None,
 ) -> list[dict] | None:
     logger = get_run_logger()
 
@@ -44,7 +46,7 @@ async def extract_senado_votacoes(
         logger.warning(
             f"O parâmetro 'use_files' é verdadeiro, a Task {TasksNames.SENADO.EXTRACT.VOTACOES} irá retornar os dados à partir do arquivo em disco."
         )
-        jsons = load_ndjson(ExtractOutDir.SENADO.VOTACOES)
+        jsons = load_ndjson(extract_path(ExtractOutDir.SENADO.VOTACOES, replay_lote))
         return jsons
 
     urls = get_votacoes_urls(start_date, end_date)
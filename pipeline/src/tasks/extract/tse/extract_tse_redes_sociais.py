@@ -5,10 +5,13 @@ from prefect import get_run_logger, task
 
 from config.loader import CACHE_POLICY_MAP, load_config
 from config.parameters import ExtractOutDir, TasksNames
-from utils.io import download_stream
+from utils.io import download_stream_async
 
 APP_SETTINGS = load_config()
 
+# O leiame.pdf não é extraído
+ZIP_MEMBERS = "*.csv"
+
 
 def cache_by_year(_ctx, params):
     return f"extract_tse_redes_sociais:{params['year']}"
@@ -26,7 +29,7 @@ def cache_by_year(_ctx, params):
     log_prints=True,
     persist_result=True,
 )
-def extract_tse_redes_sociais(
+async def extract_tse_redes_sociais(
     year: int, uf: str, id_lote: int, ignore_tasks: list[str]
 ) -> str | None:
     logger = get_run_logger()
@@ -45,10 +48,11 @@ def extract_tse_redes_sociais(
         f"Fazendo download das tabelas de redes sociais dos candidatos do estado {uf} da eleição de {year}: {url}"
     )
 
-    _tmp_zip_dest_path = download_stream(
+    _tmp_zip_dest_path = await download_stream_async(
         url=url,
         dest_path=file_dest_path,
         unzip=True,
+        members=ZIP_MEMBERS,
         task=f"{TasksNames.TSE.EXTRACT.REDES_SOCIAIS}_{uf}_{year}",
         id_lote=id_lote,
     )
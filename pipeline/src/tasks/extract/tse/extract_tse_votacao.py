@@ -5,10 +5,13 @@ from prefect import get_run_logger, task
 
 from config.loader import CACHE_POLICY_MAP, load_config
 from config.parameters import ExtractOutDir, TasksNames
-from utils.io import download_stream
+from utils.io import download_stream_async
 
 APP_SETTINGS = load_config()
 
+# Só o arquivo consolidado do Brasil, os CSVs por UF e o leiame.pdf não são extraídos
+ZIP_MEMBERS = "*_BRASIL.csv"
+
 
 def cache_by_year(_ctx, params):
     return f"extract_tse_votacao:{params['year']}"
@@ -26,7 +29,9 @@ def cache_by_year(_ctx, params):
     log_prints=True,
     persist_result=True,
 )
-def extract_tse_votacao(year: int, id_lote: int, ignore_tasks: list[str]) -> str | None:
+async def extract_tse_votacao(
+    year: int, id_lote: int, ignore_tasks: list[str]
+) -> str | None:
     logger = get_run_logger()
 
     if TasksNames.TSE.EXTRACT.VOTACAO in ignore_tasks:
@@ -43,10 +48,11 @@ def extract_tse_votacao(year: int, id_lote: int, ignore_tasks: list[str]) -> str
         f"Fazendo download das tabelas de resultado de votação da eleição de {year}: {url}"
     )
 
-    _tmp_zip_dest_path = download_stream(
+    _tmp_zip_dest_path = await download_stream_async(
         url=url,
         dest_path=file_dest_path,
         unzip=True,
+        members=ZIP_MEMBERS,
         task=f"{TasksNames.TSE.EXTRACT.VOTACAO}_{year}",
         id_lote=id_lote,
     )
@@ -15,7 +15,7 @@ APP_SETTINGS = load_config()
     retries=APP_SETTINGS.CAMARA.TASK_RETRIES,
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
-def load_camara_blocos(
+async def load_camara_blocos(
     id_lote: int, blocos: list[dict] | None, ignore_tasks: list[str]
 ):
     logger = get_run_logger()
@@ -47,7 +47,7 @@ def load_camara_blocos(
             )
 
     if data:
-        insert_camara_blocos_db(data)
+        await insert_camara_blocos_db(data)
     else:
         logger.warning(
             f"A lista de dados a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.BLOCOS} está vazia. A função de inserção será ignorada."
@@ -22,7 +22,7 @@ APP_SETTINGS = load_config()
     retries=APP_SETTINGS.CAMARA.TASK_RETRIES,
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
-def load_camara_deputados(
+async def load_camara_deputados(
     id_lote: int,
     deputados: list[dict] | None,
     ignore_tasks: list[str],
@@ -113,7 +113,7 @@ def load_camara_deputados(
             f"A lista de dados de REDES SOCIAIS DE DEPUTADOS a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.DEPUTADOS} está vazia. A função de inserção será ignorada."
         )
     else:
-        insert_camara_deputados_db(
+        await insert_camara_deputados_db(
             deputados_data=deputados_data,
             redes_sociais_data=redes_sociais_data,
         )
@@ -1,6 +1,6 @@
 import hashlib
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 from prefect import get_run_logger, task
 
@@ -12,18 +12,50 @@ from database.models.camara.camara_deputados import (
 from database.repository.camara.repository_camara_deputados import (
     insert_camara_deputados_historico_db,
 )
+from utils.io import iter_ndjson
 
 APP_SETTINGS = load_config()
 
 
+def historico_rows(
+    historico_deputados: Iterable[dict], id_lote: int
+) -> Iterator[CamaraDeputadosHistoricoArg]:
+    """
+    Gera as linhas do histórico uma a uma, para o COPY na staging consumir sem montar a lista inteira.
+    Os registros repetidos são resolvidos no merge da staging (DISTINCT ON).
+    """
+    for h_data in historico_deputados:
+        historico_dados = h_data.get("dados", [])
+
+        for historico in historico_dados:
+            pre_hash_content = f"{historico.get('id')}|{historico.get('nome')}|{historico.get('nomeEleitoral')}|{historico.get('siglaPartido')}|{historico.get('siglaUf')}|{historico.get('idLegislatura')}|{historico.get('dataHora')}|{historico.get('situacao')}|{historico.get('condicaoEleitoral')}|{historico.get('descricaoStatus')}"
+
+            hash = hashlib.md5(pre_hash_content.encode()).hexdigest()
+
+            yield CamaraDeputadosHistoricoArg(
+                id_lote=id_lote,
+                id_deputado=historico.get("id"),
+                nome=historico.get("nome"),
+                nome_eleitoral=historico.get("nomeEleitoral"),
+                sigla_partido=historico.get("siglaPartido"),
+                sigla_uf=historico.get("siglaUf"),
+                id_legislatura=historico.get("idLegislatura"),
+                data_hora=datetime.fromisoformat(historico.get("dataHora")),
+                situacao=historico.get("situacao"),
+                condicao_eleitoral=historico.get("condicaoEleitoral"),
+                descricao_status=historico.get("descricaoStatus"),
+                hash=hash,
+            )
+
+
 @task(
     task_run_name=TasksNames.CAMARA.LOAD.DEPUTADOS_HISTORICO,
     retries=APP_SETTINGS.CAMARA.TASK_RETRIES,
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
-def load_camara_deputados_historico(
+async def load_camara_deputados_historico(
     id_lote: int,
-    historico_deputados: list[dict] | None,
+    historico_deputados_path: str | None,
     ignore_tasks: list[str],
     _load_deputados: Any,
 ):
@@ -34,46 +66,21 @@ def load_camara_deputados_historico(
             f"A Task {TasksNames.CAMARA.LOAD.DEPUTADOS_HISTORICO} foi ignorada"
         )
         return
-    if historico_deputados is None:
+    if historico_deputados_path is None:
         logger.warning(
-            f"Não foi possível executar a task '{TasksNames.CAMARA.LOAD.DEPUTADOS_HISTORICO}' pois o argumento do parâmetro 'historico_deputados' é nulo"
+            f"Não foi possível executar a task '{TasksNames.CAMARA.LOAD.DEPUTADOS_HISTORICO}' pois o argumento do parâmetro 'historico_deputados_path' é nulo"
         )
         return
 
     logger.info("Carregando Histórico de Deputados da Câmara no Banco de Dados")
 
-    data: list[CamaraDeputadosHistoricoArg] = []
-
-    for h_data in historico_deputados:
-        historico_dados = h_data.get("dados", [])
-
-        for historico in historico_dados:
-            pre_hash_content = f"{historico.get('id')}|{historico.get('nome')}|{historico.get('nomeEleitoral')}|{historico.get('siglaPartido')}|{historico.get('siglaUf')}|{historico.get('idLegislatura')}|{historico.get('dataHora')}|{historico.get('situacao')}|{historico.get('condicaoEleitoral')}|{historico.get('descricaoStatus')}"
-
-            hash = hashlib.md5(pre_hash_content.encode()).hexdigest()
-
-            data.append(
-                CamaraDeputadosHistoricoArg(
-                    id_lote=id_lote,
-                    id_deputado=historico.get("id"),
-                    nome=historico.get("nome"),
-                    nome_eleitoral=historico.get("nomeEleitoral"),
-                    sigla_partido=historico.get("siglaPartido"),
-                    sigla_uf=historico.get("siglaUf"),
-                    id_legislatura=historico.get("idLegislatura"),
-                    data_hora=datetime.fromisoformat(historico.get("dataHora")),
-                    situacao=historico.get("situacao"),
-                    condicao_eleitoral=historico.get("condicaoEleitoral"),
-                    descricao_status=historico.get("descricaoStatus"),
-                    hash=hash,
-                )
-            )
+    total = await insert_camara_deputados_historico_db(
+        historico_rows(iter_ndjson(historico_deputados_path), id_lote)
+    )
 
-    if data:
-        insert_camara_deputados_historico_db(data)
-    else:
+    if not total:
         logger.warning(
-            f"A lista de dados a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.DEPUTADOS_HISTORICO} está vazia. A função de inserção será ignorada."
+            f"Não havia dados a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.DEPUTADOS_HISTORICO}."
         )
 
     return
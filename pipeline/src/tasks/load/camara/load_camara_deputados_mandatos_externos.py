@@ -20,7 +20,7 @@ APP_SETTINGS = load_config()
     retries=APP_SETTINGS.CAMARA.TASK_RETRIES,
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
-def load_camara_deputados_mandatos_externos(
+async def load_camara_deputados_mandatos_externos(
     id_lote: int,
     mandatos_externos: list[dict] | None,
     ignore_tasks: list[str],
@@ -74,7 +74,7 @@ def load_camara_deputados_mandatos_externos(
     )
 
     if data:
-        insert_camara_mandatos_externos_deputados_db(data)
+        await insert_camara_mandatos_externos_deputados_db(data)
     else:
         logger.warning(
             f"A lista de dados a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.DEPUTADOS_MANDATOS_EXTERNOS} está vazia. A função de inserção será ignorada."
@@ -20,7 +20,7 @@ APP_SETTINGS = load_config()
     retries=APP_SETTINGS.CAMARA.TASK_RETRIES,
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
-def load_camara_deputados_ocupacoes(
+async def load_camara_deputados_ocupacoes(
     id_lote: int,
     ocupacoes: list[dict] | None,
     ignore_tasks: list[str],
@@ -76,7 +76,7 @@ def load_camara_deputados_ocupacoes(
     )
 
     if data:
-        insert_camara_ocupacoes_deputados_db(data)
+        await insert_camara_ocupacoes_deputados_db(data)
 
     else:
         logger.warning(
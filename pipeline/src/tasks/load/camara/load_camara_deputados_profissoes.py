@@ -19,7 +19,7 @@ APP_SETTINGS = load_config()
     retries=APP_SETTINGS.CAMARA.TASK_RETRIES,
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
-def load_camara_deputados_profissoes(
+async def load_camara_deputados_profissoes(
     id_lote: int,
     profissoes: list[dict] | None,
     ignore_tasks: list[str],
@@ -64,7 +64,7 @@ def load_camara_deputados_profissoes(
             )
 
     if data:
-        insert_camara_profissoes_deputados_db(data)
+        await insert_camara_profissoes_deputados_db(data)
 
     else:
         logger.warning(
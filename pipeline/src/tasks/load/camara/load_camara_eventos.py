@@ -1,7 +1,6 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterable, Iterator
 
-import pandas as pd
 from prefect import get_run_logger, task
 
 from config.loader import load_config
@@ -14,30 +13,69 @@ from database.repository.camara.repository_camara_eventos import (
     insert_camara_eventos_db,
     insert_camara_eventos_orgaos_db,
 )
+from utils.io import iter_ndjson
 
 APP_SETTINGS = load_config()
 
 
-def remove_duplicates(
-    data_evento: list[CamaraEventosArg],
-    data_evento_orgaos: list[CamaraEventosOrgaosArg],
-) -> tuple[list[CamaraEventosArg], list[CamaraEventosOrgaosArg]]:
-    df_evento = pd.DataFrame([vars(x) for x in data_evento])
-    df_evento_orgaos = pd.DataFrame([vars(x) for x in data_evento_orgaos])
-
-    ### APARENTEMENTE O ERRO PARA O LOAD ESTA AQUI, VALORES DE COLUNAS DE NONE PARA NAN AO GERAR O DATAFRAME
-
-    df_evento = df_evento.drop_duplicates(subset=["id_evento"])
-    df_evento_orgaos = df_evento_orgaos.drop_duplicates(
-        subset=["id_evento", "id_orgao"]
-    )
+def _iter_eventos(eventos: Iterable[dict]) -> Iterator[dict]:
+    for item in eventos:
+        yield from item.get("dados", [])
+
+
+def eventos_rows(eventos: Iterable[dict], id_lote: int) -> Iterator[CamaraEventosArg]:
+    """
+    Gera as linhas de eventos uma a uma. Eventos repetidos entre páginas são descartados pelo id.
+    """
+    seen: set[int] = set()
+
+    for evento in _iter_eventos(eventos):
+        if evento.get("id") in seen:
+            continue
+        seen.add(evento.get("id"))
+
+        local_camara = evento.get("localCamara")
+
+        data_hora_inicio = evento.get("dataHoraInicio")
+        data_hora_fim = evento.get("dataHoraFim")
+        local_externo = evento.get("localExterno")
+
+        yield CamaraEventosArg(
+            id_lote=id_lote,
+            id_evento=evento.get("id"),
+            data_hora_inicio=datetime.fromisoformat(data_hora_inicio),
+            data_hora_fim=datetime.fromisoformat(data_hora_fim)
+            if data_hora_fim
+            else None,
+            situacao=evento.get("situacao"),
+            descricao_tipo=evento.get("descricaoTipo"),
+            descricao=evento.get("descricao"),
+            local_externo=str(local_externo) if local_externo is not None else None,
+            local_nome=local_camara.get("nome"),
+            url_registro=evento.get("urlRegistro"),
+        )
 
-    data_evento = [CamaraEventosArg(**row) for row in df_evento.to_dict("records")]
-    data_evento_orgaos = [
-        CamaraEventosOrgaosArg(**row) for row in df_evento_orgaos.to_dict("records")
-    ]
 
-    return data_evento, data_evento_orgaos
+def eventos_orgaos_rows(
+    eventos: Iterable[dict], id_lote: int
+) -> Iterator[CamaraEventosOrgaosArg]:
+    """
+    Gera as linhas da relação eventos x órgãos uma a uma, sem pares repetidos.
+    """
+    seen: set[tuple[int, int]] = set()
+
+    for evento in _iter_eventos(eventos):
+        for orgao in evento.get("orgaos"):
+            key = (evento.get("id"), orgao.get("id"))
+            if key in seen:
+                continue
+            seen.add(key)
+
+            yield CamaraEventosOrgaosArg(
+                id_lote=id_lote,
+                id_evento=evento.get("id"),
+                id_orgao=orgao.get("id"),
+            )
 
 
 @task(
@@ -45,84 +83,38 @@ def remove_duplicates(
     retries=APP_SETTINGS.CAMARA.TASK_RETRIES,
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
-def load_camara_eventos(
-    id_lote: int, eventos: list[dict] | None, ignore_tasks: list[str], _load_orgaos: Any
+async def load_camara_eventos(
+    id_lote: int, eventos_path: str | None, ignore_tasks: list[str], _load_orgaos: Any
 ):
     logger = get_run_logger()
 
     if TasksNames.CAMARA.LOAD.EVENTOS in ignore_tasks:
         logger.warning(f"A Task {TasksNames.CAMARA.LOAD.EVENTOS} foi ignorada")
         return
-    if eventos is None:
+    if eventos_path is None:
         logger.warning(
-            f"Não foi possível executar a task '{TasksNames.CAMARA.LOAD.EVENTOS}' pois o argumento do parâmetro 'eventos' é nulo"
+            f"Não foi possível executar a task '{TasksNames.CAMARA.LOAD.EVENTOS}' pois o argumento do parâmetro 'eventos_path' é nulo"
         )
         return
 
     logger.info("Carregando Eventos no Banco de Dados")
 
-    data_evento: list[CamaraEventosArg] = []
-    data_evento_orgaos: list[CamaraEventosOrgaosArg] = []
-
-    for item in eventos:
-        d = item.get("dados", [])
-        for evento in d:
-            local_camara = evento.get("localCamara")
-
-            data_hora_inicio = evento.get("dataHoraInicio")
-            data_hora_fim = evento.get("dataHoraFim")
-            local_externo = evento.get("localExterno")
-
-            data_evento.append(
-                CamaraEventosArg(
-                    id_lote=id_lote,
-                    id_evento=evento.get("id"),
-                    data_hora_inicio=datetime.fromisoformat(data_hora_inicio),
-                    data_hora_fim=datetime.fromisoformat(data_hora_fim)
-                    if data_hora_fim
-                    else None,
-                    situacao=evento.get("situacao"),
-                    descricao_tipo=evento.get("descricaoTipo"),
-                    descricao=evento.get("descricao"),
-                    local_externo=str(local_externo)
-                    if local_externo is not None
-                    else None,
-                    local_nome=local_camara.get("nome"),
-                    url_registro=evento.get("urlRegistro"),
-                )
-            )
-
-            orgaos = evento.get("orgaos")
-            for orgao in orgaos:
-                data_evento_orgaos.append(
-                    CamaraEventosOrgaosArg(
-                        id_lote=id_lote,
-                        id_evento=evento.get("id"),
-                        id_orgao=orgao.get("id"),
-                    )
-                )
-
-    print(len(data_evento_orgaos))
-
-    ## Removendo registros duplicados
-    data_evento = list({(evento.id_evento): evento for evento in data_evento}.values())
-    data_evento_orgaos = list(
-        {
-            (evento_orgao.id_evento, evento_orgao.id_orgao): evento_orgao
-            for evento_orgao in data_evento_orgaos
-        }.values()
+    # Os eventos precisam existir antes da relação com os órgãos (chave estrangeira).
+    # Cada passada abre o NDJSON de novo, então nenhuma delas precisa dos eventos inteiros em memória
+    total_eventos = await insert_camara_eventos_db(
+        eventos_rows(iter_ndjson(eventos_path), id_lote)
+    )
+    total_eventos_orgaos = await insert_camara_eventos_orgaos_db(
+        eventos_orgaos_rows(iter_ndjson(eventos_path), id_lote)
     )
 
-    if not data_evento:
+    if not total_eventos:
         logger.warning(
-            f"A lista de dados de EVENTOS a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.EVENTOS} está vazia. A função de inserção será ignorada."
+            f"Não havia dados de EVENTOS a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.EVENTOS}."
         )
-    if not data_evento_orgaos:
+    if not total_eventos_orgaos:
         logger.warning(
-            f"A lista de dados de EVENTOS ÓRGÃOS a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.EVENTOS} está vazia. A função de inserção será ignorada."
+            f"Não havia dados de EVENTOS ÓRGÃOS a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.EVENTOS}."
         )
-    else:
-        insert_camara_eventos_db(data_evento)
-        insert_camara_eventos_orgaos_db(data_evento_orgaos)
 
     return
@@ -17,7 +17,7 @@ APP_SETTINGS = load_config()
     retries=APP_SETTINGS.CAMARA.TASK_RETRIES,
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
-def load_camara_legislaturas(
+async def load_camara_legislaturas(
     id_lote: int, legislaturas: dict | None, ignore_tasks: list[str]
 ):
     logger = get_run_logger()
@@ -46,7 +46,7 @@ def load_camara_legislaturas(
         )
 
     if data:
-        insert_camara_legislaturas_db(data)
+        await insert_camara_legislaturas_db(data)
     else:
         logger.warning(
             f"A lista de dados a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.LEGISLATURAS} está vazia. A função de inserção será ignorada."
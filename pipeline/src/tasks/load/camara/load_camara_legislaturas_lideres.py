@@ -25,7 +25,7 @@ def get_id_bancada(uri: str) -> int:
     retries=APP_SETTINGS.CAMARA.TASK_RETRIES,
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
-def load_camara_legislaturas_lideres(
+async def load_camara_legislaturas_lideres(
     lideres: list[dict],
     id_lote: int,
     ignore_tasks: list[str],
@@ -88,7 +88,7 @@ def load_camara_legislaturas_lideres(
     )
 
     if data:
-        insert_camara_legislaturas_lideres_db(data)
+        await insert_camara_legislaturas_lideres_db(data)
     else:
         logger.warning(
             f"A lista de dados a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.LEGISLATURAS_LIDERES} está vazia. A função de inserção será ignorada."
@@ -18,7 +18,7 @@ APP_SETTINGS = load_config()
     retries=APP_SETTINGS.CAMARA.TASK_RETRIES,
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
-def load_camara_legislaturas_mesa(
+async def load_camara_legislaturas_mesa(
     mesa: dict,
     id_lote: int,
     ignore_tasks: list[str],
@@ -56,7 +56,7 @@ def load_camara_legislaturas_mesa(
         )
 
     if data:
-        insert_camara_legislaturas_mesa_db(data)
+        await insert_camara_legislaturas_mesa_db(data)
     else:
         logger.warning(
             f"A lista de dados a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.LEGISLATURAS_MESA} está vazia. A função de inserção será ignorada."
@@ -18,7 +18,7 @@ APP_SETTINGS = load_config()
     retries=APP_SETTINGS.CAMARA.TASK_RETRIES,
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
-def load_camara_orgaos(
+async def load_camara_orgaos(
     id_lote: int,
     orgaos: list[dict] | None,
     ignore_tasks: list[str],
@@ -72,7 +72,7 @@ def load_camara_orgaos(
         )
 
     if data:
-        insert_camara_orgaos_db(data=data)
+        await insert_camara_orgaos_db(data=data)
     else:
         logger.warning(
             f"A lista de dados a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.ORGAOS} está vazia. A função de inserção será ignorada."
@@ -1,7 +1,6 @@
 from datetime import date
-from typing import Any
+from typing import Any, Iterable, Iterator
 
-import pandas as pd
 from prefect import get_run_logger, task
 
 from config.loader import load_config
@@ -11,29 +10,78 @@ from database.repository.camara.repository_camara_orgaos import (
     insert_camara_orgaos_membros_db,
 )
 from utils.camara import get_current_legislatura
+from utils.columnar import SOURCE_URL_COLUMN, has_parquet, load_parquet
+from utils.io import iter_ndjson
 from utils.url_utils import get_path_parameter_value
 
 APP_SETTINGS = load_config()
 
+# Colunas lidas da versão Parquet: a URL de origem (com o id do órgão) e os campos do membro
+MEMBROS_COLUMNS = [
+    SOURCE_URL_COLUMN,
+    "id",
+    "idLegislatura",
+    "titulo",
+    "dataInicio",
+    "dataFim",
+]
+
+
+def _membro_row(membro: dict, id_orgao: Any, id_lote: int) -> CamaraOrgaosMembrosArg:
+    data_fim = membro.get("dataFim")
+    return CamaraOrgaosMembrosArg(
+        id_lote=id_lote,
+        id_orgao=id_orgao,
+        id_deputado=membro.get("id"),
+        id_legislatura=membro.get("idLegislatura"),
+        titulo=membro.get("titulo"),
+        data_inicio=date.fromisoformat(membro.get("dataInicio")),
+        data_fim=date.fromisoformat(data_fim) if data_fim else None,
+    )
 
-def deduplicate_membros(
-    data: list[CamaraOrgaosMembrosArg], legislaturas: dict
-) -> list[CamaraOrgaosMembrosArg]:
-    df = pd.DataFrame([item.__dict__ for item in data])
 
+def membros_rows(
+    membros_orgaos: Iterable[dict], legislaturas: dict, id_lote: int
+) -> Iterator[CamaraOrgaosMembrosArg]:
+    """
+    Gera as linhas de membros de órgãos uma a uma, apenas da legislatura atual.
+    As linhas seguem para um único COPY na staging; os registros repetidos são resolvidos no merge (DISTINCT ON),
+    mantendo o que tem data_fim preenchida.
+    """
     # Por algum motivo, na Leg 57 retorna esse Deputado da legislatura 54
     ID_LEGISLATURA_ATUAL = get_current_legislatura(legislaturas).id
 
-    df_sorted = df.sort_values("data_fim", na_position="last")  # None vai pro final
-    df_sorted = pd.DataFrame(
-        df_sorted[df_sorted["id_legislatura"] == ID_LEGISLATURA_ATUAL]
-    )  # Filtrar o id de dep de leg. anterior
-    df_dedup = df_sorted.drop_duplicates(
-        subset=["id_orgao", "id_deputado", "titulo", "data_inicio"],
-        keep="first",  # mantém o primeiro = o que tem data_fim preenchida
-    )
+    for orgao in membros_orgaos:
+        href = orgao.get("links", [])[0].get("href")
+        id_orgao = get_path_parameter_value(href, "orgaos", None)
 
-    return [CamaraOrgaosMembrosArg(**row) for row in df_dedup.to_dict(orient="records")]
+        membros = orgao.get("dados", [])
+        for membro in membros:
+            if membro.get("idLegislatura") != ID_LEGISLATURA_ATUAL:
+                continue
+
+            yield _membro_row(membro, id_orgao, id_lote)
+
+
+def membros_parquet_rows(
+    membros_orgaos_path: str, legislaturas: dict, id_lote: int
+) -> Iterator[CamaraOrgaosMembrosArg]:
+    """
+    As mesmas linhas do membros_rows, lidas da versão Parquet do extract: só as colunas usadas no load e só a
+    partição da legislatura atual.
+    """
+    ID_LEGISLATURA_ATUAL = get_current_legislatura(legislaturas).id
+
+    membros = load_parquet(
+        membros_orgaos_path,
+        columns=MEMBROS_COLUMNS,
+        filters=[("idLegislatura", "=", ID_LEGISLATURA_ATUAL)],
+    )
+    # Valores ausentes no Parquet viram None, como no NDJSON
+    membros = membros.astype(object).where(membros.notna(), None)
+    for membro in membros.to_dict(orient="records"):
+        id_orgao = get_path_parameter_value(membro[SOURCE_URL_COLUMN], "orgaos", None)
+        yield _membro_row(membro, id_orgao, id_lote)
 
 
 @task(
@@ -41,9 +89,9 @@ def deduplicate_membros(
     retries=APP_SETTINGS.CAMARA.TASK_RETRIES,
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
-def load_camara_orgaos_membros(
+async def load_camara_orgaos_membros(
     id_lote: int,
-    membros_orgaos: dict | None,
+    membros_orgaos_path: str | None,
     legislaturas: dict,
     ignore_tasks: list[str],
     _load_orgaos: Any,
@@ -54,43 +102,24 @@ def load_camara_orgaos_membros(
     if TasksNames.CAMARA.LOAD.ORGAOS_MEMBROS in ignore_tasks:
         logger.warning(f"A Task {TasksNames.CAMARA.LOAD.ORGAOS_MEMBROS} foi ignorada")
         return
-    if membros_orgaos is None:
+    if membros_orgaos_path is None:
         logger.warning(
-            f"Não foi possível executar a task '{TasksNames.CAMARA.LOAD.ORGAOS_MEMBROS}' pois o argumento do parâmetro 'membros_orgaos' é nulo"
+            f"Não foi possível executar a task '{TasksNames.CAMARA.LOAD.ORGAOS_MEMBROS}' pois o argumento do parâmetro 'membros_orgaos_path' é nulo"
         )
         return
 
     logger.info("Carregando Membros de Órgãos no Banco de Dados")
 
-    data: list[CamaraOrgaosMembrosArg] = []
-
-    for orgao in membros_orgaos:
-        href = orgao.get("links", [])[0].get("href")
-        id_orgao = get_path_parameter_value(href, "orgaos", None)
+    if has_parquet(membros_orgaos_path):
+        rows = membros_parquet_rows(membros_orgaos_path, legislaturas, id_lote)
+    else:
+        rows = membros_rows(iter_ndjson(membros_orgaos_path), legislaturas, id_lote)
 
-        membros = orgao.get("dados", [])
-        for membro in membros:
-            data_fim = membro.get("dataFim")
-            data.append(
-                CamaraOrgaosMembrosArg(
-                    id_lote=id_lote,
-                    id_orgao=id_orgao,
-                    id_deputado=membro.get("id"),
-                    id_legislatura=membro.get("idLegislatura"),
-                    titulo=membro.get("titulo"),
-                    data_inicio=date.fromisoformat(membro.get("dataInicio")),
-                    data_fim=date.fromisoformat(data_fim) if data_fim else None,
-                )
-            )
-
-    data = deduplicate_membros(data, legislaturas)
-
-    if data:
-        insert_camara_orgaos_membros_db(data)
+    total = await insert_camara_orgaos_membros_db(rows)
 
-    else:
+    if not total:
         logger.warning(
-            f"A lista de dados a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.ORGAOS_MEMBROS} está vazia. A função de inserção será ignorada."
+            f"Não havia dados a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.ORGAOS_MEMBROS}."
         )
 
     return
@@ -15,7 +15,7 @@ APP_SETTINGS = load_config()
     retries=APP_SETTINGS.CAMARA.TASK_RETRIES,
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
-def load_camara_orgaos_tipos(
+async def load_camara_orgaos_tipos(
     id_lote: int, tipos_orgaos: dict | None, ignore_tasks: list[str]
 ):
     logger = get_run_logger()
@@ -45,7 +45,7 @@ def load_camara_orgaos_tipos(
         )
 
     if data:
-        insert_camara_orgaos_tipos_db(data)
+        await insert_camara_orgaos_tipos_db(data)
     else:
         logger.warning(
             f"A lista de dados a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.ORGAOS_TIPOS} está vazia. A função de inserção será ignorada."
@@ -18,7 +18,7 @@ APP_SETTINGS = load_config()
     retries=APP_SETTINGS.CAMARA.TASK_RETRIES,
     retry_delay_seconds=APP_SETTINGS.CAMARA.TASK_RETRY_DELAY,
 )
-def load_camara_partidos(
+async def load_camara_partidos(
     id_lote: int,
     partidos: list[dict] | None,
     ignore_tasks: list[str],
@@ -72,7 +72,7 @@ def load_camara_partidos(
         )
 
     if data:
-        insert_camara_partidos_db(data)
+        await insert_camara_partidos_db(data)
     else:
         logger.warning(
             f"A lista de dados a serem inseridos no banco de dados na task {TasksNames.CAMARA.LOAD.PARTIDOS} está vazia. A função de inserção será ignorada."
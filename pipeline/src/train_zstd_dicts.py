@@ -0,0 +1,41 @@
+"""
+Treina os dicionários zstd de cada dataset (LOAD.ZSTD_DICT_DIR) com os NDJSON dos lotes arquivados (ARCHIVE.DIR).
+Depois do treino, as próximas gravações com LOAD.ZSTD usam o dicionário mais recente de cada dataset.
+
+Uso (a partir de pipeline/): PYTHONPATH=src python src/train_zstd_dicts.py [quantidade de lotes, padrão 3] [datasets...]
+"""
+
+import sys
+from pathlib import Path
+
+from utils.compression import dataset_name, plain_path, train_dictionary
+from utils.lote_archive import archived_file, archived_lotes, load_lote_manifest
+
+
+def archived_ndjsons(n_lotes: int) -> dict[str, list[Path]]:
+    """
+    NDJSONs dos últimos `n_lotes` lotes arquivados, agrupados por dataset (do lote mais recente para o mais antigo).
+    """
+    by_dataset: dict[str, list[Path]] = {}
+    for id_lote in reversed(archived_lotes()[-n_lotes:]):
+        for original in load_lote_manifest(id_lote)["files"]:
+            if plain_path(original).suffix != ".ndjson":
+                continue
+            by_dataset.setdefault(dataset_name(original), []).append(
+                archived_file(id_lote, original)
+            )
+    return by_dataset
+
+
+def main():
+    n_lotes = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    datasets = set(sys.argv[2:])
+
+    for dataset, paths in sorted(archived_ndjsons(n_lotes).items()):
+        if datasets and dataset not in datasets:
+            continue
+        train_dictionary(dataset, paths)
+
+
+if __name__ == "__main__":
+    main()
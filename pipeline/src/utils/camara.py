@@ -1,10 +1,16 @@
+import re
 from datetime import date, datetime
 from typing import Literal
 
 from pydantic.main import BaseModel
+from selectolax.parser import HTMLParser
 
 LegislaturaKeys = Literal["id", "dataInicio", "dataFim"]
 
+ASSIDUIDADE_URL_PATTERN = re.compile(
+    r"/deputados/(?P<id>\d+)/presenca-(?:plenario|comissoes)/(?P<ano>\d+)"
+)
+
 
 class LegislaturaReturn(BaseModel):
     id: int
@@ -67,3 +73,78 @@ def get_legislatura_data(
             raise ValueError(
                 f"O valor de '{property}' ('{prop_data}') não é conversível para um objeto de data."
             )
+
+
+def assiduidade_archive_key(url: str) -> str:
+    """
+    Chave da página de assiduidade no índice do zip ("<deputado_id>_<ano>"), obtida da URL requisitada.
+    """
+    match = ASSIDUIDADE_URL_PATTERN.search(url)
+    if not match:
+        raise ValueError(f"A URL '{url}' não é uma página de assiduidade de deputado")
+
+    return f"{match.group('id')}_{match.group('ano')}"
+
+
+def _assiduidade_column(header: str) -> str | None:
+    header = header.lower()
+    if "justific" in header:
+        return "justificativa"
+    if "presen" in header or "frequ" in header or "situa" in header:
+        return "presenca"
+    if "data" in header:
+        return "data"
+    if any(word in header for word in ("sess", "reuni", "descri", "evento", "comiss")):
+        return "sessao"
+    return None
+
+
+def _iso_date(value: str) -> str:
+    try:
+        return datetime.strptime(value, "%d/%m/%Y").date().isoformat()
+    except ValueError:
+        return value
+
+
+def parse_assiduidade_html(url: str, html: str) -> list[dict]:
+    """
+    Extrai os registros de presença (deputado, ano, data, sessão, presença) de uma página de assiduidade.
+    As colunas são identificadas pelo cabeçalho das tabelas, e tabelas sem data ou presença são ignoradas.
+    Roda nos processos do ParseStage, então recebe e retorna apenas dados simples.
+    """
+    match = ASSIDUIDADE_URL_PATTERN.search(url)
+    if not match:
+        raise ValueError(f"A URL '{url}' não é uma página de assiduidade de deputado")
+
+    deputado_id = int(match.group("id"))
+    ano = int(match.group("ano"))
+    records = []
+
+    for table in HTMLParser(html).css("table"):
+        headers = [th.text(strip=True) for th in table.css("th")]
+        columns = [_assiduidade_column(h) for h in headers]
+        if "data" not in columns or "presenca" not in columns:
+            continue
+
+        for row in table.css("tr"):
+            cells = [td.text(strip=True) for td in row.css("td")]
+            if len(cells) != len(columns):
+                continue
+
+            record = {
+                "deputado_id": deputado_id,
+                "ano": ano,
+                "data": None,
+                "sessao": None,
+                "presenca": None,
+                "justificativa": None,
+            }
+            for column, value in zip(columns, cells):
+                if column:
+                    record[column] = value or None
+
+            if record["data"]:
+                record["data"] = _iso_date(record["data"])
+            records.append(record)
+
+    return records
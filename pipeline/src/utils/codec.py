@@ -0,0 +1,89 @@
+import json
+from typing import IO, Any, Callable, Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - o orjson já vem como dependência do Prefect
+    orjson = None
+
+# Registros acumulados antes de cada escrita no arquivo NDJSON
+WRITE_BATCH_SIZE = 1000
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """
+        Serializa para JSON compacto em UTF-8.
+        """
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+
+    def dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+
+    def loads(data: bytes | bytearray | memoryview | str) -> Any:
+        return orjson.loads(data)
+
+else:
+
+    def dumps(obj: Any) -> bytes:
+        """
+        Serializa para JSON compacto em UTF-8.
+        """
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+    def dumps_line(obj: Any) -> bytes:
+        return dumps(obj) + b"\n"
+
+    def loads(data: bytes | bytearray | memoryview | str) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+def write_ndjson(
+    f: IO[bytes],
+    records: Iterable[Any],
+    batch_size: int = WRITE_BATCH_SIZE,
+    on_line: Callable[[int, Any], None] | None = None,
+) -> int:
+    """
+    Grava os registros em um arquivo binário, uma linha por registro.
+    As linhas são agrupadas em lotes e gravadas com um único write, em vez de um write por registro.
+    `on_line(offset, registro)`, se fornecido, recebe o offset (bytes, a partir do início da escrita) de cada linha.
+    Retorna a quantidade de registros gravados.
+    """
+    count = 0
+    offset = 0
+    batch: list[bytes] = []
+
+    for rec in records:
+        line = dumps_line(rec)
+        if on_line is not None:
+            on_line(offset, rec)
+        offset += len(line)
+        batch.append(line)
+        if len(batch) >= batch_size:
+            f.write(b"".join(batch))
+            count += len(batch)
+            batch.clear()
+
+    if batch:
+        f.write(b"".join(batch))
+        count += len(batch)
+
+    return count
+
+
+def iter_ndjson(f: IO[bytes]) -> Iterator[Any]:
+    """
+    Lê um arquivo NDJSON aberto em modo binário, decodificando uma linha por vez e ignorando linhas vazias.
+    """
+    for line in f:
+        if line.strip():
+            yield loads(line)
@@ -0,0 +1,215 @@
+import shutil
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import pandas as pd
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+from . import codec
+from .compression import dataset_name, open_ndjson, plain_path, resolve_ndjson_path
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+# Coluna com a URL (link "self") da resposta de onde veio cada linha
+SOURCE_URL_COLUMN = "_url"
+# Linhas do NDJSON convertidas por vez: a memória do save_parquet não depende do tamanho do arquivo
+PARQUET_BATCH_SIZE = 1000
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def parquet_path(ndjson_path: str | Path) -> Path:
+    """
+    Diretório do dataset Parquet correspondente a um NDJSON do ExtractOutDir (ex.: proposicoes.ndjson -> proposicoes.parquet).
+    """
+    return plain_path(ndjson_path).with_suffix(".parquet")
+
+
+def _source_url(envelope: dict) -> str | None:
+    for link in envelope.get("links") or []:
+        if isinstance(link, dict) and link.get("rel") == "self":
+            return link.get("href")
+    return None
+
+
+def flatten_records(records: Iterable[Any]) -> list[dict]:
+    """
+    Transforma as respostas da API em linhas planas.
+    - Respostas no formato {"dados": [...], "links": [...]} viram uma linha por item de `dados`, com a URL de origem em `_url`.
+    - Objetos aninhados viram colunas "pai_filho". Listas são mantidas como texto JSON, para o schema continuar tipado.
+    """
+    rows = []
+
+    for rec in records:
+        if isinstance(rec, dict) and "dados" in rec:
+            items = rec["dados"]
+            items = items if isinstance(items, list) else [items]
+            url = _source_url(rec)
+            for item in items:
+                if isinstance(item, dict):
+                    rows.append({**item, SOURCE_URL_COLUMN: url})
+        elif isinstance(rec, dict):
+            rows.append(rec)
+
+    flat = pd.json_normalize(rows, sep="_").to_dict(orient="records") if rows else []
+
+    for row in flat:
+        for column, value in row.items():
+            if isinstance(value, (list, dict)):
+                row[column] = codec.dumps(value).decode("utf-8")
+
+    return flat
+
+
+def _flat_batches(ndjson_path: str | Path) -> Iterator[pd.DataFrame]:
+    with open_ndjson(ndjson_path) as f:
+        records = codec.iter_ndjson(f)
+        while batch := list(islice(records, PARQUET_BATCH_SIZE)):
+            df = pd.DataFrame(flatten_records(batch))
+            if not df.empty:
+                yield df
+
+
+def _unify_schemas(schemas: Iterable[Any]) -> Any:
+    """
+    Schema único para todos os lotes de linhas: colunas que só aparecem em alguns lotes entram como anuláveis,
+    tipos compatíveis são promovidos (ex.: int -> double) e tipos conflitantes viram texto.
+    """
+    import pyarrow as pa
+
+    fields: dict[str, Any] = {}
+    for schema in schemas:
+        for field in schema:
+            current = fields.get(field.name)
+            if current is None or pa.types.is_null(current.type):
+                fields[field.name] = field
+            elif current.type != field.type and not pa.types.is_null(field.type):
+                try:
+                    fields[field.name] = pa.unify_schemas(
+                        [pa.schema([current]), pa.schema([field])],
+                        promote_options="permissive",
+                    ).field(0)
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    fields[field.name] = pa.field(field.name, pa.string())
+    return pa.schema(list(fields.values()))
+
+
+def _record_batches(ndjson_path: str | Path, schema: Any) -> Iterator[Any]:
+    import pyarrow as pa
+
+    for df in _flat_batches(ndjson_path):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        columns = [
+            table.column(field.name).cast(field.type)
+            if field.name in table.column_names
+            else pa.nulls(table.num_rows, field.type)
+            for field in schema
+        ]
+        yield from pa.Table.from_arrays(columns, schema=schema).to_batches()
+
+
+def save_parquet(ndjson_path: str | Path) -> str | None:
+    """
+    Grava a versão Parquet de um NDJSON do ExtractOutDir, particionada pelas colunas de LOAD.PARQUET_PARTITIONS.
+    O NDJSON é lido duas vezes, em lotes de PARQUET_BATCH_SIZE linhas: a primeira leitura monta o schema e a
+    segunda grava os lotes, sem carregar o arquivo inteiro em memória.
+    Não interrompe a extração: se o pyarrow não estiver instalado ou a conversão falhar, apenas registra o aviso.
+    """
+    if not parquet_available():
+        logger.warning(
+            "LOAD.PARQUET está ativo, mas o pyarrow não está instalado (extra `parquet` do projeto). A versão Parquet não será gravada."
+        )
+        return None
+
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    dest_path = parquet_path(ndjson_path)
+    partitions = APP_SETTINGS.LOAD.PARQUET_PARTITIONS.get(dataset_name(ndjson_path), [])
+
+    try:
+        schema = _unify_schemas(
+            pa.Schema.from_pandas(df, preserve_index=False)
+            for df in _flat_batches(ndjson_path)
+        )
+        if not schema:
+            return None
+
+        partitions = [c for c in partitions if c in schema.names]
+
+        # Sem partições o Parquet é um único arquivo, com partições é um diretório
+        if dest_path.is_dir():
+            shutil.rmtree(dest_path)
+        else:
+            dest_path.unlink(missing_ok=True)
+
+        rows = 0
+
+        def batches() -> Iterator[Any]:
+            nonlocal rows
+            for batch in _record_batches(ndjson_path, schema):
+                rows += batch.num_rows
+                yield batch
+
+        if partitions:
+            ds.write_dataset(
+                batches(),
+                dest_path,
+                schema=schema,
+                format="parquet",
+                partitioning=partitions,
+                partitioning_flavor="hive",
+            )
+        else:
+            with pq.ParquetWriter(dest_path, schema) as writer:
+                for batch in batches():
+                    writer.write_batch(batch)
+    except Exception as e:
+        logger.warning(
+            f"Não foi possível gravar a versão Parquet de {ndjson_path}: {e}"
+        )
+        return None
+
+    logger.info(
+        f"Parquet gravado em {dest_path}: {rows} linhas, {len(schema)} colunas"
+        + (f", particionado por {', '.join(partitions)}" if partitions else "")
+    )
+    return str(dest_path)
+
+
+def has_parquet(ndjson_path: str | Path) -> bool:
+    """
+    Se existe uma versão Parquet do NDJSON gravada depois dele (e o pyarrow para lê-la).
+    Um Parquet mais antigo que o NDJSON é de uma extração anterior e não é usado.
+    """
+    dest_path = parquet_path(ndjson_path)
+    ndjson_path = resolve_ndjson_path(ndjson_path)
+    if not parquet_available() or not dest_path.exists() or not ndjson_path.exists():
+        return False
+    return dest_path.stat().st_mtime_ns >= ndjson_path.stat().st_mtime_ns
+
+
+def load_parquet(
+    ndjson_path: str | Path,
+    columns: list[str] | None = None,
+    filters: list[tuple] | None = None,
+) -> pd.DataFrame:
+    """
+    Lê a versão Parquet de um NDJSON do ExtractOutDir, apenas com as colunas e partições pedidas.
+    Ex.: load_parquet(ExtractOutDir.CAMARA.PROPOSICOES, columns=["id", "siglaTipo"], filters=[("ano", "=", 2024)])
+    """
+    return pd.read_parquet(
+        parquet_path(ndjson_path), engine="pyarrow", columns=columns, filters=filters
+    )
@@ -0,0 +1,222 @@
+import io
+import os
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+ZST_SUFFIX = ".zst"
+DICT_SUFFIX = ".zdict"
+# Tamanho máximo do cabeçalho de um frame zstd, suficiente para ler o id do dicionário
+FRAME_HEADER_SIZE = 18
+READ_BUFFER_SIZE = 1024 * 1024
+
+
+def zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "O pacote zstandard é necessário para ler e gravar arquivos .ndjson.zst (extra `zstd` do projeto)"
+        ) from e
+    return zstandard
+
+
+def is_compressed(path: str | Path) -> bool:
+    return Path(path).suffix == ZST_SUFFIX
+
+
+def compressed_path(path: str | Path) -> Path:
+    path = Path(path)
+    return path if is_compressed(path) else path.with_name(path.name + ZST_SUFFIX)
+
+
+def plain_path(path: str | Path) -> Path:
+    path = Path(path)
+    return path.with_suffix("") if is_compressed(path) else path
+
+
+def dataset_name(path: str | Path) -> str:
+    """
+    Nome do dataset de um NDJSON do ExtractOutDir (ex.: deputados_despesas.ndjson.zst -> deputados_despesas).
+    """
+    return plain_path(path).name.removesuffix(".ndjson")
+
+
+def resolve_ndjson_path(path: str | Path) -> Path:
+    """
+    Caminho real de um NDJSON do ExtractOutDir: o próprio arquivo ou, se ele não existir, a versão .zst.
+    """
+    path = Path(path)
+    if path.exists() or is_compressed(path):
+        return path
+    zst = compressed_path(path)
+    return zst if zst.exists() else path
+
+
+def output_ndjson_path(path: str | Path) -> Path:
+    """
+    Caminho em que um NDJSON do ExtractOutDir deve ser gravado: com LOAD.ZSTD ativo, a versão .zst.
+    """
+    if not APP_SETTINGS.LOAD.ZSTD:
+        return plain_path(path)
+    if not zstd_available():
+        logger.warning(
+            "LOAD.ZSTD está ativo, mas o zstandard não está instalado. O NDJSON será gravado sem compressão."
+        )
+        return plain_path(path)
+    return compressed_path(path)
+
+
+def remove_other_variant(path: str | Path):
+    """
+    Depois de gravar um NDJSON, remove a versão do outro formato (comprimida ou não), que ficou desatualizada.
+    """
+    path = Path(path)
+    other = plain_path(path) if is_compressed(path) else compressed_path(path)
+    other.unlink(missing_ok=True)
+
+
+# ============= DICIONÁRIOS =============
+
+
+def _dict_dir() -> Path:
+    return Path(APP_SETTINGS.LOAD.ZSTD_DICT_DIR)
+
+
+@lru_cache(maxsize=64)
+def _read_dictionary(path: str):
+    with open(path, "rb") as f:
+        return _zstd().ZstdCompressionDict(f.read())
+
+
+def latest_dictionary(dataset: str):
+    """
+    Dicionário mais recente treinado para o dataset, ou None se ele ainda não tiver um.
+    """
+    candidates = sorted(
+        _dict_dir().glob(f"{dataset}.*{DICT_SUFFIX}"), key=lambda p: p.stat().st_mtime
+    )
+    return _read_dictionary(str(candidates[-1])) if candidates else None
+
+
+def dictionary_by_id(dict_id: int):
+    """
+    Dicionário usado para comprimir um frame. Os dicionários antigos são mantidos, já que cada arquivo
+    continua precisando do dicionário com que foi gravado.
+    """
+    matches = list(_dict_dir().glob(f"*.{dict_id}{DICT_SUFFIX}"))
+    if not matches:
+        raise FileNotFoundError(
+            f"Dicionário zstd {dict_id} não encontrado em {_dict_dir()}"
+        )
+    return _read_dictionary(str(matches[0]))
+
+
+def frame_dict_id(path: str | Path) -> int:
+    """
+    Id do dicionário do primeiro frame do arquivo (0 se ele foi comprimido sem dicionário).
+    """
+    with open(path, "rb") as f:
+        header = f.read(FRAME_HEADER_SIZE)
+    if not header:
+        return 0
+    return _zstd().get_frame_parameters(header).dict_id
+
+
+def train_dictionary(
+    dataset: str, samples_paths: Iterable[str | Path], max_samples: int = 100_000
+) -> Path | None:
+    """
+    Treina um dicionário para o dataset a partir das linhas de NDJSONs já extraídos (ex.: arquivos de lotes
+    anteriores) e o grava em <LOAD.ZSTD_DICT_DIR>/<dataset>.<dict_id>.zdict.
+    Linhas pequenas e repetitivas (despesas, votos, eventos) são as que mais ganham com o dicionário.
+    """
+    zstd = _zstd()
+    samples: list[bytes] = []
+    for path in samples_paths:
+        with open_ndjson(path) as f:
+            for line in f:
+                if line.strip():
+                    samples.append(line)
+                if len(samples) >= max_samples:
+                    break
+        if len(samples) >= max_samples:
+            break
+
+    if not samples:
+        logger.warning(f"Sem amostras para treinar o dicionário de {dataset}")
+        return None
+
+    dictionary = zstd.train_dictionary(APP_SETTINGS.LOAD.ZSTD_DICT_SIZE, samples)
+
+    dest_path = _dict_dir() / f"{dataset}.{dictionary.dict_id()}{DICT_SUFFIX}"
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest_path.with_name(dest_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(dictionary.as_bytes())
+    os.replace(tmp_path, dest_path)
+
+    logger.info(
+        f"Dicionário zstd de {dataset} treinado com {len(samples)} linhas: {dest_path}"
+    )
+    return dest_path
+
+
+# ============= LEITURA E ESCRITA =============
+
+
+@contextmanager
+def open_ndjson(path: str | Path) -> Iterator[IO[bytes]]:
+    """
+    Abre um NDJSON para leitura em modo binário, descomprimindo em streaming se for .zst.
+    Arquivos .zst com vários frames (ex.: resultado do merge_ndjson) são lidos como um único arquivo.
+    """
+    path = resolve_ndjson_path(path)
+    if not is_compressed(path):
+        with open(path, "rb") as f:
+            yield f
+        return
+
+    dict_id = frame_dict_id(path)
+    dctx = _zstd().ZstdDecompressor(
+        dict_data=dictionary_by_id(dict_id) if dict_id else None
+    )
+    with open(path, "rb") as raw:
+        with dctx.stream_reader(raw, read_across_frames=True, closefd=False) as reader:
+            yield io.BufferedReader(reader, READ_BUFFER_SIZE)  # type: ignore
+
+
+@contextmanager
+def open_ndjson_writer(f: IO[bytes], path: str | Path) -> Iterator[IO[bytes]]:
+    """
+    Envolve o arquivo aberto para escrita em um compressor zstd se `path` for .zst, usando o dicionário
+    mais recente do dataset. O frame é finalizado ao sair do bloco.
+    """
+    if not is_compressed(path):
+        yield f
+        return
+
+    zstd = _zstd()
+    cctx = zstd.ZstdCompressor(
+        level=APP_SETTINGS.LOAD.ZSTD_LEVEL,
+        dict_data=latest_dictionary(dataset_name(path)),
+    )
+    with cctx.stream_writer(f, closefd=False) as writer:
+        yield writer  # type: ignore
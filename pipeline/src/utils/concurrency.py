@@ -0,0 +1,204 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+import httpx
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+# Respostas que indicam que o servidor está sobrecarregado e pedem redução imediata da concorrência
+THROTTLE_STATUS_CODES = {429, 503}
+
+
+def host_max_limit(host: str, default: int) -> int:
+    """
+    Retorna o teto de concorrência configurado para o host (FETCH_LIMIT_MAX em appsettings.toml).
+    Hosts sem configuração própria ficam limitados ao valor inicial.
+    """
+    hosts_max = {
+        urlparse(
+            APP_SETTINGS.CAMARA.REST_BASE_URL
+        ).netloc: APP_SETTINGS.CAMARA.FETCH_LIMIT_MAX,
+        urlparse(
+            APP_SETTINGS.CAMARA.PORTAL_BASE_URL
+        ).netloc: APP_SETTINGS.CAMARA.FETCH_LIMIT_MAX,
+        urlparse(
+            APP_SETTINGS.SENADO.REST_BASE_URL
+        ).netloc: APP_SETTINGS.SENADO.FETCH_LIMIT_MAX,
+    }
+    return max(hosts_max.get(host, default), default)
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """
+    429, 503 e timeouts são tratados como sinal de sobrecarga do servidor.
+    """
+    if isinstance(error, httpx.TimeoutException):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in THROTTLE_STATUS_CODES
+    return False
+
+
+class AdaptiveLimiter:
+    """
+    Controle de concorrência AIMD (aumento aditivo, redução multiplicativa) para um host.
+    - A cada `sample_size` respostas, se a latência p95 e a taxa de erros estão saudáveis, a janela cresce em 1.
+    - Em 429/503/timeout, a janela cai pela metade (no máximo uma vez por período de `cooldown` segundos).
+    """
+
+    def __init__(
+        self,
+        host: str,
+        task: str,
+        initial: int,
+        max_window: int,
+        min_window: int = 1,
+        latency_target: float = APP_SETTINGS.ALLENDPOINTS.FETCH_P95_LATENCY_TARGET,
+        max_error_rate: float = APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_ERROR_RATE,
+        sample_size: int = 20,
+        cooldown: float = 5.0,
+    ):
+        self.host = host
+        self.task = task
+        self.min_window = min_window
+        self.max_window = max(max_window, initial)
+        self.window = max(min(initial, self.max_window), min_window)
+        self.latency_target = latency_target
+        self.max_error_rate = max_error_rate
+        self.sample_size = sample_size
+        self.cooldown = cooldown
+
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+        self._latencies: deque[float] = deque(maxlen=sample_size)
+        self._errors = 0
+        self._samples = 0
+        self._last_decrease = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Ocupa uma vaga da janela atual enquanto o bloco estiver em execução.
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.window)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    async def record_success(self, latency: float):
+        self._latencies.append(latency)
+        self._samples += 1
+        await self._maybe_increase()
+
+    async def record_failure(self, error: BaseException):
+        self._samples += 1
+        self._errors += 1
+
+        if is_throttle_error(error):
+            reason = (
+                f"HTTP {error.response.status_code}"
+                if isinstance(error, httpx.HTTPStatusError)
+                else "timeout"
+            )
+            await self._decrease(reason=reason)
+        else:
+            await self._maybe_increase()
+
+    def p95(self) -> float:
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    async def _maybe_increase(self):
+        if self._samples < self.sample_size:
+            return
+
+        p95 = self.p95()
+        error_rate = self._errors / self._samples
+        self._samples = 0
+        self._errors = 0
+
+        if error_rate > self.max_error_rate:
+            await self._decrease(reason=f"taxa de erros {error_rate:.0%}")
+            return
+
+        if p95 > self.latency_target:
+            logger.info(
+                f"AIMD {self.task} [{self.host}]: janela mantida em {self.window} (p95 {p95:.2f}s acima do alvo de {self.latency_target:.2f}s)"
+            )
+            return
+
+        if self.window < self.max_window:
+            async with self._condition:
+                self.window += 1
+                self._condition.notify_all()
+            logger.info(
+                f"AIMD {self.task} [{self.host}]: janela aumentada para {self.window} (p95 {p95:.2f}s, erros {error_rate:.0%})"
+            )
+
+    async def _decrease(self, reason: str):
+        now = time.monotonic()
+        # Uma rajada de 429 conta como um único sinal de sobrecarga
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+
+        previous = self.window
+        async with self._condition:
+            self.window = max(self.min_window, previous // 2)
+        self._samples = 0
+        self._errors = 0
+        logger.warning(
+            f"AIMD {self.task} [{self.host}]: janela reduzida de {previous} para {self.window} ({reason})"
+        )
+
+
+class HostLimiters:
+    """
+    Um AdaptiveLimiter por host, criado sob demanda durante o download de uma task.
+    """
+
+    def __init__(self, task: str, initial: int):
+        self.task = task
+        self.initial = initial
+        self._limiters: dict[str, AdaptiveLimiter] = {}
+
+    def for_url(self, url: str) -> AdaptiveLimiter:
+        host = urlparse(url).netloc
+        if host not in self._limiters:
+            self._limiters[host] = AdaptiveLimiter(
+                host=host,
+                task=self.task,
+                initial=self.initial,
+                max_window=host_max_limit(host, self.initial),
+            )
+        return self._limiters[host]
+
+    def max_workers(self, urls: list[str]) -> int:
+        """
+        Número de workers necessários para que a janela de qualquer host possa crescer até o teto.
+        """
+        hosts = {urlparse(url).netloc for url in urls}
+        return max(
+            [host_max_limit(host, self.initial) for host in hosts] or [self.initial]
+        )
+
+    def log_summary(self):
+        for limiter in self._limiters.values():
+            logger.info(
+                f"AIMD {self.task} [{limiter.host}]: janela final {limiter.window} (mín. {limiter.min_window}, máx. {limiter.max_window})"
+            )
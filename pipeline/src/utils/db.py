@@ -1,31 +1,87 @@
-from typing import Any
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Sequence
 
 import sqlalchemy as sa
-from sqlalchemy.dialects.postgresql import Insert
-from sqlalchemy.sql.elements import ColumnElement
 
+from database.repository.logs import insert_log_linhas_db, log_linhas_statement
 
-def columns_to_compare(table: sa.Table, external_id: str) -> list[sa.Column[Any]]:
+from . import codec
+
+# Colunas de controle, que não fazem parte do conteúdo da linha
+CONTROL_COLUMNS = ("id", "id_lote", "hash_linha")
+
+
+def row_hash(values: Sequence[Any]) -> str:
+    """
+    Hash (128 bits, hex) dos valores das colunas de negócio de uma linha, gravado em hash_linha.
+    """
+    return hashlib.blake2b(codec.dumps(list(values)), digest_size=16).hexdigest()
+
+
+def _key_text(value: Any) -> str:
+    # Mesmo texto da função de saída do tipo no Postgres (boolean -> t/f)
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value)
+
+
+def key_hash(values: Sequence[Any]) -> str:
     """
-    Retorna os nomes de todas as colunas para comparação.
-    Serve para, no conflito, durante inserção de dados, atualizar todos os campos.
-    Não deve incluir no retorno o id externo da tabela, por exemplo id_deputado.
+    Hash da chave natural de uma linha, usado na tabela lote_proveniencia.
+    Equivale, no banco, a md5(concat_ws('|', coluna_1, coluna_2, ...)) para chaves de inteiros, texto, datas e
+    booleanos: como no concat_ws, valores nulos são omitidos. Timestamps e números de ponto flutuante não têm o
+    mesmo texto nos dois lados e não devem ser usados em chaves naturais.
     """
-    return [c for c in table.c if c.name != external_id]
+    text = "|".join(_key_text(v) for v in values if v is not None)
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class RowCounts:
+    """
+    Soma os números de linhas inseridas/atualizadas/ignoradas que vão para a tabela log_linhas.
+    """
+
+    id_lote: int | None = None
+    inserted: int = 0
+    updated: int = 0
+    ignored: int = 0
+    unchanged: int = 0
+    total: int = 0
 
+    def add(self, id_lote: int | None, total: int, inserted: int, updated: int):
+        self.id_lote = id_lote
+        self.total += total
+        self.inserted += inserted
+        self.updated += updated
+        self.ignored += total - inserted - updated
 
-def update_dict(
-    stmt: Insert, columns_to_compare: list[sa.Column[Any]]
-) -> dict[str, Any]:
-    return {c.name: getattr(stmt.excluded, c.name) for c in columns_to_compare}
+    def log(self, table: str, conn: sa.Connection | None = None):
+        if self.id_lote is None:
+            return
 
+        insert_log_linhas_db(
+            id_lote=self.id_lote,
+            table=table,
+            inserted=self.inserted,
+            updated=self.updated,
+            ignored=self.ignored,
+            unchanged=self.unchanged,
+            total=self.total,
+            conn=conn,
+        )
 
-def where_clause(
-    table: sa.Table, stmt: Insert, columns_to_compare: list[sa.Column[Any]]
-) -> ColumnElement[bool]:
-    return sa.or_(
-        *[
-            getattr(table.c, c.name).is_distinct_from(getattr(stmt.excluded, c.name))
-            for c in columns_to_compare
-        ]
-    )
+    def log_statement(self, table: str) -> sa.Insert:
+        """
+        INSERT do log na tabela log_linhas, para ser enviado junto com os comandos do load (pipeline).
+        """
+        return log_linhas_statement(
+            id_lote=self.id_lote,  # type: ignore
+            table=table,
+            inserted=self.inserted,
+            updated=self.updated,
+            ignored=self.ignored,
+            unchanged=self.unchanged,
+            total=self.total,
+        )
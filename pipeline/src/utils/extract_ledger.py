@@ -0,0 +1,98 @@
+import asyncio
+
+from prefect.logging import get_logger
+
+from database.models.base import ErrorExtract
+from database.repository.erros_extract import (
+    insert_extract_errors_bulk_db,
+    update_not_downloaded_urls_bulk_db,
+)
+
+logger = get_logger()
+
+# Quantidade de registros acumulados que dispara uma gravação em segundo plano
+FLUSH_SIZE = 500
+
+
+class ExtractLedger:
+    """
+    Registro em memória das URLs baixadas e das que falharam durante o download de uma task.
+    - As URLs de lotes anteriores (not_downloaded_urls) são indexadas uma única vez, e não a cada resposta.
+    - As gravações no banco são feitas em lote (um INSERT/UPDATE multi-linhas) em uma thread separada,
+      para que a latência do banco não fique no caminho do download.
+    """
+
+    def __init__(
+        self,
+        id_lote: int,
+        task: str,
+        not_downloaded_urls: list[ErrorExtract],
+        flush_size: int = FLUSH_SIZE,
+    ):
+        self.id_lote = id_lote
+        self.task = task
+        self.flush_size = flush_size
+        self.db_errors = 0  # Registros que não puderam ser gravados no banco
+
+        self._failed_urls = {error.url: error for error in not_downloaded_urls}
+        self._recovered: list[int] = []
+        self._errors: list[dict] = []
+        self._flushes: set[asyncio.Task] = set()
+
+    def record_success(self, url: str):
+        """
+        Se a URL havia falhado em um lote anterior, marca o registro de erro para ser atualizado como baixado.
+        """
+        error = self._failed_urls.pop(url, None)
+        if error is not None:
+            self._recovered.append(error.id)
+            self._maybe_flush()
+
+    def record_failure(self, url: str, status_code: int | None, message: str):
+        self._errors.append(
+            {
+                "task": self.task,
+                "status_code": status_code,
+                "mensagem": message,
+                "url": url,
+            }
+        )
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self._recovered) + len(self._errors) >= self.flush_size:
+            flush = asyncio.create_task(self.flush())
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def flush(self):
+        errors, self._errors = self._errors, []
+        recovered, self._recovered = self._recovered, []
+
+        if not errors and not recovered:
+            return
+
+        try:
+            await asyncio.to_thread(self._write, errors, recovered)
+        except Exception as e:
+            logger.critical(
+                f"Erro ao gravar no banco de dados o registro de URLs da task {self.task}: {e}"
+            )
+            self.db_errors += len(errors) + len(recovered)
+
+    def _write(self, errors: list[dict], recovered: list[int]):
+        insert_extract_errors_bulk_db(id_lote=self.id_lote, errors=errors)
+        update_not_downloaded_urls_bulk_db(error_ids=recovered, id_lote=self.id_lote)
+
+        if errors or recovered:
+            logger.info(
+                f"Task {self.task}: {len(errors)} URLs com falha registradas e {len(recovered)} URLs recuperadas de lotes anteriores"
+            )
+
+    async def close(self):
+        """
+        Aguarda as gravações em andamento e grava o que restou. Deve ser chamado ao final do download.
+        """
+        if self._flushes:
+            await asyncio.gather(*self._flushes)
+        await self.flush()
@@ -1,18 +1,30 @@
 import asyncio
+import hashlib
+import time
 from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable
 
 import httpx
 from prefect.logging import get_logger
 
 from config.request_headers import headers
 from database.models.base import ErrorExtract
-from database.repository.erros_extract import (
-    insert_extract_error_db,
-    update_not_downloaded_urls_db,
-)
 
-from .io import ensure_dir
-from .url_utils import alter_query_param_value, get_query_param_value, is_first_page
+from . import codec, rate_limit
+from .concurrency import HostLimiters
+from .extract_ledger import ExtractLedger
+from .http_cache import get_http_cache
+from .http_clients import get_async_client
+from .io import ensure_dir, save_bytes, save_manifest
+from .pagination import (
+    get_page_count_store,
+    last_page_from_total,
+    page_key,
+    page_number,
+    page_urls,
+)
+from .retry import RetryScheduler, retry_delay
+from .url_utils import alter_query_param_value, is_first_page
 
 logger = get_logger()
 
@@ -31,222 +43,385 @@ async def fetch_many_jsons(
     validate_results: bool = False,
 ) -> list[str] | list[dict]:
     """
-    - Se out_dir for fornecido, salva cada JSON em um arquivo e retorna a lista de caminhos
+    - Se out_dir for fornecido, salva cada JSON em um arquivo e retorna a lista de caminhos.
+      O diretório recebe também um manifest.json (URL -> caminho, status e tamanho), para leitura seletiva com load_manifest.
     - Caso contrário, retorna a lista de dicionários em memória
     """
+    results = []
+
+    async def collect(data: dict):
+        results.append(data)
+
+    await _fetch_many(
+        urls=urls,
+        not_downloaded_urls=not_downloaded_urls,
+        task=task,
+        id_lote=id_lote,
+        on_result=collect,
+        out_dir=out_dir,
+        limit=limit,
+        timeout=timeout,
+        max_retries=max_retries,
+        follow_pagination=follow_pagination,
+        validate_results=validate_results,
+    )
 
-    db_errors = []
+    return results
+
+
+async def iter_many_jsons(
+    urls: list[str],
+    not_downloaded_urls: list[ErrorExtract],
+    task: str,
+    id_lote: int,
+    limit: int = 10,
+    timeout: float = 30.0,
+    max_retries: int = 10,
+    follow_pagination: bool = False,
+    validate_results: bool = False,
+    buffer_size: int | None = None,
+) -> AsyncIterator[dict]:
+    """
+    Versão em streaming do fetch_many_jsons: entrega cada página assim que é baixada.
+    As páginas passam por uma fila limitada (buffer_size, padrão 2x limit). Quando o consumidor atrasa, os workers ficam
+    bloqueados na fila, então a memória depende da concorrência e não do tamanho do conjunto de dados.
+    """
+    buffer: asyncio.Queue = asyncio.Queue(maxsize=buffer_size or limit * 2)
+    finished = object()
+
+    async def produce():
+        cancelled = False
+        try:
+            await _fetch_many(
+                urls=urls,
+                not_downloaded_urls=not_downloaded_urls,
+                task=task,
+                id_lote=id_lote,
+                on_result=buffer.put,
+                limit=limit,
+                timeout=timeout,
+                max_retries=max_retries,
+                follow_pagination=follow_pagination,
+                validate_results=validate_results,
+            )
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            # Cancelado quando o consumidor para antes do fim: ninguém mais lê a fila, e esperar por espaço nela
+            # deixaria a task pendurada para sempre
+            if not cancelled:
+                await buffer.put(finished)
+
+    producer = asyncio.create_task(produce())
+
+    try:
+        while True:
+            item = await buffer.get()
+            if item is finished:
+                break
+            yield item
+
+        # Propaga os erros da validação e da gravação dos erros no banco de dados
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+
+
+async def _fetch_many(
+    urls: list[str],
+    not_downloaded_urls: list[ErrorExtract],
+    task: str,
+    id_lote: int,
+    on_result: Callable[[Any], Awaitable[None]],
+    out_dir: str | Path | None = None,
+    limit: int = 10,
+    timeout: float = 30.0,
+    max_retries: int = 10,
+    follow_pagination: bool = False,
+    validate_results: bool = False,
+):
+    """
+    Núcleo do download concorrente. Cada JSON baixado (ou caminho, no modo out_dir) é entregue ao callback on_result.
+    """
+    ledger = ExtractLedger(
+        id_lote=id_lote, task=task, not_downloaded_urls=not_downloaded_urls
+    )
     out_dir = ensure_dir(out_dir) if out_dir else None
+    manifest: dict[str, dict] = {}
+    cache = get_http_cache()
+    page_counts = get_page_count_store()
+    # Páginas pedidas com base no número de páginas do último lote, antes da primeira página confirmar
+    speculative_pages: set[str] = set()
+    # Última página real de cada consulta, confirmada pelo links.last da primeira página
+    last_pages: dict[str, int] = {}
 
     async def worker(
         queue: asyncio.Queue,
-        results: list[dict],
+        retries: RetryScheduler,
         processed_urls: set,
-        semaphore: asyncio.Semaphore,
-        client: httpx.AsyncClient,
+        limiters: HostLimiters,
         stats: dict,
         task: str,
-        id_lote: int,
     ):
         while True:  # Mantém o consumidor da fila vivo para processar outras urls
-            url = await queue.get()
+            url, attempt = await queue.get()
 
-            if url in processed_urls:
-                queue.task_done()
-                continue
-
-            # Adiciona logo em processed_urls para evitar que o queue pegue essa url
-            processed_urls.add(url)
+            if attempt == 0:
+                if url in processed_urls:
+                    queue.task_done()
+                    continue
 
-            async with semaphore:
+                # Adiciona logo em processed_urls para evitar que o queue pegue essa url
+                processed_urls.add(url)
                 print(f"Baixando URL: {url=}")
 
-                # status_code = None
-                # request_message = None
+            limiter = limiters.for_url(url)
+            client = get_async_client(url)
+
+            try:
+                # A vaga de concorrência é ocupada só durante a tentativa, nunca durante a espera do backoff
+                async with limiter.slot():
+                    cached = await asyncio.to_thread(cache.get, url)
+
+                    await rate_limit.acquire(url)
+                    started = time.monotonic()
+                    response = await client.get(
+                        url,
+                        timeout=timeout,
+                        headers={**headers, **cache.conditional_headers(cached)},
+                    )
+                    latency = time.monotonic() - started
+
+                    status_code = response.status_code
+
+                    if status_code == 304 and cached is not None:
+                        # O recurso não mudou desde o último lote, reaproveita o corpo em disco
+                        body = cached.body
+                        response_headers = cached.headers
+                        cache.record_hit(task)
+                        await asyncio.to_thread(cache.touch, url)
+                    else:
+                        response.raise_for_status()
+                        body = response.content
+                        response_headers = response.headers
+                        cache.record_miss(task)
+                        await asyncio.to_thread(
+                            cache.store, url, body, response.headers
+                        )
+
+                    await limiter.record_success(latency)
+
+                data = codec.loads(body)
+
+                if is_first_page(url):
+                    total_items = response_headers.get("x-total-count", None)
+
+                    if total_items:
+                        stats["total_items"] += int(total_items)
+
+                # Página especulativa além da última página real: a consulta encolheu desde o último lote
+                beyond_last = url in speculative_pages and not data.get("dados")
+
+                if not beyond_last:
+                    if out_dir:
+                        # Armazenamento endereçado pelo SHA-1 da URL, o mesmo padrão do fetch_html_many_async
+                        name = hashlib.sha1(url.encode()).hexdigest() + ".json"
+                        path = Path(out_dir) / name
+
+                        # to_thread é usado para evitar que a escrita no disco congele o processo na rede
+                        await asyncio.to_thread(save_bytes, body, path)
+                        manifest[url] = {
+                            "path": str(path),
+                            "status": status_code,
+                            "bytes": len(body),
+                        }
+                        await on_result(str(path))
+                    else:
+                        await on_result(data)
+
+                stats["downloaded_items"] += (
+                    len(data.get("dados", [])) if follow_pagination else 1
+                )
 
-                for attempt in range(max_retries):
-                    try:
-                        response = await client.get(url, timeout=timeout)
+                # URLs que haviam falhado em lotes anteriores são marcadas como baixadas em lote
+                ledger.record_success(url)
 
-                        status_code = response.status_code
+                # Se tiver paginação, adiciona novas URLs à fila
+                if follow_pagination and "links" in data:
+                    links = {link["rel"]: link["href"] for link in data["links"]}
+                    if "self" in links and "last" in links and is_first_page(url):
+                        last_pages[page_key(url)] = page_number(links["last"])
 
-                        response.raise_for_status()
+                    # As páginas são geradas a partir da URL pedida, e não do links.self, para que sejam
+                    # idênticas às páginas antecipadas (especulativas ou do probe) e não sejam baixadas duas vezes
+                    if "self" in links and "last" in links:
+                        for new_url in generate_pages_urls(url, links["last"]):
+                            if new_url not in processed_urls:
+                                await queue.put((new_url, 0))
 
-                        data = response.json()
-
-                        if is_first_page(url):
-                            total_items = response.headers.get("x-total-count", None)
-
-                            if total_items:
-                                stats["total_items"] += int(total_items)
-
-                        if out_dir:
-                            raise Exception("O BLOCO out_dir ESTÁ COMENTADO")
-                            # name = hashlib.sha1(url.encode()).hexdigest() + ".json"
-                            # path = Path(out_dir) / name
-
-                            # # to_thread é usado para evitar que a escrita no disco congele o processo na rede
-                            # await asyncio.to_thread(save_json, path, data)
-                            # results.append(str(path))
-                        else:
-                            results.append(data)
-
-                            # Verificar e atualizar no banco de dados as urls com falhas
-                            failed_urls = {
-                                error.url: error for error in not_downloaded_urls
-                            }
-                            if failed_urls:
-                                try:
-                                    update_url_not_downloaded(
-                                        id_lote=id_lote,
-                                        url=url,
-                                        failed_urls=failed_urls,
-                                    )
-                                except Exception as e:
-                                    logger.critical(
-                                        f"Não foi possível atualizar o registro de URL baixada no banco de dados: {e}"
-                                    )
-                                    db_errors.append(url)
-
-                        # Se tiver paginação, adiciona novas URLs à fila
-                        if follow_pagination and "links" in data:
-                            links = {
-                                link["rel"]: link["href"] for link in data["links"]
-                            }
-                            if "self" in links and "last" in links:
-                                for new_url in generate_pages_urls(
-                                    links["self"], links["last"]
-                                ):
-                                    if new_url not in processed_urls:
-                                        await queue.put(new_url)
-
-                        queue.task_done()
-                        break
-                    except Exception as e:
-                        if attempt < max_retries - 1:
-                            logger.warning(
-                                f"Um erro ocorreu no fetch de dados: {e}. TENTANDO NOVAMENTE. Tentativa: {attempt}"
-                            )
-                            await asyncio.sleep(2**attempt)
-                        else:
-                            queue.task_done()
-                            message = f"Falha permanente ao baixar {url} após {max_retries} tentativas: {e}"
-                            logger.error(message)
-
-                            try:
-                                status_code = (
-                                    e.response.status_code
-                                    if isinstance(e, httpx.HTTPStatusError)
-                                    else None
-                                )
-
-                                insert_extract_error_db(
-                                    id_lote=id_lote,
-                                    task=task,
-                                    status_code=status_code,
-                                    message=str(e),
-                                    url=url,
-                                )
-                            except Exception as e:
-                                # Não damos raise aqui pois daremos um tratamento próprio para as URLs que não foram baixadas
-                                logger.critical(
-                                    f"Erro ao tentar inserir o erro da URL {url} no banco de dados: {e}"
-                                )
-                                db_errors.append(url)
+                queue.task_done()
+            except Exception as e:
+                if isinstance(e, httpx.HTTPError):
+                    await limiter.record_failure(e)
+
+                last_page = last_pages.get(page_key(url))
+                if (
+                    url in speculative_pages
+                    and last_page is not None
+                    and page_number(url) > last_page
+                ):
+                    # Página especulativa que não existe mais, não é um erro de download
+                    queue.task_done()
+                    continue
+
+                if attempt < max_retries - 1:
+                    delay = retry_delay(e, attempt)
+                    logger.warning(
+                        f"Um erro ocorreu no fetch de dados: {e}. TENTANDO NOVAMENTE em {delay:.1f}s. Tentativa: {attempt}"
+                    )
+                    # O task_done deste item é feito pelo agendador, quando a retentativa voltar para a fila
+                    retries.schedule((url, attempt + 1), delay)
+                else:
+                    queue.task_done()
+                    message = f"Falha permanente ao baixar {url} após {max_retries} tentativas: {e}"
+                    logger.error(message)
+
+                    # Não damos raise aqui pois daremos um tratamento próprio para as URLs que não foram baixadas
+                    ledger.record_failure(
+                        url=url,
+                        status_code=(
+                            e.response.status_code
+                            if isinstance(e, httpx.HTTPStatusError)
+                            else None
+                        ),
+                        message=str(e),
+                    )
+
+    async def probe_pages(url: str):
+        """
+        Requisição barata (itens=1) só para ler o x-total-count e enfileirar todas as páginas sem esperar a primeira.
+        """
+        limiter = limiters.for_url(url)
+        try:
+            async with limiter.slot():
+                await rate_limit.acquire(url)
+                response = await get_async_client(url).get(
+                    alter_query_param_value(url, "itens", 1),
+                    timeout=timeout,
+                    headers=headers,
+                )
+                response.raise_for_status()
+        except Exception as e:
+            logger.warning(f"Não foi possível estimar as páginas de {url}: {e}")
+            return
 
-    queue = asyncio.Queue()
+        total_items = response.headers.get("x-total-count")
+        last_page = last_page_from_total(url, int(total_items)) if total_items else None
+        if last_page is None:
+            return
 
-    for u in urls:
-        await queue.put(u)
+        for page_url in page_urls(url, last_page):
+            if page_url not in processed_urls:
+                queue.put_nowait((page_url, 0))
 
+    queue = asyncio.Queue()
     processed_urls = set()
-    results = []
-    stats = {"total_items": 0}
-
-    semaphore = asyncio.Semaphore(limit)
-
-    async with httpx.AsyncClient(headers=headers) as client:
-        workers = [
-            asyncio.create_task(
-                worker(
-                    queue,
-                    results,
-                    processed_urls,
-                    semaphore,
-                    client,
-                    stats,
-                    task,
-                    id_lote,
-                )
+
+    # A concorrência começa em `limit` e é ajustada por host pelo controle AIMD
+    limiters = HostLimiters(task=task, initial=limit)
+    probes = []
+
+    for u in urls:
+        await queue.put((u, 0))  # (URL, tentativa)
+
+        if not (follow_pagination and is_first_page(u)):
+            continue
+
+        stored_last_page = page_counts.get(page_key(u))
+        if stored_last_page:
+            # As páginas do último lote são pedidas junto com a primeira e reconciliadas com o links.last dela
+            for page_url in page_urls(u, stored_last_page):
+                speculative_pages.add(page_url)
+                await queue.put((page_url, 0))
+        elif len(urls) <= limit:
+            # Com poucas URLs, a espera pela primeira página deixaria a concorrência ociosa
+            probes.append(asyncio.create_task(probe_pages(u)))
+
+    retries = RetryScheduler(queue)
+    retries.start()
+
+    stats = {"total_items": 0, "downloaded_items": 0}
+
+    workers = [
+        asyncio.create_task(
+            worker(
+                queue,
+                retries,
+                processed_urls,
+                limiters,
+                stats,
+                task,
             )
-            for _ in range(
-                int(limit)
-            )  # Cria um pouco mais de workers do que conexões abertas simultâneas
-        ]
+        )
+        # Workers suficientes para a janela de concorrência crescer até o teto do host
+        for _ in range(limiters.max_workers(urls))
+    ]
 
-        await queue.join()
+    await queue.join()
 
     for w in workers:
         w.cancel()
+    for p in probes:
+        p.cancel()
+    retries.stop()
+
+    await asyncio.to_thread(page_counts.update, last_pages)
+
+    await ledger.close()
+
+    cache.log_stats(task)
+    limiters.log_summary()
+
+    if out_dir:
+        await asyncio.to_thread(save_manifest, manifest, out_dir)
 
     if validate_results:
         validate(
-            results=results,
             urls=urls,
             stats=stats,
             paginated=follow_pagination,
         )
 
-    if db_errors:
+    if ledger.db_errors:
         # Se der erro na hora de criar o registro, damos Raise para avisar
         raise Exception(
-            f"Houve erro na inserção de {len(db_errors)} erros de URLs no banco de dados"
+            f"Houve erro na inserção de {ledger.db_errors} erros de URLs no banco de dados"
         )
 
-    return results
-
 
 def generate_pages_urls(url_self: str, url_last: str):
     """
     Caso a url baixada tenha mais páginas, retorna uma lista com as páginas adicionais a serem baixadas
     """
-    # Pega o número da primeira página
-    self_page = int(get_query_param_value(url_self, "pagina", "1"))
-
     # Se não for a primeira página, retorna pois todas as URLs já foram geradas
-    if self_page > 1:
+    if page_number(url_self) > 1:
         return []
 
-    # Pega o número da última página
-    last_page = int(
-        get_query_param_value(url=url_last, param_name="pagina", default_value="1")
-    )
-
-    # Gera as urls das páginas seguintes
-    urls = []
-    for page in range(2, (last_page + 1)):
-        new_url = alter_query_param_value(
-            base_url=url_self, param_name="pagina", new_value=page
-        )
-        urls.append(new_url)
-
-    return urls
+    # Gera as urls das páginas seguintes até a última página
+    return page_urls(url_self, page_number(url_last))
 
 
 def validate(
-    results: list[dict],
     urls: list[str],
     stats: dict[str, int],
     paginated: bool,
 ):
-    downloaded_items = 0
+    # Os itens baixados são contados pelos workers, assim a validação também funciona no modo streaming
+    downloaded_items = stats["downloaded_items"]
 
-    if paginated:
-        for page in results:
-            page_items = len(page.get("dados", []))
-            downloaded_items += page_items
-    else:
-        downloaded_items = len(results)
+    if not paginated:
         stats["total_items"] = len(urls)
 
     if stats["total_items"]:
@@ -265,15 +440,3 @@ def validate(
         raise Exception(
             f"ERRO: O NÚMERO DE ITENS BAIXADOS É DIFERENTE DO NÚMERO TOTAL:\n Baixados: {downloaded_items}/{stats['total_items']}"
         )
-
-
-def update_url_not_downloaded(
-    id_lote: int, url: str, failed_urls: dict[str, ErrorExtract]
-):
-    """
-    Atualiza no banco de dados o registro da URL que não havia sido baixada
-    """
-
-    if url in failed_urls:
-        error = failed_urls[url]
-        update_not_downloaded_urls_db(id_lote=id_lote, error_id=error.id)
@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+# Headers da resposta que precisam sobreviver a um 304 (ex.: x-total-count é usado na validação)
+HEADERS_TO_KEEP = ("etag", "last-modified", "content-type", "x-total-count")
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    body: bytes
+    headers: dict[str, str]
+    encoding: str | None = None
+
+    @property
+    def etag(self) -> str | None:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> str | None:
+        return self.headers.get("last-modified")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0  # Servidor respondeu 304 e o corpo veio do disco
+    misses: int = 0  # Corpo baixado por completo
+    bypassed: int = 0  # Requisições feitas sem revalidação (refresh_cache)
+
+
+@dataclass
+class HttpCache:
+    """
+    Cache em disco das respostas HTTP, com o corpo e os validadores (ETag/Last-Modified) de cada URL.
+    As requisições seguintes são revalidadas com GETs condicionais e, se o servidor responder 304, o corpo salvo é reaproveitado.
+    """
+
+    cache_dir: Path
+    max_bytes: int
+    bypass: bool = False
+    _stats: dict[str, CacheStats] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _total_bytes: int | None = None
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha1(url.encode()).hexdigest()
+        # Subdiretórios por prefixo evitam diretórios com centenas de milhares de arquivos
+        base = self.cache_dir / key[:2]
+        return base / f"{key}.body", base / f"{key}.meta.json"
+
+    def get(self, url: str) -> CachedResponse | None:
+        """
+        Retorna a resposta armazenada da URL ou None, caso não exista ou o cache esteja em modo bypass.
+        """
+        if self.bypass:
+            return None
+
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+
+        if meta.get("url") != url:
+            return None
+
+        return CachedResponse(
+            url=url, body=body, headers=meta["headers"], encoding=meta.get("encoding")
+        )
+
+    def conditional_headers(self, cached: CachedResponse | None) -> dict[str, str]:
+        """
+        Monta os headers de revalidação (If-None-Match / If-Modified-Since) da requisição.
+        """
+        if cached is None:
+            return {}
+
+        conditional = {}
+        if cached.etag:
+            conditional["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            conditional["If-Modified-Since"] = cached.last_modified
+        return conditional
+
+    def store(
+        self, url: str, body: bytes, headers, encoding: str | None = None
+    ) -> None:
+        """
+        Grava o corpo e os headers relevantes da resposta.
+        Respostas sem ETag e sem Last-Modified não são armazenadas, pois não podem ser revalidadas.
+        """
+        kept = {name: headers[name] for name in HEADERS_TO_KEEP if headers.get(name)}
+        if "etag" not in kept and "last-modified" not in kept:
+            return
+
+        body_path, meta_path = self._paths(url)
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+
+        previous_size = self._entry_size(body_path, meta_path)
+
+        meta = json.dumps({"url": url, "headers": kept, "encoding": encoding})
+
+        # Escrita atômica para que outra task nunca leia um corpo pela metade
+        tmp_body = body_path.with_suffix(".body.tmp")
+        tmp_body.write_bytes(body)
+        os.replace(tmp_body, body_path)
+        tmp_meta = meta_path.with_suffix(".tmp")
+        tmp_meta.write_text(meta, encoding="utf-8")
+        os.replace(tmp_meta, meta_path)
+
+        with self._lock:
+            total = self._current_total_bytes()
+            self._total_bytes = total - previous_size + len(body) + len(meta)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def touch(self, url: str) -> None:
+        """
+        Marca a entrada como usada recentemente, para a política de descarte (LRU pelo mtime).
+        """
+        _, meta_path = self._paths(url)
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+
+    def _entry_size(self, body_path: Path, meta_path: Path) -> int:
+        size = 0
+        for path in (body_path, meta_path):
+            try:
+                size += path.stat().st_size
+            except OSError:
+                pass
+        return size
+
+    def _current_total_bytes(self) -> int:
+        if self._total_bytes is None:
+            self._total_bytes = sum(
+                p.stat().st_size for p in self.cache_dir.rglob("*") if p.is_file()
+            )
+        return self._total_bytes
+
+    def _evict(self) -> None:
+        """
+        Remove as entradas usadas há mais tempo até o cache ficar abaixo de 90% do tamanho máximo.
+        Deve ser chamado com o lock adquirido.
+        """
+        target = int(self.max_bytes * 0.9)
+        entries = []
+        for meta_path in self.cache_dir.rglob("*.meta.json"):
+            try:
+                entries.append((meta_path.stat().st_mtime, meta_path))
+            except OSError:
+                continue
+        entries.sort()
+
+        total = self._current_total_bytes()
+        removed = 0
+        for _, meta_path in entries:
+            if total <= target:
+                break
+            body_path = meta_path.with_name(
+                meta_path.name.replace(".meta.json", ".body")
+            )
+            size = self._entry_size(body_path, meta_path)
+            for path in (body_path, meta_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+
+        self._total_bytes = total
+        logger.info(f"Cache HTTP: {removed} entradas descartadas por limite de tamanho")
+
+    def record_hit(self, task: str) -> None:
+        with self._lock:
+            self._stats.setdefault(task, CacheStats()).hits += 1
+
+    def record_miss(self, task: str) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(task, CacheStats())
+            if self.bypass:
+                stats.bypassed += 1
+            else:
+                stats.misses += 1
+
+    def stats(self, task: str) -> CacheStats:
+        with self._lock:
+            return self._stats.get(task, CacheStats())
+
+    def log_stats(self, task: str) -> None:
+        stats = self.stats(task)
+        logger.info(
+            f"Cache HTTP da task {task}: {stats.hits} hits (304), {stats.misses} misses, {stats.bypassed} sem revalidação"
+        )
+
+
+_http_cache: HttpCache | None = None
+
+
+def get_http_cache() -> HttpCache:
+    """
+    Retorna o cache HTTP singleton, compartilhado por todas as tasks do processo.
+    """
+    global _http_cache
+
+    if _http_cache is None:
+        _http_cache = HttpCache(
+            cache_dir=Path(APP_SETTINGS.HTTP_CACHE.DIR),
+            max_bytes=APP_SETTINGS.HTTP_CACHE.MAX_SIZE_MB * 1024 * 1024,
+        )
+
+    return _http_cache
+
+
+def set_http_cache_bypass(refresh_cache: bool) -> None:
+    """
+    Com refresh_cache verdadeiro, as respostas são baixadas por completo (sem GET condicional), mas o cache continua sendo atualizado.
+    """
+    get_http_cache().bypass = refresh_cache
@@ -0,0 +1,115 @@
+import asyncio
+import threading
+from urllib.parse import urlparse
+
+import httpx
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+from .concurrency import host_max_limit
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+# Conexões por host quando o host não tem FETCH_LIMIT_MAX configurado (ex.: CDN do TSE)
+DEFAULT_MAX_CONNECTIONS = 10
+# Tempo que uma conexão ociosa fica aberta esperando a próxima task
+KEEPALIVE_EXPIRY = 60.0
+CLOSE_TIMEOUT = 10.0
+
+# Clientes assíncronos ficam presos ao event loop em que foram criados. As tasks do Prefect podem
+# rodar em loops diferentes, então a chave do registro é (host, loop)
+_async_clients: dict[
+    tuple[str, int], tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]
+] = {}
+_sync_clients: dict[str, httpx.Client] = {}
+_lock = threading.Lock()
+
+
+def _client_options(host: str) -> dict:
+    """
+    Opções comuns dos clientes: HTTP/2 quando o servidor negocia via ALPN (senão HTTP/1.1)
+    e keep-alive suficiente para a janela máxima de concorrência do host.
+    """
+    max_connections = host_max_limit(host, DEFAULT_MAX_CONNECTIONS)
+    return {
+        "http2": True,
+        "follow_redirects": True,
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+    }
+
+
+def get_async_client(url: str) -> httpx.AsyncClient:
+    """
+    Retorna o AsyncClient do host da URL para o event loop atual, criando-o na primeira chamada.
+    O cliente é reaproveitado por todas as tasks do loop até o fim da flow (close_http_clients).
+    """
+    host = urlparse(url).netloc
+    loop = asyncio.get_running_loop()
+
+    with _lock:
+        # Loops já encerrados levaram as conexões junto, basta esquecer os clientes
+        for key, (client_loop, _) in list(_async_clients.items()):
+            if client_loop.is_closed():
+                del _async_clients[key]
+
+        key = (host, id(loop))
+        if key not in _async_clients:
+            _async_clients[key] = (loop, httpx.AsyncClient(**_client_options(host)))
+
+        return _async_clients[key][1]
+
+
+def get_sync_client(url: str) -> httpx.Client:
+    """
+    Retorna o Client síncrono do host da URL, compartilhado entre as threads do processo.
+    """
+    host = urlparse(url).netloc
+
+    with _lock:
+        if host not in _sync_clients:
+            _sync_clients[host] = httpx.Client(**_client_options(host))
+
+        return _sync_clients[host]
+
+
+def close_http_clients(base_urls: list[str]):
+    """
+    Fecha os clientes dos hosts das URLs informadas. Chamado ao final de cada flow,
+    que fecha apenas os próprios hosts, já que as flows rodam em paralelo.
+    """
+    hosts = {urlparse(url).netloc for url in base_urls}
+
+    with _lock:
+        sync_clients = [
+            _sync_clients.pop(host) for host in list(_sync_clients) if host in hosts
+        ]
+        async_clients = [
+            _async_clients.pop(key) for key in list(_async_clients) if key[0] in hosts
+        ]
+
+    for client in sync_clients:
+        client.close()
+
+    for loop, client in async_clients:
+        try:
+            if loop.is_closed():
+                continue
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(
+                    timeout=CLOSE_TIMEOUT
+                )
+            else:
+                loop.run_until_complete(client.aclose())
+        except Exception as e:
+            logger.warning(f"Não foi possível fechar o cliente HTTP: {e}")
+
+    logger.info(
+        f"Clientes HTTP fechados: {len(sync_clients) + len(async_clients)} ({', '.join(sorted(hosts))})"
+    )
@@ -1,12 +1,16 @@
 import asyncio
+import fnmatch
 import hashlib
-import json
+import math
 import os
+import re
 import shutil
+import threading
 import time
 import zipfile
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterator
 
 import httpx
 from prefect.logging import get_logger
@@ -14,15 +18,40 @@ from prefect.logging import get_logger
 from config.loader import load_config
 from config.request_headers import headers
 from database.models.base import ErrorExtract
-from database.repository.erros_extract import (
-    insert_extract_error_db,
-    update_not_downloaded_urls_db,
+from database.repository.erros_extract import insert_extract_error_db
+
+from . import codec, rate_limit
+from .columnar import save_parquet
+from .compression import (
+    frame_dict_id,
+    is_compressed,
+    open_ndjson,
+    open_ndjson_writer,
+    output_ndjson_path,
+    plain_path,
+    remove_other_variant,
+    resolve_ndjson_path,
 )
+from .concurrency import HostLimiters
+from .extract_ledger import ExtractLedger
+from .http_cache import get_http_cache
+from .http_clients import get_async_client, get_sync_client
+from .ndjson_index import NdjsonIndexBuilder, index_path
+from .retry import RetryScheduler, retry_delay
 
 APP_SETTINGS = load_config()
 
 logger = get_logger()
 
+MANIFEST_NAME = "manifest.json"
+
+# Filtro de arquivos de um zip: padrão glob (str) ou regex compilada
+ZipMembers = str | re.Pattern | None
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Arquivos menores que segments * MIN_SEGMENT_SIZE são baixados em uma única conexão
+MIN_SEGMENT_SIZE = 16 * 1024 * 1024
+
 
 # Garante que o caminho exista
 def ensure_dir(path: str | Path) -> Path:
@@ -32,7 +61,7 @@ def ensure_dir(path: str | Path) -> Path:
 
 
 # Download de arquivos zip em streaming por conta dos arquivos pesados
-def download_stream(
+async def download_stream_async(
     url: str,
     id_lote: int,
     task: str,
@@ -40,33 +69,58 @@ def download_stream(
     unzip: bool = False,
     timeout: float = 60.0,
     max_retries: int = APP_SETTINGS.ALLENDPOINTS.FETCH_MAX_RETRIES,
+    segments: int = APP_SETTINGS.TSE.DOWNLOAD_SEGMENTS,
+    expected_sha256: str | None = None,
+    members: ZipMembers = None,
 ) -> str | None:
     """
     Faça o download de um arquivo em stream e opcionalmente extrai os arquivos, caso seja um ZIP.
+    Com `members`, só os arquivos do zip que passam pelo filtro (glob ou regex) são extraídos. Se nenhum passar,
+    o zip é mantido e ZipMembersNotFound é lançada.
+    - O download é feito em um arquivo .part, retomado com Range a partir do ponto em que parou em caso de falha.
+    - Se o servidor aceitar Range e o arquivo for grande, é baixado em `segments` partes paralelas.
+    - Ao final, o tamanho e o checksum são conferidos (ETag MD5 do servidor e/ou expected_sha256) e o SHA-256 é gravado em um arquivo .sha256.
     Retorna o caminho do arquivo.
     """
     dest_path = Path(dest_path)
     ensure_dir(dest_path.parent)
+    part_path = dest_path.with_name(dest_path.name + ".part")
 
     for attempt in range(max_retries):
         try:
-            with httpx.stream("GET", url, timeout=timeout) as r:
-                r.raise_for_status()
-
-                _total_size = int(r.headers.get("content-length", 0))
-                downloaded_size = 0
+            remote = await _remote_file_info(url, timeout)
+            _discard_stale_parts(part_path, remote)
+
+            if (
+                segments > 1
+                and remote.accept_ranges
+                and remote.size >= segments * MIN_SEGMENT_SIZE
+            ):
+                await _download_segments(url, part_path, remote, segments, timeout)
+            else:
+                await _download_single(url, part_path, remote, timeout)
 
-                with open(dest_path, "wb") as f:
-                    for chunk in r.iter_bytes():
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
+            sha256 = await asyncio.to_thread(
+                _verify_download, part_path, remote, expected_sha256
+            )
+            os.replace(part_path, dest_path)
+            _part_meta_path(part_path).unlink(missing_ok=True)
+            # Via .tmp + os.replace, como os demais arquivos de extract (o .sha256 anterior pode estar
+            # ligado por hardlink ao arquivo de um lote)
+            save_bytes(
+                f"{sha256}  {dest_path.name}\n".encode("utf-8"),
+                dest_path.with_name(dest_path.name + ".sha256"),
+            )
 
-                if unzip:
-                    _extracted_files = unzip_file(dest_path)
-                    dest_path.unlink()  # Apaga os zips após a extração
-                    return str(dest_path)
-                else:
-                    return str(dest_path)
+            if unzip:
+                await asyncio.to_thread(unzip_file, dest_path, members)
+                dest_path.unlink()  # Apaga os zips após a extração
+            return str(dest_path)
+        except ZipMembersNotFound as e:
+            # Baixar de novo não resolve. O zip é mantido para conferir o conteúdo e a task falha
+            logger.error(str(e))
+            await _record_download_error(id_lote, task, url, None, str(e))
+            raise
         except Exception as e:
             status_code = (
                 e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
@@ -76,35 +130,253 @@ def download_stream(
                 f"Erro ao tentar baixar arquivos por stream, tentativa {attempt}: {e}"
             )
             if attempt < max_retries - 1:
-                time.sleep(2**attempt)
+                # O .part é mantido, a próxima tentativa continua de onde esta parou
+                await asyncio.sleep(retry_delay(e, attempt))
             else:
                 # Não damos raise na exceção pois daremos um tratamento próprio para as URLs que não foram baixadas
                 message = f"Falha ao baixar o recurso {url} após {max_retries} tentativas: {e}"
                 logger.error(message)
+                await _record_download_error(id_lote, task, url, status_code, str(e))
 
-                try:
-                    insert_extract_error_db(
-                        id_lote=id_lote,
-                        task=task,
-                        status_code=status_code,
-                        message=str(e),
-                        url=url,
-                    )
-                except Exception as e:
-                    logger.critical(
-                        f"Erro ao tentar inserir o erro da URL {url} no banco de dados: {e}"
-                    )
 
+async def _record_download_error(
+    id_lote: int, task: str, url: str, status_code: int | None, message: str
+):
+    try:
+        await asyncio.to_thread(
+            insert_extract_error_db,
+            id_lote=id_lote,
+            task=task,
+            status_code=status_code,
+            message=message,
+            url=url,
+        )
+    except Exception as e:
+        logger.critical(
+            f"Erro ao tentar inserir o erro da URL {url} no banco de dados: {e}"
+        )
+
+
+@dataclass
+class RemoteFileInfo:
+    size: int  # 0 quando o servidor não informa o Content-Length
+    accept_ranges: bool
+    etag: str | None
+
+
+async def _remote_file_info(url: str, timeout: float) -> RemoteFileInfo:
+    await rate_limit.acquire(url)
+    r = await get_async_client(url).head(url, timeout=timeout)
+
+    if r.status_code in (405, 501):
+        # Servidor sem suporte a HEAD: download simples, sem Range
+        return RemoteFileInfo(size=0, accept_ranges=False, etag=None)
+    r.raise_for_status()
+
+    return RemoteFileInfo(
+        size=int(r.headers.get("content-length", 0)),
+        accept_ranges=r.headers.get("accept-ranges", "").lower() == "bytes",
+        etag=r.headers.get("etag"),
+    )
+
+
+def _part_meta_path(part_path: Path) -> Path:
+    return part_path.with_name(part_path.name + ".json")
+
+
+def _segment_paths(part_path: Path) -> list[Path]:
+    return sorted(part_path.parent.glob(part_path.name + ".seg*"))
+
+
+def _discard_stale_parts(part_path: Path, remote: RemoteFileInfo):
+    """
+    Os arquivos parciais só são retomados se o arquivo remoto ainda for o mesmo (ETag e tamanho).
+    """
+    meta_path = _part_meta_path(part_path)
+    current = {"etag": remote.etag, "size": remote.size}
+
+    try:
+        with open(meta_path, "rb") as f:
+            previous = codec.loads(f.read())
+    except (OSError, ValueError):
+        previous = None
+
+    if previous != current:
+        part_path.unlink(missing_ok=True)
+        for segment_path in _segment_paths(part_path):
+            segment_path.unlink()
+        with open(meta_path, "wb") as f:
+            f.write(codec.dumps(current))
+
+
+async def _download_range(
+    url: str, path: Path, timeout: float, start: int = 0, end: int | None = None
+):
+    """
+    Baixa os bytes [start + tamanho atual de path, end] para o fim de path.
+    Sem start/end e sem arquivo parcial, é um GET normal.
+    """
+    offset = start + (path.stat().st_size if path.exists() else 0)
+    if end is not None and offset > end:
+        return  # Segmento já completo
+
+    request_headers = {}
+    if offset or end is not None:
+        request_headers["Range"] = f"bytes={offset}-{'' if end is None else end}"
+
+    await rate_limit.acquire(url)
+    async with get_async_client(url).stream(
+        "GET", url, headers=request_headers, timeout=timeout
+    ) as r:
+        r.raise_for_status()
+
+        mode = "ab"
+        if "Range" in request_headers and r.status_code != 206:
+            if start or end is not None:
+                raise Exception(
+                    f"O servidor ignorou o Range e respondeu {r.status_code}"
+                )
+            mode = "wb"  # O servidor devolveu o arquivo inteiro, recomeça do zero
+
+        with open(path, mode) as f:
+            async for chunk in r.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                await asyncio.to_thread(f.write, chunk)
+
+
+async def _download_single(
+    url: str, part_path: Path, remote: RemoteFileInfo, timeout: float
+):
+    if not remote.accept_ranges:
+        # Sem suporte a Range não há como retomar, recomeça do zero
+        part_path.unlink(missing_ok=True)
+    elif part_path.exists() and remote.size and part_path.stat().st_size >= remote.size:
+        return  # Download concluído em uma tentativa anterior
+
+    await _download_range(url, part_path, timeout)
+
+
+async def _download_segments(
+    url: str, part_path: Path, remote: RemoteFileInfo, segments: int, timeout: float
+):
+    """
+    Divide o arquivo em segmentos de bytes baixados em paralelo, cada um em seu próprio arquivo (retomável),
+    e concatena os segmentos no .part ao final.
+    """
+    segment_size = math.ceil(remote.size / segments)
+    ranges = [
+        (index, index * segment_size, min((index + 1) * segment_size, remote.size) - 1)
+        for index in range(segments)
+    ]
+
+    # Se um segmento falhar, o TaskGroup cancela os outros e a próxima tentativa retoma todos
+    try:
+        async with asyncio.TaskGroup() as group:
+            for index, start, end in ranges:
+                segment_path = part_path.with_name(f"{part_path.name}.seg{index:03d}")
+                group.create_task(
+                    _download_range(url, segment_path, timeout, start=start, end=end)
+                )
+    except ExceptionGroup as eg:
+        # Propaga o erro original, para que o Retry-After e o status code sejam tratados normalmente
+        raise eg.exceptions[0]
+
+    await asyncio.to_thread(_concat_segments, part_path)
+
+
+def _concat_segments(part_path: Path):
+    with open(part_path, "wb") as out:
+        for segment_path in _segment_paths(part_path):
+            with open(segment_path, "rb") as f:
+                shutil.copyfileobj(f, out, DOWNLOAD_CHUNK_SIZE)
+    for segment_path in _segment_paths(part_path):
+        segment_path.unlink()
+
+
+def _verify_download(
+    part_path: Path, remote: RemoteFileInfo, expected_sha256: str | None
+) -> str:
+    """
+    Confere o tamanho e o checksum do arquivo baixado. Retorna o SHA-256.
+    Em caso de divergência o arquivo parcial é apagado, pois não pode ser retomado.
+    """
+    size = part_path.stat().st_size
+    sha256 = hashlib.sha256()
+    md5 = hashlib.md5()
+    with open(part_path, "rb") as f:
+        while chunk := f.read(DOWNLOAD_CHUNK_SIZE):
+            sha256.update(chunk)
+            md5.update(chunk)
+
+    errors = []
+    if remote.size and size != remote.size:
+        errors.append(f"tamanho {size} diferente do esperado {remote.size}")
+
+    # ETags de CDNs costumam ser o MD5 do arquivo quando ele não foi enviado em partes
+    etag = (remote.etag or "").strip('"')
+    if re.fullmatch(r"[0-9a-f]{32}", etag) and md5.hexdigest() != etag:
+        errors.append(f"MD5 {md5.hexdigest()} diferente do ETag {etag}")
+
+    if expected_sha256 and sha256.hexdigest() != expected_sha256.lower():
+        errors.append(f"SHA-256 {sha256.hexdigest()} diferente de {expected_sha256}")
+
+    if errors:
+        part_path.unlink(missing_ok=True)
+        raise Exception(f"Arquivo baixado corrompido: {'; '.join(errors)}")
+
+    return sha256.hexdigest()
 
-def unzip_file(zip_path: str | Path) -> list[str]:
+
+class ZipMembersNotFound(Exception):
+    """
+    Nenhum arquivo do zip passou pelo filtro `members`: o layout do arquivo mudou ou o filtro está errado.
+    """
+
+
+def zip_members(zf: zipfile.ZipFile, members: ZipMembers = None) -> list[str]:
+    """
+    Nomes dos arquivos do zip que passam pelo filtro: padrão glob (ex.: "*_BRASIL.csv") ou regex compilada.
+    Sem filtro, retorna todos os arquivos.
+    """
+    names = [info.filename for info in zf.infolist() if not info.is_dir()]
+
+    if members is None:
+        return names
+    if isinstance(members, re.Pattern):
+        return [name for name in names if members.search(name)]
+    return [name for name in names if fnmatch.fnmatch(Path(name).name, members)]
+
+
+def unzip_file(zip_path: str | Path, members: ZipMembers = None) -> list[str]:
+    """
+    Extrai do zip apenas os arquivos que passam pelo filtro `members`, descompactando em stream.
+    Os arquivos que não passam pelo filtro nunca são gravados em disco.
+    """
     zip_path = Path(zip_path)
     extract_dir = zip_path.parent
 
     extract_dir.mkdir(parents=True, exist_ok=True)
 
     with zipfile.ZipFile(zip_path, "r") as zf:
-        zf.extractall(extract_dir)
-        extracted_files = [str(extract_dir / name) for name in zf.namelist()]
+        extracted_files = []
+        for name in zip_members(zf, members):
+            dest_path = extract_dir / name
+            if not dest_path.resolve().is_relative_to(extract_dir.resolve()):
+                logger.warning(f"O arquivo {name} do zip {zip_path} foi ignorado")
+                continue
+
+            # Grava em um .tmp e substitui o arquivo anterior, sem reescrever o conteúdo dele
+            # (o arquivo anterior pode estar no arquivo de um lote, ligado por hardlink)
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = dest_path.with_name(dest_path.name + ".tmp")
+            with zf.open(name) as src, open(tmp_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, DOWNLOAD_CHUNK_SIZE)
+            os.replace(tmp_path, dest_path)
+            extracted_files.append(str(dest_path))
+
+    if not extracted_files:
+        raise ZipMembersNotFound(
+            f"Nenhum arquivo do zip {zip_path} corresponde ao filtro {members}"
+        )
 
     return extracted_files
 
@@ -114,6 +386,7 @@ def fetch_json(
     url: str,
     timeout: float = 30.0,
     max_retries: int = 10,
+    task: str = "fetch_json",
 ) -> dict | list | None:
     """
     Busca um JSON a partir da URL e retorna o objeto em memória
@@ -121,26 +394,41 @@ def fetch_json(
 
     logger.info(f"Baixando URL: {url}")
 
-    with httpx.Client(
-        timeout=timeout, follow_redirects=True, headers=headers
-    ) as client:
-        for attempt in range(max_retries):
-            try:
-                r = client.get(url)
-                r.raise_for_status()
-                return r.json()
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    logger.warning(
-                        f"Um erro ocorreu no fetch de dados: {e}. TENTANDO NOVAMENTE. Tentativa: {attempt}"
-                    )
-                    time.sleep(2**attempt)
-                else:
-                    message = f"Erro ao baixar recurso da url {url} após {max_retries} tentativas: {e}"
-                    logger.error(message)
+    cache = get_http_cache()
+
+    client = get_sync_client(url)
+
+    for attempt in range(max_retries):
+        try:
+            cached = cache.get(url)
+            rate_limit.acquire_sync(url)
+            r = client.get(
+                url,
+                timeout=timeout,
+                headers={**headers, **cache.conditional_headers(cached)},
+            )
+
+            if r.status_code == 304 and cached is not None:
+                cache.record_hit(task)
+                cache.touch(url)
+                return codec.loads(cached.body)
+
+            r.raise_for_status()
+            cache.record_miss(task)
+            cache.store(url, r.content, r.headers)
+            return codec.loads(r.content)
+        except Exception as e:
+            if attempt < max_retries - 1:
+                logger.warning(
+                    f"Um erro ocorreu no fetch de dados: {e}. TENTANDO NOVAMENTE. Tentativa: {attempt}"
+                )
+                time.sleep(retry_delay(e, attempt))
+            else:
+                message = f"Erro ao baixar recurso da url {url} após {max_retries} tentativas: {e}"
+                logger.error(message)
 
-                    # Aqui jogamos o erro pois normalmente as tasks necessitam dos dados de dados que são baixados de um único JSON.
-                    raise Exception(message)
+                # Aqui jogamos o erro pois normalmente as tasks necessitam dos dados de dados que são baixados de um único JSON.
+                raise Exception(message)
 
 
 def save_json(data: Any, dest_path: str | Path) -> str:
@@ -149,27 +437,79 @@ def save_json(data: Any, dest_path: str | Path) -> str:
     """
     dest_path = Path(dest_path)
     ensure_dir(dest_path.parent)
-    with open(dest_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
+    tmp_path = dest_path.with_suffix(dest_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(codec.dumps(data))
+    os.replace(tmp_path, dest_path)
     return str(dest_path)
 
 
+def save_bytes(data: bytes, dest_path: str | Path) -> str:
+    """
+    Salva o conteúdo bruto (ex.: corpo de uma resposta HTTP) em disco, sem decodificar e recodificar o JSON.
+    """
+    dest_path = Path(dest_path)
+    ensure_dir(dest_path.parent)
+    tmp_path = dest_path.with_suffix(dest_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, dest_path)
+    return str(dest_path)
+
+
+def save_manifest(entries: dict[str, dict], out_dir: str | Path) -> str:
+    """
+    Grava o manifest.json de um diretório de respostas (URL -> caminho, status e tamanho em bytes).
+    As entradas de execuções anteriores são mantidas, e as URLs baixadas novamente são atualizadas.
+    """
+    manifest_path = Path(out_dir) / MANIFEST_NAME
+    manifest = load_manifest(out_dir) if manifest_path.exists() else {}
+    manifest.update(entries)
+    save_json(manifest, manifest_path)
+    return str(manifest_path)
+
+
+def load_manifest(out_dir: str | Path) -> dict[str, dict]:
+    """
+    Lê o manifest.json de um diretório gerado pelo fetch_many_jsons com out_dir.
+    """
+    return load_json(Path(out_dir) / MANIFEST_NAME)
+
+
+def load_jsons_from_manifest(
+    out_dir: str | Path, urls: list[str] | None = None
+) -> list[dict]:
+    """
+    Carrega apenas os JSONs das URLs pedidas (ou todos, se urls for None) a partir do manifest.
+    """
+    manifest = load_manifest(out_dir)
+    selected = manifest.keys() if urls is None else [u for u in urls if u in manifest]
+    return [load_json(manifest[url]["path"]) for url in selected]
+
+
 # Salva uma lista de JSONs em um único NDJson
 def save_ndjson(records: list[dict], dest_path: str | Path) -> str:
     """
     Salva arquivos no formato NDJson, que agrupa vários JSONS.
     Só grava em disco depois dos dados estiverem consolidados
+    Com LOAD.ZSTD ativo, grava a versão comprimida (<arquivo>.ndjson.zst).
     """
-    dest_path = Path(dest_path)
+    dest_path = output_ndjson_path(dest_path)
     dest_path.parent.mkdir(parents=True, exist_ok=True)
     tmp_path = dest_path.with_suffix(dest_path.suffix + ".tmp")
 
     try:
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            for rec in records:
-                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        # Índice id -> offset das linhas, para leituras parciais com load_ndjson_by_ids
+        index = NdjsonIndexBuilder()
+        with open(tmp_path, "wb") as raw, open_ndjson_writer(raw, dest_path) as f:
+            codec.write_ndjson(f, records, on_line=index.add)
 
         os.replace(tmp_path, dest_path)
+        remove_other_variant(dest_path)
+        _save_index(index, dest_path)
+
+        if APP_SETTINGS.LOAD.PARQUET:
+            save_parquet(dest_path)
     finally:
         if tmp_path.exists():
             try:
@@ -179,23 +519,89 @@ def save_ndjson(records: list[dict], dest_path: str | Path) -> str:
     return str(dest_path)
 
 
+async def save_ndjson_async(records: AsyncIterable[dict], dest_path: str | Path) -> str:
+    """
+    Versão incremental do save_ndjson: cada registro é gravado assim que chega do iterador assíncrono,
+    sem acumular a lista em memória. O arquivo final só substitui o anterior quando o iterador termina sem erros.
+    """
+    dest_path = output_ndjson_path(dest_path)
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest_path.with_suffix(dest_path.suffix + ".tmp")
+
+    try:
+        index = NdjsonIndexBuilder()
+        offset = 0
+        with open(tmp_path, "wb") as raw, open_ndjson_writer(raw, dest_path) as f:
+            batch: list[bytes] = []
+            async for rec in records:
+                line = codec.dumps_line(rec)
+                index.add(offset, rec)
+                offset += len(line)
+                batch.append(line)
+                if len(batch) >= codec.WRITE_BATCH_SIZE:
+                    f.write(b"".join(batch))
+                    batch.clear()
+            f.write(b"".join(batch))
+
+        os.replace(tmp_path, dest_path)
+        remove_other_variant(dest_path)
+        _save_index(index, dest_path)
+
+        if APP_SETTINGS.LOAD.PARQUET:
+            await asyncio.to_thread(save_parquet, dest_path)
+    finally:
+        if tmp_path.exists():
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+    return str(dest_path)
+
+
+def _save_index(index: NdjsonIndexBuilder, dest_path: Path):
+    # Os offsets só valem para o arquivo sem compressão
+    if is_compressed(dest_path):
+        index_path(plain_path(dest_path)).unlink(missing_ok=True)
+    else:
+        index.save(dest_path)
+
+
 def merge_ndjson(inputs: list[str | Path], dest: str | Path) -> str:
     """
     Quando temos vários NDJsons da mesma task, fazemos o merge deles em um único arquivo.
+    Se as entradas e o destino forem .zst com o mesmo dicionário, os frames são apenas concatenados,
+    sem descomprimir e comprimir de novo: um arquivo zstd com vários frames continua válido.
     """
-    dest = Path(dest)
+    dest = output_ndjson_path(dest)
     dest.parent.mkdir(parents=True, exist_ok=True)
     tmp = dest.with_suffix(dest.suffix + ".tmp")
 
-    with open(tmp, "w", encoding="utf-8") as out:
-        for p in inputs:
-            p = Path(p)
-            if not p.exists():
-                continue
-            with open(p, "r", encoding="utf-8") as f:
-                shutil.copyfileobj(f, out)
-            os.unlink(p)
+    paths = [resolve_ndjson_path(p) for p in inputs]
+    paths = [p for p in paths if p.exists()]
+
+    concat_frames = (
+        is_compressed(dest)
+        and all(is_compressed(p) for p in paths)
+        and len({frame_dict_id(p) for p in paths}) <= 1
+    )
+
+    with open(tmp, "wb") as out:
+        if concat_frames:
+            for p in paths:
+                with open(p, "rb") as f:
+                    shutil.copyfileobj(f, out)
+        else:
+            with open_ndjson_writer(out, dest) as writer:
+                for p in paths:
+                    with open_ndjson(p) as f:
+                        shutil.copyfileobj(f, writer)
+
+    for p in paths:
+        os.unlink(p)
     os.replace(tmp, dest)
+    remove_other_variant(dest)
+    # O índice do arquivo anterior não vale para o arquivo mesclado
+    index_path(plain_path(dest)).unlink(missing_ok=True)
     return str(dest)
 
 
@@ -208,124 +614,327 @@ async def fetch_html_many_async(
     limit: int = 10,
     timeout: int = 1800,
     max_retries: int = 10,
-) -> list[str | None]:
+) -> list[str]:
     """
     Faz o download de páginas HTML
+    - Se out_dir for fornecido, salva cada página em um arquivo e retorna a lista de caminhos.
+    - Caso contrário, retorna a lista de HTMLs em memória. Para muitas páginas, prefira o fetch_html_many_to_zip.
     """
+    results = []
+
+    async def collect(_url: str, result: str):
+        results.append(result)
+
+    await _fetch_html_many(
+        urls=urls,
+        not_downloaded_urls=not_downloaded_urls,
+        id_lote=id_lote,
+        task=task,
+        on_result=collect,
+        out_dir=out_dir,
+        limit=limit,
+        timeout=timeout,
+        max_retries=max_retries,
+    )
+
+    return results
 
-    sem = asyncio.Semaphore(limit)
+
+async def fetch_html_many_to_zip(
+    urls: list[str],
+    not_downloaded_urls: list[ErrorExtract],
+    id_lote: int,
+    task: str,
+    zip_path: str | Path,
+    key: Callable[[str], str],
+    on_page: Callable[[str, str], Awaitable[None]] | None = None,
+    limit: int = 10,
+    timeout: int = 1800,
+    max_retries: int = 10,
+) -> str:
+    """
+    Faz o download de páginas HTML gravando cada uma no zip assim que chega, sem acumular as páginas em memória.
+    - `key` recebe a URL e retorna a chave da página no índice do zip (ver HtmlZipArchive).
+    - `on_page(url, html)`, se fornecido, recebe cada página depois de gravada (ex.: ParseStage.submit).
+    """
+    with HtmlZipArchive(zip_path, key) as archive:
+
+        async def on_result(url: str, html: str):
+            await archive.add(url, html)
+            if on_page is not None:
+                await on_page(url, html)
+
+        await _fetch_html_many(
+            urls=urls,
+            not_downloaded_urls=not_downloaded_urls,
+            id_lote=id_lote,
+            task=task,
+            on_result=on_result,
+            limit=limit,
+            timeout=timeout,
+            max_retries=max_retries,
+        )
+
+    logger.info(
+        f"{archive.count} páginas HTML gravadas em {zip_path} ({archive.unique} corpos distintos)"
+    )
+
+    return str(zip_path)
+
+
+async def _fetch_html_many(
+    urls: list[str],
+    not_downloaded_urls: list[ErrorExtract],
+    id_lote: int,
+    task: str,
+    on_result: Callable[[str, str], Awaitable[None]],
+    out_dir: str | Path | None = None,
+    limit: int = 10,
+    timeout: int = 1800,
+    max_retries: int = 10,
+):
+    """
+    Núcleo do download de páginas HTML: um número fixo de workers consome uma fila limitada.
+    Cada página (ou caminho, com out_dir) é entregue ao callback on_result(url, resultado) assim que é baixada.
+    """
+    # A concorrência começa em `limit` e é ajustada por host pelo controle AIMD
+    limiters = HostLimiters(task=task, initial=limit)
     timeout_cfg = httpx.Timeout(timeout)
+    cache = get_http_cache()
 
     ensure_dir(out_dir) if out_dir else None
 
-    processed_urls = set()  # Evita processar a mesma URL duas vezes
+    ledger = ExtractLedger(
+        id_lote=id_lote, task=task, not_downloaded_urls=not_downloaded_urls
+    )
+
+    # Workers suficientes para a janela de concorrência crescer até o teto do host
+    num_workers = limiters.max_workers(urls)
+    # A fila limitada impede que milhares de URLs fiquem pendentes em memória ao mesmo tempo
+    queue: asyncio.Queue = asyncio.Queue(maxsize=num_workers * 2)
+    retries = RetryScheduler(queue)
 
-    async def fetch(u: str, client: httpx.AsyncClient):
-        if u in processed_urls:
-            return None
-        processed_urls.add(u)
+    async def produce():
+        processed_urls = set()  # Evita processar a mesma URL duas vezes
+        for u in urls:
+            if u not in processed_urls:
+                processed_urls.add(u)
+                await queue.put((u, 0))  # (URL, tentativa)
 
-        async with sem:
-            for attempt in range(max_retries):
-                try:
+    async def worker():
+        while True:
+            u, attempt = await queue.get()
+            limiter = limiters.for_url(u)
+
+            try:
+                # A vaga de concorrência é ocupada só durante a tentativa, nunca durante a espera do backoff
+                async with limiter.slot():
                     logger.info(f"Fazendo download da URL: {u}")
-                    r = await client.get(u)
-                    r.raise_for_status()
-
-                    html_content = r.text
-
-                    # Salvar ou retornar o resultado atual
-                    if out_dir:
-                        # Nome do arquivo determinado pelo Hash da URL
-                        name = hashlib.sha1(u.encode()).hexdigest() + ".html"
-                        path = Path(out_dir) / name
-                        with open(path, "w", encoding="utf-8") as f:
-                            f.write(html_content)
-                        return str(path)  # Se salvar, retorna o caminho
-
-                    # Verificar e atualizar no banco de dados as urls com falhas
-                    failed_urls = {error.url: error for error in not_downloaded_urls}
-
-                    if failed_urls:
-                        try:
-                            update_url_not_downloaded(
-                                id_lote=id_lote, url=u, failed_urls=failed_urls
-                            )
-                        except Exception as e:
-                            logger.critical(
-                                f"Não foi possível atualizar o registro de URL baixada no banco de dados: {e}"
-                            )
-                            raise
-
-                    return html_content
-
-                except Exception as e:
-                    status_code = (
-                        e.response.status_code
-                        if isinstance(e, httpx.HTTPStatusError)
-                        else None
+                    cached = await asyncio.to_thread(cache.get, u)
+                    await rate_limit.acquire(u)
+                    started = time.monotonic()
+                    r = await get_async_client(u).get(
+                        u,
+                        timeout=timeout_cfg,
+                        headers=cache.conditional_headers(cached),
                     )
+                    latency = time.monotonic() - started
 
-                    if attempt < max_retries - 1:
-                        logger.warning(
-                            f"Um erro ocorreu ao baixar uma página HTML: {e}. TENTANDO NOVAMENTE. Tentativa: {attempt}"
+                    if r.status_code == 304 and cached is not None:
+                        cache.record_hit(task)
+                        await asyncio.to_thread(cache.touch, u)
+                        html_content = cached.body.decode(
+                            cached.encoding or "utf-8", errors="replace"
                         )
-                        await asyncio.sleep(2**attempt)
                     else:
-                        logger.error(
-                            f"Falha permanente ao baixar {u} após {max_retries} tentativas: {e}"
+                        r.raise_for_status()
+                        cache.record_miss(task)
+                        await asyncio.to_thread(
+                            cache.store, u, r.content, r.headers, r.encoding
                         )
+                        html_content = r.text
 
-                        try:
-                            insert_extract_error_db(
-                                id_lote=id_lote,
-                                task=task,
-                                status_code=status_code,
-                                message=str(e),
-                                url=u,
-                            )
-                        except Exception as e:
-                            logger.critical(
-                                f"Erro ao tentar inserir o erro da URL {u} no banco de dados: {e}"
-                            )
-                            raise
-
-    async with httpx.AsyncClient(timeout=timeout_cfg, follow_redirects=True) as client:
-        tasks = [fetch(u, client) for u in urls]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        # Elimina os resultados inválidos (erro)
-        valid_results = [
-            result for result in results if not isinstance(result, BaseException)
-        ]
-
-    return valid_results
-
-
-def update_url_not_downloaded(
-    id_lote: int, url: str, failed_urls: dict[str, ErrorExtract]
-):
+                    await limiter.record_success(latency)
+
+                # Salvar ou entregar o resultado atual
+                if out_dir:
+                    # Nome do arquivo determinado pelo Hash da URL
+                    name = hashlib.sha1(u.encode()).hexdigest() + ".html"
+                    path = Path(out_dir) / name
+                    await asyncio.to_thread(
+                        save_bytes, html_content.encode("utf-8"), path
+                    )
+                    await on_result(u, str(path))
+                else:
+                    await on_result(u, html_content)
+
+                # URLs que haviam falhado em lotes anteriores são marcadas como baixadas em lote
+                ledger.record_success(u)
+
+                queue.task_done()
+            except Exception as e:
+                status_code = (
+                    e.response.status_code
+                    if isinstance(e, httpx.HTTPStatusError)
+                    else None
+                )
+
+                if isinstance(e, httpx.HTTPError):
+                    await limiter.record_failure(e)
+
+                if attempt < max_retries - 1:
+                    delay = retry_delay(e, attempt)
+                    logger.warning(
+                        f"Um erro ocorreu ao baixar uma página HTML: {e}. TENTANDO NOVAMENTE em {delay:.1f}s. Tentativa: {attempt}"
+                    )
+                    # O task_done deste item é feito pelo agendador, quando a retentativa voltar para a fila
+                    retries.schedule((u, attempt + 1), delay)
+                else:
+                    queue.task_done()
+                    logger.error(
+                        f"Falha permanente ao baixar {u} após {max_retries} tentativas: {e}"
+                    )
+
+                    ledger.record_failure(
+                        url=u, status_code=status_code, message=str(e)
+                    )
+
+    retries.start()
+    workers = [asyncio.create_task(worker()) for _ in range(num_workers)]
+
+    try:
+        # Só depois de todas as URLs entrarem na fila o join pode considerar o trabalho concluído
+        await produce()
+        await queue.join()
+    finally:
+        for w in workers:
+            w.cancel()
+        retries.stop()
+
+    await ledger.close()
+
+    cache.log_stats(task)
+    limiters.log_summary()
+
+    if ledger.db_errors:
+        # Se der erro na hora de criar o registro, damos Raise para avisar
+        raise Exception(
+            f"Houve erro na inserção de {ledger.db_errors} erros de URLs no banco de dados"
+        )
+
+
+HTML_ARCHIVE_INDEX = "index.json"
+HTML_ARCHIVE_OBJECTS_DIR = "objects"
+
+
+class HtmlZipArchive:
+    """
+    Zip endereçado por conteúdo, aberto durante todo o download, em que cada página é gravada assim que chega.
+    - Cada corpo distinto é gravado uma única vez em objects/<sha256>.html.
+    - O index.json mapeia a chave de cada página (ex.: "<deputado_id>_<ano>") para o hash do corpo.
+    O arquivo é escrito em um .tmp e só substitui o zip final quando fechado sem erros.
     """
-    Atualiza no banco de dados o registro da URL que não havia sido baixada
+
+    def __init__(self, zip_path: str | Path, key: Callable[[str], str]):
+        self.zip_path = Path(zip_path)
+        self.key = key
+        self.count = 0
+        self.index: dict[str, str] = {}
+        self._objects: set[str] = set()
+        self._tmp_path = self.zip_path.with_name(self.zip_path.name + ".tmp")
+        self._zf: zipfile.ZipFile | None = None
+        # As gravações são feitas em threads (to_thread) e o ZipFile não aceita escritas concorrentes
+        self._lock = threading.Lock()
+
+    @property
+    def unique(self) -> int:
+        return len(self._objects)
+
+    def __enter__(self) -> "HtmlZipArchive":
+        ensure_dir(self.zip_path.parent)
+        self._zf = zipfile.ZipFile(
+            self._tmp_path, "w", compression=zipfile.ZIP_DEFLATED
+        )
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._zf is not None:
+            if exc_type is None:
+                self._zf.writestr(
+                    HTML_ARCHIVE_INDEX,
+                    codec.dumps(dict(sorted(self.index.items()))),
+                )
+            self._zf.close()
+        if exc_type is None:
+            os.replace(self._tmp_path, self.zip_path)
+        else:
+            self._tmp_path.unlink(missing_ok=True)
+
+    def write(self, url: str, html: str):
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        key = self.key(url)
+
+        with self._lock:
+            if digest not in self._objects:
+                self._zf.writestr(f"{HTML_ARCHIVE_OBJECTS_DIR}/{digest}.html", data)  # type: ignore
+                self._objects.add(digest)
+            self.index[key] = digest
+            self.count += 1
+
+    async def add(self, url: str, html: str):
+        await asyncio.to_thread(self.write, url, html)
+
+
+def load_html_archive_index(zip_path: str | Path) -> dict[str, str]:
+    """
+    Retorna o índice (chave -> hash) de um zip gravado pelo HtmlZipArchive.
     """
+    with zipfile.ZipFile(zip_path) as zf:
+        return codec.loads(zf.read(HTML_ARCHIVE_INDEX))
 
-    if url in failed_urls:
-        error = failed_urls[url]
-        update_not_downloaded_urls_db(id_lote=id_lote, error_id=error.id)
 
+def iter_html_archive(zip_path: str | Path) -> Iterator[tuple[str, str]]:
+    """
+    Itera sobre (chave, html) de um zip gravado pelo HtmlZipArchive.
+    As chaves são agrupadas por hash, então cada corpo é descompactado uma única vez.
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        index = codec.loads(zf.read(HTML_ARCHIVE_INDEX))
+        by_hash: dict[str, list[str]] = {}
+        for key, digest in index.items():
+            by_hash.setdefault(digest, []).append(key)
 
-def save_htmls_in_zip(records: list[dict], zip_path: str | Path):
-    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for r in records:
-            filename = f"{r['deputado_id']}_{r['ano']}.html"
-            zf.writestr(filename, r["html"])
-    return zip_path
+        for digest, keys in by_hash.items():
+            html = zf.read(f"{HTML_ARCHIVE_OBJECTS_DIR}/{digest}.html").decode("utf-8")
+            for key in keys:
+                yield key, html
 
 
 def load_json(path: str | Path) -> dict:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        return codec.loads(f.read())
+
+
+def iter_ndjson(path: str | Path) -> Iterator[dict]:
+    """
+    Versão preguiçosa do load_ndjson: decodifica uma linha por vez, sem carregar o arquivo inteiro em memória.
+    Lê também a versão comprimida (<arquivo>.ndjson.zst), se só ela existir.
+    """
+    with open_ndjson(path) as f:
+        yield from codec.iter_ndjson(f)
 
 
 def load_ndjson(path: str | Path) -> list[dict]:
-    with open(path, "r", encoding="utf-8") as f:
-        return [json.loads(line) for line in f if line.strip()]
+    return list(iter_ndjson(path))
+
+
+def existing_ndjson(path: str | Path) -> str:
+    """
+    Caminho real (ou a versão .zst) de um NDJSON já gravado, para as tasks de load lerem com iter_ndjson.
+    Falha já no extract se o arquivo não existir.
+    """
+    real_path = resolve_ndjson_path(path)
+    if not real_path.exists():
+        raise FileNotFoundError(f"O arquivo {path} não foi encontrado")
+    return str(real_path)
@@ -0,0 +1,198 @@
+import hashlib
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+from .compression import compressed_path, open_ndjson, plain_path
+from .io import load_json, save_json
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+MANIFEST_NAME = "manifest.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def extract_dirs() -> list[Path]:
+    return [
+        Path(APP_SETTINGS.CAMARA.OUTPUT_EXTRACT_DIR),
+        Path(APP_SETTINGS.SENADO.OUTPUT_EXTRACT_DIR),
+        Path(APP_SETTINGS.TSE.OUTPUT_EXTRACT_DIR),
+    ]
+
+
+def lote_dir(id_lote: int) -> Path:
+    return Path(APP_SETTINGS.ARCHIVE.DIR) / str(id_lote)
+
+
+def _is_archived_file(path: Path) -> bool:
+    # Arquivos temporários e parciais de downloads em andamento não fazem parte do lote
+    return path.is_file() and path.suffix != ".tmp" and ".part" not in path.suffixes
+
+
+def _archived_path(root: Path, original: str | Path) -> Path:
+    """
+    Caminho do arquivo dentro do diretório do lote: o caminho original, relativo (ou sem a raiz, se absoluto).
+    """
+    original = Path(original)
+    return root / original.relative_to(original.anchor)
+
+
+def archived_file(id_lote: int, original: str | Path) -> Path:
+    """
+    Caminho, dentro do arquivo do lote, da cópia de um arquivo de extract.
+    """
+    return _archived_path(lote_dir(id_lote), original)
+
+
+def _link_or_copy(src: Path, dest: Path):
+    """
+    Hardlink (sem copiar os dados) quando origem e destino estão no mesmo sistema de arquivos, senão cópia.
+    O destino é substituído de forma atômica.
+    Os arquivos de extract são sempre gravados em um .tmp e trocados com os.replace, então uma nova extração
+    cria um novo arquivo e nunca altera o conteúdo ligado ao lote.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(dest.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dest)
+
+
+def file_sha256(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _count_rows(path: Path) -> int | None:
+    if plain_path(path).suffix != ".ndjson":
+        return None
+    with open_ndjson(path) as f:
+        return sum(1 for line in f if line.strip())
+
+
+def archive_extracts(
+    id_lote: int,
+    since_ns: int,
+    skipped_tasks: Iterable[str] = (),
+    skipped_flows: Iterable[str] = (),
+) -> str:
+    """
+    Guarda os arquivos de extract do lote em <ARCHIVE.DIR>/<id_lote>, com o mesmo caminho relativo do original,
+    e grava um manifest.json com o tamanho, o número de linhas (NDJSON) e o SHA-256 de cada arquivo.
+    - Só entram os arquivos gravados durante o lote (mtime >= `since_ns`, o início do lote): os arquivos das tasks
+      ignoradas continuam no ExtractOutDir com o conteúdo de execuções anteriores e não pertencem a este lote.
+    - As tasks e os flows ignorados ficam no manifest, para o replay também ignorá-los.
+    """
+    dest_root = lote_dir(id_lote)
+    files = {}
+
+    for extract_dir in extract_dirs():
+        if not extract_dir.exists():
+            continue
+
+        for path in sorted(extract_dir.rglob("*")):
+            if not _is_archived_file(path) or path.stat().st_mtime_ns < since_ns:
+                continue
+
+            dest = _archived_path(dest_root, path)
+            _link_or_copy(path, dest)
+
+            files[path.as_posix()] = {
+                "bytes": dest.stat().st_size,
+                "rows": _count_rows(dest),
+                "sha256": file_sha256(dest),
+            }
+
+    manifest = {
+        "id_lote": id_lote,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "skipped_tasks": sorted(skipped_tasks),
+        "skipped_flows": sorted(skipped_flows),
+        "files": files,
+    }
+    manifest_path = save_json(manifest, dest_root / MANIFEST_NAME)
+
+    total_bytes = sum(f["bytes"] for f in files.values())
+    logger.info(
+        f"Extracts do lote {id_lote} arquivados em {dest_root}: {len(files)} arquivos, {total_bytes / 1024**2:.1f} MB"
+    )
+
+    return manifest_path
+
+
+def load_lote_manifest(id_lote: int) -> dict:
+    return load_json(lote_dir(id_lote) / MANIFEST_NAME)
+
+
+def archived_lotes() -> list[int]:
+    root = Path(APP_SETTINGS.ARCHIVE.DIR)
+    if not root.exists():
+        return []
+    return sorted(
+        int(p.name)
+        for p in root.iterdir()
+        if p.name.isdigit() and (p / MANIFEST_NAME).exists()
+    )
+
+
+def verify_lote(id_lote: int) -> list[str]:
+    """
+    Confere o tamanho e o SHA-256 dos arquivos do lote com o manifest. Retorna os arquivos divergentes ou ausentes.
+    """
+    root = lote_dir(id_lote)
+    invalid = []
+
+    for rel_path, info in load_lote_manifest(id_lote)["files"].items():
+        path = _archived_path(root, rel_path)
+        if (
+            not path.exists()
+            or path.stat().st_size != info["bytes"]
+            or file_sha256(path) != info["sha256"]
+        ):
+            invalid.append(rel_path)
+
+    return invalid
+
+
+def check_lote(id_lote: int):
+    """
+    Falha se algum arquivo do lote divergir do manifest ou estiver ausente.
+    """
+    invalid = verify_lote(id_lote)
+    if invalid:
+        raise ValueError(
+            f"O arquivo do lote {id_lote} está corrompido ou incompleto: {', '.join(invalid)}"
+        )
+
+
+def extract_path(path: str | Path, replay_lote: int | None = None) -> str:
+    """
+    Caminho de onde o use_files lê um arquivo de extract: o próprio caminho do ExtractOutDir ou, no replay de um
+    lote, a cópia guardada no diretório do lote (inclusive a versão .zst de um NDJSON).
+    Os arquivos do ExtractOutDir não são alterados pelo replay. Falha se o arquivo não faz parte do lote.
+    """
+    if replay_lote is None:
+        return str(path)
+
+    files = load_lote_manifest(replay_lote)["files"]
+    for candidate in (Path(path), compressed_path(path)):
+        if candidate.as_posix() in files:
+            return str(archived_file(replay_lote, candidate))
+
+    raise FileNotFoundError(
+        f"O arquivo {path} não faz parte do lote {replay_lote} e não pode ser usado no replay"
+    )
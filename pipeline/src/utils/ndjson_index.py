@@ -0,0 +1,173 @@
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from prefect.logging import get_logger
+
+from . import codec
+from .compression import is_compressed, open_ndjson, resolve_ndjson_path
+
+logger = get_logger()
+
+INDEX_SUFFIX = ".idx"
+
+
+def index_path(ndjson_path: str | Path) -> Path:
+    ndjson_path = Path(ndjson_path)
+    return ndjson_path.with_name(ndjson_path.name + INDEX_SUFFIX)
+
+
+def _entities(rec: Any) -> list[dict]:
+    """
+    Entidades de uma linha: os itens de `dados` nas respostas da API, ou o próprio registro.
+    """
+    if isinstance(rec, dict) and "dados" in rec:
+        items = rec["dados"]
+        items = items if isinstance(items, list) else [items]
+        return [item for item in items if isinstance(item, dict)]
+    if isinstance(rec, dict):
+        return [rec]
+    return []
+
+
+def _file_version(ndjson_path: Path) -> dict:
+    """
+    Tamanho e mtime (ns) do NDJSON. Só o tamanho não basta: uma regravação pode manter o mesmo tamanho.
+    """
+    stat = ndjson_path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class NdjsonIndexBuilder:
+    """
+    Monta, durante a gravação de um NDJSON, o índice id da entidade -> offsets (bytes) das linhas em que ela aparece.
+    """
+
+    def __init__(self, key: str = "id"):
+        self.key = key
+        self.offsets: dict[str, list[int]] = {}
+
+    def add(self, offset: int, rec: Any):
+        for entity in _entities(rec):
+            value = entity.get(self.key)
+            if value is None:
+                continue
+            lines = self.offsets.setdefault(str(value), [])
+            if not lines or lines[-1] != offset:
+                lines.append(offset)
+
+    def save(self, ndjson_path: str | Path) -> str:
+        """
+        Grava o índice ao lado do NDJSON (<arquivo>.ndjson.idx), com o tamanho e o mtime do arquivo para detectar
+        índices desatualizados.
+        """
+        ndjson_path = Path(ndjson_path)
+        dest_path = index_path(ndjson_path)
+        tmp_path = dest_path.with_name(dest_path.name + ".tmp")
+        index = {"key": self.key, **_file_version(ndjson_path), "offsets": self.offsets}
+        with open(tmp_path, "wb") as f:
+            f.write(codec.dumps(index))
+        os.replace(tmp_path, dest_path)
+        return str(dest_path)
+
+
+def build_index(ndjson_path: str | Path, key: str = "id") -> dict:
+    """
+    Monta o índice percorrendo um NDJSON já gravado (arquivos antigos, sem índice ou com índice desatualizado).
+    """
+    builder = NdjsonIndexBuilder(key)
+    offset = 0
+    with open(ndjson_path, "rb") as f:
+        for line in f:
+            if line.strip():
+                builder.add(offset, codec.loads(line))
+            offset += len(line)
+    builder.save(ndjson_path)
+    return load_index(ndjson_path, key) or {}
+
+
+def load_index(ndjson_path: str | Path, key: str = "id") -> dict | None:
+    """
+    Lê o índice do NDJSON. Retorna None se ele não existir, for de outra chave ou estiver desatualizado.
+    """
+    try:
+        with open(index_path(ndjson_path), "rb") as f:
+            index = codec.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+    version = _file_version(Path(ndjson_path))
+    if index.get("key") != key or any(index.get(k) != v for k, v in version.items()):
+        return None
+
+    return index
+
+
+def _get_index(ndjson_path: str | Path, key: str) -> dict:
+    index = load_index(ndjson_path, key)
+    if index is None:
+        logger.warning(
+            f"O NDJSON {ndjson_path} não tem índice por '{key}' atualizado. Montando o índice a partir do arquivo."
+        )
+        index = build_index(ndjson_path, key)
+    return index
+
+
+def _scan_entities(ndjson_path: Path) -> Iterator[dict]:
+    """
+    Percorre todas as entidades de um NDJSON comprimido (.zst), que não tem índice:
+    os offsets não valem para o arquivo comprimido.
+    """
+    with open_ndjson(ndjson_path) as f:
+        for rec in codec.iter_ndjson(f):
+            yield from _entities(rec)
+
+
+def indexed_ids(ndjson_path: str | Path, key: str = "id") -> set[str]:
+    """
+    Ids de todas as entidades do NDJSON, lidos apenas do índice (como texto).
+    """
+    ndjson_path = resolve_ndjson_path(ndjson_path)
+    if is_compressed(ndjson_path):
+        return {
+            str(entity[key])
+            for entity in _scan_entities(ndjson_path)
+            if entity.get(key) is not None
+        }
+    return set(_get_index(ndjson_path, key)["offsets"])
+
+
+def load_ndjson_by_ids(
+    ndjson_path: str | Path, ids: Iterable[Any], key: str = "id"
+) -> list[dict]:
+    """
+    Retorna apenas as entidades com os ids pedidos, decodificando somente as linhas em que elas aparecem.
+    O arquivo é lido via mmap, então o custo não depende do tamanho do NDJSON.
+    """
+    wanted = {str(i) for i in ids}
+    ndjson_path = resolve_ndjson_path(ndjson_path)
+    if is_compressed(ndjson_path):
+        return [
+            entity
+            for entity in _scan_entities(ndjson_path)
+            if str(entity.get(key)) in wanted
+        ]
+
+    index = _get_index(ndjson_path, key)
+
+    offsets = sorted({offset for i in wanted for offset in index["offsets"].get(i, [])})
+    if not offsets:
+        return []
+
+    results = []
+    with open(ndjson_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset in offsets:
+                end = mm.find(b"\n", offset)
+                line = mm[offset : end if end != -1 else len(mm)]
+                for entity in _entities(codec.loads(line)):
+                    if str(entity.get(key)) in wanted:
+                        results.append(entity)
+
+    return results
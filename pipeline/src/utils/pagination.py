@@ -0,0 +1,107 @@
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+from .url_utils import alter_query_param_value, get_query_param_value
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+
+def page_key(url: str) -> str:
+    """
+    Identifica a consulta paginada, independente da página: a URL sem o parâmetro `pagina` e com a query ordenada.
+    """
+    parsed = urlparse(url)
+    params = parse_qs(parsed.query)
+    params.pop("pagina", None)
+    query = urlencode(sorted(params.items()), doseq=True)
+    return urlunparse(parsed._replace(query=query))
+
+
+def page_number(url: str) -> int:
+    return int(get_query_param_value(url, "pagina", "1"))
+
+
+def page_urls(url: str, last_page: int) -> list[str]:
+    """
+    URLs das páginas 2..last_page, geradas a partir da URL da primeira página.
+    """
+    return [
+        alter_query_param_value(base_url=url, param_name="pagina", new_value=page)
+        for page in range(2, last_page + 1)
+    ]
+
+
+def last_page_from_total(url: str, total_items: int) -> int | None:
+    """
+    Calcula a última página a partir do x-total-count. Sem o parâmetro `itens` na URL o tamanho da página é desconhecido.
+    """
+    items_per_page = int(get_query_param_value(url, "itens", "0"))
+    if not items_per_page:
+        return None
+    return max(math.ceil(total_items / items_per_page), 1)
+
+
+class PageCountStore:
+    """
+    Número de páginas de cada consulta paginada no último lote, persistido em disco.
+    Permite pedir as páginas seguintes antes da primeira página responder.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._counts: dict[str, int] | None = None
+
+    def _load(self) -> dict[str, int]:
+        if self._counts is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._counts = json.load(f)
+            except (OSError, ValueError):
+                self._counts = {}
+        return self._counts
+
+    def get(self, key: str) -> int | None:
+        with self._lock:
+            return self._load().get(key)
+
+    def update(self, counts: dict[str, int]):
+        if not counts:
+            return
+
+        with self._lock:
+            stored = self._load()
+            stored.update(counts)
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(stored, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+
+_page_count_store: PageCountStore | None = None
+
+
+def get_page_count_store() -> PageCountStore:
+    """
+    Retorna o PageCountStore singleton, compartilhado por todas as tasks do processo.
+    """
+    global _page_count_store
+
+    if _page_count_store is None:
+        _page_count_store = PageCountStore(
+            Path(APP_SETTINGS.HTTP_CACHE.PAGE_COUNTS_FILE)
+        )
+
+    return _page_count_store
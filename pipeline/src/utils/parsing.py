@@ -0,0 +1,103 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import IO, Callable
+
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+from . import codec
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+
+def parse_workers() -> int:
+    """
+    Processos de parsing: FLOW.MAX_RUNNERS, limitado ao número de CPUs da máquina.
+    """
+    return max(min(APP_SETTINGS.FLOW.MAX_RUNNERS, os.cpu_count() or 1), 1)
+
+
+class ParseStage:
+    """
+    Etapa de parsing de páginas em um ProcessPoolExecutor, alimentada enquanto os downloads ainda acontecem.
+    - `parse(url, corpo)` roda em outro processo e retorna registros compactos, e não o HTML.
+    - Os registros são gravados em NDJSON assim que cada página termina, e o arquivo final só substitui
+      o anterior quando a etapa termina sem erros.
+    - O número de páginas aguardando parsing é limitado: se o parsing atrasar, quem envia as páginas espera.
+    """
+
+    def __init__(
+        self,
+        parse: Callable[[str, str], list[dict]],
+        dest_path: str | Path,
+        max_workers: int | None = None,
+    ):
+        self.parse = parse
+        self.dest_path = Path(dest_path)
+        self.max_workers = max_workers or parse_workers()
+        self.pages = 0
+        self.records = 0
+        self.errors = 0
+        self._tmp_path = self.dest_path.with_suffix(self.dest_path.suffix + ".tmp")
+        self._pool: ProcessPoolExecutor | None = None
+        self._file: IO[bytes] | None = None
+        self._pending: set[asyncio.Task] = set()
+        self._slots = asyncio.Semaphore(self.max_workers * 2)
+
+    async def __aenter__(self) -> "ParseStage":
+        # "spawn" porque o processo pai tem várias threads (flows e tasks do Prefect), o que torna o fork inseguro
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self.dest_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._tmp_path, "wb")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            if self._pending:
+                await asyncio.gather(*self._pending, return_exceptions=True)
+        finally:
+            if self._pool is not None:
+                await asyncio.to_thread(self._pool.shutdown, cancel_futures=True)
+            if self._file is not None:
+                self._file.close()
+
+        if exc_type is None:
+            os.replace(self._tmp_path, self.dest_path)
+            logger.info(
+                f"Parsing: {self.records} registros de {self.pages} páginas gravados em {self.dest_path} ({self.errors} páginas com erro)"
+            )
+        else:
+            self._tmp_path.unlink(missing_ok=True)
+
+    async def submit(self, url: str, body: str):
+        """
+        Envia a página para o pool de processos e retorna sem esperar o parsing terminar.
+        """
+        await self._slots.acquire()
+        future = asyncio.get_running_loop().run_in_executor(
+            self._pool, self.parse, url, body
+        )
+        task = asyncio.create_task(self._collect(url, future))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _collect(self, url: str, future: asyncio.Future):
+        try:
+            records = await future
+            codec.write_ndjson(self._file, records)  # type: ignore
+            self.pages += 1
+            self.records += len(records)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Erro ao fazer o parsing da página {url}: {e}")
+        finally:
+            self._slots.release()
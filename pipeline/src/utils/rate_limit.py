@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+from prefect.logging import get_logger
+
+from config.loader import load_config
+
+APP_SETTINGS = load_config()
+
+logger = get_logger()
+
+
+class TokenBucket:
+    """
+    Token bucket com taxa (requisições/segundo) e rajada máxima.
+    É compartilhado por todas as tasks do processo. As flows rodam em threads distintas, cada uma com o seu
+    event loop, por isso o estado é protegido por um threading.Lock e nunca por primitivas do asyncio.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Reserva um token e retorna quantos segundos é preciso esperar para usá-lo.
+        O saldo pode ficar negativo: cada chamada reserva a sua vez na fila, então a espera
+        acontece fora do lock e a taxa total fica limitada mesmo com muitas tasks concorrentes.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def _hosts_config() -> dict[str, tuple[float, int]]:
+    """
+    Taxa e rajada configuradas por host em appsettings.toml (RATE_LIMIT_RPS / RATE_LIMIT_BURST).
+    """
+    camara = (APP_SETTINGS.CAMARA.RATE_LIMIT_RPS, APP_SETTINGS.CAMARA.RATE_LIMIT_BURST)
+    senado = (APP_SETTINGS.SENADO.RATE_LIMIT_RPS, APP_SETTINGS.SENADO.RATE_LIMIT_BURST)
+    tse = (APP_SETTINGS.TSE.RATE_LIMIT_RPS, APP_SETTINGS.TSE.RATE_LIMIT_BURST)
+
+    return {
+        urlparse(APP_SETTINGS.CAMARA.REST_BASE_URL).netloc: camara,
+        urlparse(APP_SETTINGS.CAMARA.PORTAL_BASE_URL).netloc: camara,
+        urlparse(APP_SETTINGS.SENADO.REST_BASE_URL).netloc: senado,
+        urlparse(APP_SETTINGS.TSE.BASE_URL).netloc: tse,
+    }
+
+
+def get_rate_limiter(url: str) -> TokenBucket | None:
+    """
+    Retorna o token bucket do host da URL, criado uma única vez por processo.
+    Hosts sem configuração não têm limite de taxa.
+    """
+    host = urlparse(url).netloc
+
+    with _buckets_lock:
+        if host not in _buckets:
+            config = _hosts_config().get(host)
+            if config is None:
+                return None
+            rate, burst = config
+            _buckets[host] = TokenBucket(rate=rate, burst=burst)
+            logger.info(
+                f"Limite de taxa do host {host}: {rate} requisições/s (rajada de {burst})"
+            )
+
+        return _buckets[host]
+
+
+async def acquire(url: str):
+    """
+    Aguarda a vez de fazer uma requisição para o host da URL.
+    """
+    bucket = get_rate_limiter(url)
+    if bucket is not None:
+        await bucket.acquire()
+
+
+def acquire_sync(url: str):
+    """
+    Versão síncrona de `acquire`, usada pelo fetch_json.
+    """
+    bucket = get_rate_limiter(url)
+    if bucket is not None:
+        bucket.acquire_sync()
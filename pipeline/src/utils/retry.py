@@ -0,0 +1,110 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import httpx
+
+from config.loader import load_config
+
+APP_SETTINGS = load_config()
+
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    """
+    Lê o header Retry-After, que pode vir em segundos ("120") ou como data HTTP ("Wed, 21 Oct 2015 07:28:00 GMT").
+    """
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def retry_delay(
+    error: BaseException,
+    attempt: int,
+    max_delay: float = APP_SETTINGS.ALLENDPOINTS.FETCH_RETRY_MAX_DELAY,
+) -> float:
+    """
+    Tempo de espera antes da próxima tentativa.
+    - Se o servidor enviou Retry-After (429/503), o valor dele é respeitado.
+    - Senão, backoff exponencial com jitter, para que as URLs que falharam juntas não voltem todas ao mesmo tempo.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        retry_after = retry_after_seconds(error.response)
+        if retry_after is not None:
+            return min(retry_after, max_delay)
+
+    backoff = min(2**attempt, max_delay)
+    return random.uniform(backoff / 2, backoff)
+
+
+class RetryScheduler:
+    """
+    Heap de retentativas com horário de vencimento, ligado à fila dos workers.
+    O worker agenda a retentativa e libera a vaga de concorrência em vez de dormir com ela, e o item só volta para a fila
+    quando o tempo de espera acaba.
+    O item original só é marcado como concluído (task_done) quando a retentativa entra na fila, assim o queue.join()
+    não termina enquanto houver retentativas pendentes.
+    """
+
+    def __init__(self, queue: asyncio.Queue):
+        self._queue = queue
+        self._heap: list[tuple[float, int, Any]] = []
+        # Desempate entre itens com o mesmo vencimento
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._runner: asyncio.Task | None = None
+
+    def start(self):
+        self._runner = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+
+    def schedule(self, item: Any, delay: float):
+        heapq.heappush(
+            self._heap, (time.monotonic() + delay, next(self._counter), item)
+        )
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            due, _, item = self._heap[0]
+            wait = due - time.monotonic()
+            if wait > 0:
+                # Acorda no vencimento ou antes, se um item com vencimento mais próximo for agendado
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            # Com fila limitada, espera uma vaga (os workers continuam consumindo)
+            await self._queue.put(item)
+            self._queue.task_done()
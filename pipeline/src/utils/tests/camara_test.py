@@ -2,7 +2,12 @@ from datetime import date
 
 import pytest
 
-from src.utils.camara import get_legislatura_data
+from src.tasks.load.camara.load_camara_eventos import (
+    eventos_orgaos_rows,
+    eventos_rows,
+)
+from src.utils.camara import get_legislatura_data, parse_assiduidade_html
+from src.utils.io import iter_ndjson, save_ndjson
 
 
 @pytest.fixture
@@ -107,6 +112,40 @@ def test_get_end_date_success(valid_legislatura_data):
     assert isinstance(result, date)
 
 
+def test_parse_assiduidade_html():
+    """Testa a extração dos registros de presença pelas colunas do cabeçalho da tabela."""
+    html = """
+    <table>
+      <tr><th>Data</th><th>Sessão</th><th>Presença</th><th>Justificativa</th></tr>
+      <tr><td>05/03/2024</td><td>Sessão Deliberativa</td><td>Presente</td><td></td></tr>
+      <tr><td>06/03/2024</td><td>Sessão Deliberativa</td><td>Ausente</td><td>Missão oficial</td></tr>
+    </table>
+    <table><tr><th>Outra</th></tr><tr><td>ignorada</td></tr></table>
+    """
+    url = "https://www.camara.leg.br/deputados/204554/presenca-plenario/2024"
+
+    records = parse_assiduidade_html(url, html)
+
+    assert records == [
+        {
+            "deputado_id": 204554,
+            "ano": 2024,
+            "data": "2024-03-05",
+            "sessao": "Sessão Deliberativa",
+            "presenca": "Presente",
+            "justificativa": None,
+        },
+        {
+            "deputado_id": 204554,
+            "ano": 2024,
+            "data": "2024-03-06",
+            "sessao": "Sessão Deliberativa",
+            "presenca": "Ausente",
+            "justificativa": "Missão oficial",
+        },
+    ]
+
+
 # ============= ERROR CASE TESTS =============
 
 
@@ -164,3 +203,31 @@ def test_id_as_string_number_converts():
     result = get_legislatura_data(data, "id")
     assert result == 57
     assert isinstance(result, int)
+
+
+def test_eventos_rows_lidos_do_ndjson(tmp_path):
+    """Testa se as duas passadas do load de eventos leem o NDJSON em disco, cada uma com seu próprio iterador."""
+    path = save_ndjson(
+        [
+            {
+                "dados": [
+                    {
+                        "id": 1,
+                        "dataHoraInicio": "2024-03-05T10:00",
+                        "situacao": "Encerrada",
+                        "descricaoTipo": "Sessão Deliberativa",
+                        "descricao": "Sessão",
+                        "localCamara": {"nome": "Plenário"},
+                        "orgaos": [{"id": 180}, {"id": 4}],
+                    }
+                ]
+            }
+        ],
+        tmp_path / "eventos.ndjson",
+    )
+
+    eventos = list(eventos_rows(iter_ndjson(path), id_lote=1))
+    eventos_orgaos = list(eventos_orgaos_rows(iter_ndjson(path), id_lote=1))
+
+    assert [e.id_evento for e in eventos] == [1]
+    assert [(o.id_evento, o.id_orgao) for o in eventos_orgaos] == [(1, 180), (1, 4)]
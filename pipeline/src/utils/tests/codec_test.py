@@ -0,0 +1,18 @@
+import io
+
+from src.utils import codec
+
+# ============= TESTS =============
+
+
+def test_ndjson_ida_e_volta():
+    """Testa se a gravação em lotes e a leitura preservam os registros, incluindo acentos."""
+    records = [{"id": i, "nome": "JOÃO", "valor": 1.5} for i in range(5)]
+    buffer = io.BytesIO()
+
+    count = codec.write_ndjson(buffer, records, batch_size=2)
+    buffer.seek(0)
+
+    assert count == 5
+    assert "JOÃO".encode() in buffer.getvalue()
+    assert list(codec.iter_ndjson(buffer)) == records
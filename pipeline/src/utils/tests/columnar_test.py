@@ -0,0 +1,101 @@
+from datetime import date, timedelta
+
+import pytest
+
+from src.tasks.load.camara.load_camara_orgaos_membros import (
+    membros_parquet_rows,
+    membros_rows,
+)
+from src.utils import codec, columnar, io
+from src.utils.columnar import flatten_records
+from src.utils.io import iter_ndjson, save_ndjson
+
+# ============= TESTS =============
+
+
+def test_flatten_records():
+    """Testa se as respostas da API viram uma linha plana por item de `dados`, com a URL de origem."""
+    records = [
+        {
+            "dados": [
+                {"id": 1, "ano": 2024, "statusProposicao": {"sigla": "PL"}},
+                {"id": 2, "ano": 2023, "temas": ["Saúde"]},
+            ],
+            "links": [{"rel": "self", "href": "https://x/proposicoes?pagina=1"}],
+        }
+    ]
+
+    rows = flatten_records(records)
+
+    assert rows[0]["statusProposicao_sigla"] == "PL"
+    assert rows[0]["_url"] == "https://x/proposicoes?pagina=1"
+    assert rows[1]["temas"] == '["Saúde"]'
+    assert [r["id"] for r in rows] == [1, 2]
+
+
+def test_save_parquet_em_lotes(tmp_path, monkeypatch):
+    """Testa se os lotes com colunas e tipos diferentes são gravados com um schema único."""
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(columnar, "PARQUET_BATCH_SIZE", 1)
+    path = tmp_path / "despesas.ndjson"
+    records = [
+        {"dados": [{"id": 1, "valor": 10}]},
+        {"dados": [{"id": "x2", "valor": 1.5, "extra": {"a": 1}}]},
+    ]
+    path.write_bytes(b"".join(codec.dumps_line(r) for r in records))
+
+    assert columnar.save_parquet(path) == str(tmp_path / "despesas.parquet")
+
+    df = columnar.load_parquet(path)
+    assert df["id"].tolist() == ["1", "x2"]
+    assert df["valor"].tolist() == [10.0, 1.5]
+    assert df["extra_a"].isna().tolist() == [True, False]
+
+
+def test_membros_parquet_rows(tmp_path, monkeypatch):
+    """Testa se o load de membros lido do Parquet (colunas e partição da legislatura atual) gera as mesmas linhas do NDJSON."""
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(io.APP_SETTINGS.LOAD, "PARQUET", True)
+    hoje = date.today()
+    legislaturas = {
+        "dados": [
+            {
+                "id": 57,
+                "dataInicio": str(hoje - timedelta(days=365)),
+                "dataFim": str(hoje + timedelta(days=365)),
+            }
+        ]
+    }
+    url = "https://dadosabertos.camara.leg.br/api/v2/orgaos/180/membros?itens=100"
+    records = [
+        {
+            "dados": [
+                {
+                    "id": 1,
+                    "idLegislatura": 57,
+                    "titulo": "Titular",
+                    "dataInicio": "2023-02-01",
+                    "dataFim": None,
+                    "nome": "Deputado 1",
+                },
+                {
+                    "id": 2,
+                    "idLegislatura": 54,
+                    "titulo": "Suplente",
+                    "dataInicio": "2011-02-01",
+                    "dataFim": "2015-01-31",
+                    "nome": "Deputado 2",
+                },
+            ],
+            "links": [{"rel": "self", "href": url}],
+        }
+    ]
+    path = save_ndjson(records, tmp_path / "orgaos_membros.ndjson")
+
+    assert columnar.has_parquet(path)
+    assert (tmp_path / "orgaos_membros.parquet" / "idLegislatura=57").is_dir()
+    parquet_rows = list(membros_parquet_rows(path, legislaturas, id_lote=1))
+    assert parquet_rows == list(membros_rows(iter_ndjson(path), legislaturas, 1))
+    assert [(r.id_orgao, r.id_deputado, r.data_fim) for r in parquet_rows] == [
+        (180, 1, None)
+    ]
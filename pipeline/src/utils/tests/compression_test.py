@@ -0,0 +1,41 @@
+import pytest
+
+from src.utils import compression
+from src.utils.codec import dumps_line
+from src.utils.io import load_ndjson, merge_ndjson, save_ndjson
+
+zstandard = pytest.importorskip("zstandard")
+
+# ============= TESTS =============
+
+
+def test_ndjson_zst_com_dicionario(tmp_path, monkeypatch):
+    """Testa gravação, leitura e merge (por concatenação de frames) de NDJSON .zst com dicionário treinado."""
+    monkeypatch.setattr(compression.APP_SETTINGS.LOAD, "ZSTD", True)
+    monkeypatch.setattr(
+        compression.APP_SETTINGS.LOAD, "ZSTD_DICT_DIR", str(tmp_path / "dicts")
+    )
+    monkeypatch.setattr(compression.APP_SETTINGS.LOAD, "ZSTD_DICT_SIZE", 4096)
+
+    records = [
+        {"id": i, "tipoDespesa": "COMBUSTÍVEIS E LUBRIFICANTES.", "valor": i * 1.5}
+        for i in range(2000)
+    ]
+    amostra = tmp_path / "amostra.ndjson"
+    amostra.write_bytes(b"".join(dumps_line(r) for r in records))
+    assert compression.train_dictionary("despesas", [amostra]) is not None
+
+    parte_1 = tmp_path / "despesas_1" / "despesas.ndjson"
+    parte_2 = tmp_path / "despesas_2" / "despesas.ndjson"
+    save_ndjson(records[:1000], parte_1)
+    save_ndjson(records[1000:], parte_2)
+
+    assert not parte_1.exists()
+    assert compression.frame_dict_id(compression.compressed_path(parte_1)) != 0
+    assert load_ndjson(parte_1) == records[:1000]
+
+    dest = tmp_path / "despesas.ndjson"
+    merge_ndjson([parte_1, parte_2], dest)
+
+    assert compression.compressed_path(dest).exists()
+    assert load_ndjson(dest) == records
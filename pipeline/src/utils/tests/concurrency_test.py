@@ -0,0 +1,55 @@
+import asyncio
+
+import httpx
+
+from src.utils.concurrency import AdaptiveLimiter
+
+
+def _status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://dadosabertos.camara.leg.br/api/v2/x")
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError("erro", request=request, response=response)
+
+
+# ============= TESTS =============
+
+
+def test_janela_cai_pela_metade_em_429():
+    """Testa a redução multiplicativa da janela quando o servidor responde 429."""
+    limiter = AdaptiveLimiter(host="h", task="t", initial=8, max_window=16)
+
+    async def run():
+        await limiter.record_failure(_status_error(429))
+        # Uma rajada de 429 dentro do cooldown conta como um único sinal
+        await limiter.record_failure(_status_error(429))
+
+    asyncio.run(run())
+    assert limiter.window == 4
+
+
+def test_janela_cresce_com_respostas_saudaveis():
+    """Testa o aumento aditivo da janela, limitado ao teto do host."""
+    limiter = AdaptiveLimiter(
+        host="h", task="t", initial=2, max_window=3, sample_size=5, latency_target=1.0
+    )
+
+    async def run():
+        for _ in range(15):
+            await limiter.record_success(0.1)
+
+    asyncio.run(run())
+    assert limiter.window == 3
+
+
+def test_janela_mantida_com_latencia_alta():
+    """Testa que a janela não cresce quando o p95 está acima do alvo."""
+    limiter = AdaptiveLimiter(
+        host="h", task="t", initial=2, max_window=8, sample_size=5, latency_target=1.0
+    )
+
+    async def run():
+        for _ in range(5):
+            await limiter.record_success(3.0)
+
+    asyncio.run(run())
+    assert limiter.window == 2
@@ -0,0 +1,203 @@
+import re
+from contextlib import asynccontextmanager
+from datetime import date
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.database.bulk import CsvCopyStream, HashDiff, Provenance, merge_statement
+from src.database.repository.camara.repository_camara_blocos import (
+    CAMARA_BLOCOS_PARTIDOS,
+)
+from src.database.repository.camara.repository_camara_orgaos import (
+    CAMARA_ORGAOS_MEMBROS,
+)
+from src.database.upsert import _as_tuples, _upsert_pipelined
+from src.utils.db import RowCounts, key_hash
+
+
+class FakeResult:
+    def __init__(self, rows: list[tuple]):
+        self.rows = rows
+
+    async def fetchall(self):
+        return self.rows
+
+    async def fetchone(self):
+        return self.rows[0]
+
+
+class FakeAsyncConnection:
+    """
+    Conexão psycopg assíncrona falsa: confere se os parâmetros de cada comando batem com os placeholders e
+    podem ser adaptados pelo psycopg, e guarda os comandos e os dados do COPY.
+    """
+
+    def __init__(self, known_hashes: list[tuple]):
+        self.known_hashes = known_hashes
+        self.executed: list[str] = []
+        self.copied = b""
+
+    async def execute(self, query: str, params: dict | None = None):
+        from psycopg.adapt import PyFormat, Transformer
+
+        params = params or {}
+        assert set(re.findall(r"%\((\w+)\)s", query)) == set(params)
+        transformer = Transformer()
+        for value in params.values():
+            if value is not None:
+                transformer.get_dumper(value, PyFormat.AUTO).dump(value)
+
+        self.executed.append(query)
+        if query.startswith("SELECT") and "hash_linha" in query:
+            return FakeResult(self.known_hashes)
+        if query.startswith("WITH src"):
+            return FakeResult([(1, 0)])
+        return FakeResult([])
+
+    @asynccontextmanager
+    async def pipeline(self):
+        yield
+
+    @asynccontextmanager
+    async def cursor(self):
+        yield self
+
+    @asynccontextmanager
+    async def copy(self, query: str):
+        self.executed.append(query)
+        yield self
+
+    async def write(self, data: bytes):
+        self.copied += data
+
+
+# ============= TESTS =============
+
+
+def test_csv_copy_stream():
+    """Testa se o CSV do COPY diferencia NULL de texto vazio e é lido aos poucos."""
+    rows = [(1, "Titular", None), (2, "", date(2024, 1, 31))]
+    stream = CsvCopyStream(rows)
+
+    data = b""
+    while chunk := stream.read(7):
+        data += chunk
+
+    assert data == b'"1","Titular",\n"2","","2024-01-31"\n'
+    assert stream.count == 2
+
+
+def test_merge_statement():
+    """Testa se o merge da staging remove chaves repetidas e atualiza só as colunas pedidas."""
+    table = CAMARA_ORGAOS_MEMBROS.table
+    stmt = merge_statement(
+        table,
+        "stg_camara_orgaos_membros",
+        ["id_lote", "id_orgao", "id_deputado", "titulo", "data_inicio", "data_fim"],
+        index_elements=["id_orgao", "id_deputado", "titulo", "data_inicio"],
+        update=["data_fim", "id_lote", "nao_carregada"],
+        prefer_not_null=["data_fim"],
+    )
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "SELECT DISTINCT ON (stg_camara_orgaos_membros.id_orgao" in sql
+    assert "data_fim IS NULL, stg_camara_orgaos_membros._ordem" in sql
+    assert "SET data_fim = excluded.data_fim, id_lote = excluded.id_lote" in sql
+    assert "RETURNING xmax" in sql
+
+
+def test_row_counts():
+    """Testa se as linhas que não foram inseridas nem atualizadas contam como ignoradas."""
+    counts = RowCounts()
+
+    counts.add(1, total=5, inserted=2, updated=1)
+
+    assert (counts.id_lote, counts.inserted, counts.updated, counts.ignored) == (
+        1,
+        2,
+        1,
+        2,
+    )
+
+
+def test_hash_diff_pula_linhas_inalteradas():
+    """Testa se só os registros novos ou alterados seguem para o COPY, já com o hash_linha."""
+    columns = ["id_lote", "id_partido", "sigla"]
+    known = {(10,): HashDiff({}, ["id_partido"], columns).row_hash((1, 10, "ABC"))}
+    diff = HashDiff(known, ["id_partido"], columns)
+
+    enviados = list(diff.filter([(2, 10, "ABC"), (2, 10, "XYZ"), (2, 11, "DEF")]))
+
+    assert [r[2] for r in enviados] == ["XYZ", "DEF"]
+    assert all(len(r[3]) == 32 for r in enviados)
+    assert diff.unchanged == 1
+
+
+def test_provenance_coleta_chaves_do_load():
+    """Testa se a proveniência guarda uma vez o hash da chave de cada registro que passa pelo load."""
+    provenance = Provenance(
+        ["id_deputado", "titulo"], ["id_lote", "id_deputado", "titulo"]
+    )
+    rows = [(1, 1, "Titular"), (1, 1, "Titular"), (1, 2, "Suplente")]
+
+    assert list(provenance.track(rows)) == rows
+    assert provenance.hashes == {key_hash([1, "Titular"]), key_hash([2, "Suplente"])}
+    # Mesmo valor de md5(concat_ws('|', 1, 'Titular')) no Postgres
+    assert key_hash([1, "Titular"]) == "f5966e89fd6708d32c9a60e5dd9a82c1"
+    # concat_ws omite os nulos e o boolean sai como t/f
+    assert key_hash([1, None, "Titular"]) == key_hash([1, "Titular"])
+    assert key_hash([True, 1]) == key_hash(["t", 1])
+
+
+def test_table_spec():
+    """Testa se a spec tira do metadata as colunas carregadas e as atualizadas no conflito."""
+    assert "id" not in CAMARA_ORGAOS_MEMBROS.columns
+    assert "hash_linha" not in CAMARA_BLOCOS_PARTIDOS.columns
+    assert CAMARA_ORGAOS_MEMBROS.update_columns == ("data_fim",)
+    assert CAMARA_BLOCOS_PARTIDOS.update_columns == ("id_bloco",)
+    assert CAMARA_BLOCOS_PARTIDOS.hashed
+
+
+def test_as_tuples():
+    """Testa se dicts viram tuplas só com as colunas da tabela, na ordem do primeiro registro."""
+    rows = [
+        {"id_lote": 1, "sigla": "ABC", "id_bloco": 5, "extra": True},
+        {"id_lote": 1, "sigla": "DEF", "id_bloco": 6, "extra": False},
+    ]
+
+    columns, tuples = _as_tuples(CAMARA_BLOCOS_PARTIDOS, rows, None)  # type: ignore
+
+    assert columns == ("id_lote", "sigla", "id_bloco")
+    assert list(tuples) == [(1, "ABC", 5), (1, "DEF", 6)]
+
+
+@pytest.mark.asyncio
+async def test_upsert_pipelined():
+    """Testa o load pela conexão psycopg assíncrona: hashes, staging, COPY, merge, proveniência e log."""
+    pytest.importorskip("psycopg")
+    spec = CAMARA_BLOCOS_PARTIDOS
+    columns = ("id_lote", "sigla", "id_bloco")
+    unchanged = HashDiff({}, spec.key, columns).row_hash((1, "ABC", 5))
+    aconn = FakeAsyncConnection(known_hashes=[("ABC", unchanged)])
+    rows = [
+        {"id_lote": 2, "sigla": "ABC", "id_bloco": 5},
+        {"id_lote": 2, "sigla": "DEF", "id_bloco": 6},
+    ]
+
+    counts = await _upsert_pipelined(aconn, spec, rows, None, log=True)
+
+    assert [q.split()[0] for q in aconn.executed] == [
+        "SELECT",
+        "DROP",
+        "CREATE",
+        "ALTER",
+        "COPY",
+        "WITH",
+        "INSERT",
+        "INSERT",
+    ]
+    assert "unnest(%(hashes)s::TEXT[])" in aconn.executed[6]
+    assert "INSERT INTO log_linhas" in aconn.executed[7]
+    assert aconn.copied.startswith(b'"2","DEF","6",')
+    assert (counts.total, counts.inserted, counts.unchanged) == (2, 1, 1)
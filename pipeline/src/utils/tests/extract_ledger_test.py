@@ -0,0 +1,42 @@
+import asyncio
+
+from src.database.models.base import ErrorExtract
+from src.utils import extract_ledger
+from src.utils.extract_ledger import ExtractLedger
+
+# ============= TESTS =============
+
+
+def test_gravacao_em_lote(monkeypatch):
+    """Testa se sucessos e falhas são acumulados e gravados em uma única chamada por tipo."""
+    calls = {}
+
+    def fake_insert(id_lote, errors):
+        calls["errors"] = errors
+
+    def fake_update(error_ids, id_lote):
+        calls["recovered"] = error_ids
+
+    monkeypatch.setattr(extract_ledger, "insert_extract_errors_bulk_db", fake_insert)
+    monkeypatch.setattr(
+        extract_ledger, "update_not_downloaded_urls_bulk_db", fake_update
+    )
+
+    ledger = ExtractLedger(
+        id_lote=1,
+        task="task",
+        not_downloaded_urls=[ErrorExtract(id=7, url="a"), ErrorExtract(id=8, url="b")],
+    )
+
+    async def run():
+        ledger.record_success("a")
+        ledger.record_success("a")  # A mesma URL não é atualizada duas vezes
+        ledger.record_success("c")
+        ledger.record_failure("d", status_code=500, message="erro")
+        await ledger.close()
+
+    asyncio.run(run())
+
+    assert calls["recovered"] == [7]
+    assert [error["url"] for error in calls["errors"]] == ["d"]
+    assert ledger.db_errors == 0
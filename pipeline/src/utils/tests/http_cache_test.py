@@ -0,0 +1,58 @@
+import pytest
+
+from src.utils.http_cache import HttpCache
+
+
+@pytest.fixture
+def cache(tmp_path) -> HttpCache:
+    """
+    Cache HTTP isolado em um diretório temporário.
+    """
+    return HttpCache(cache_dir=tmp_path / "http", max_bytes=10 * 1024 * 1024)
+
+
+URL = "https://dadosabertos.camara.leg.br/api/v2/deputados/204554"
+
+
+# ============= TESTS =============
+
+
+def test_store_and_get(cache):
+    """Testa se o corpo e os validadores da resposta são recuperados do disco."""
+    cache.store(URL, b'{"dados": {}}', {"etag": '"abc"', "x-total-count": "1"})
+
+    cached = cache.get(URL)
+
+    assert cached is not None
+    assert cached.body == b'{"dados": {}}'
+    assert cache.conditional_headers(cached) == {"If-None-Match": '"abc"'}
+    assert cached.headers["x-total-count"] == "1"
+
+
+def test_response_without_validators_is_not_stored(cache):
+    """Testa que respostas sem ETag e sem Last-Modified não são armazenadas."""
+    cache.store(URL, b"{}", {"content-type": "application/json"})
+
+    assert cache.get(URL) is None
+
+
+def test_bypass_ignores_stored_entries(cache):
+    """Testa que com refresh_cache o cache não é usado na revalidação, mas continua registrando as respostas."""
+    cache.store(URL, b"{}", {"last-modified": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    cache.bypass = True
+
+    assert cache.get(URL) is None
+
+    cache.record_miss("teste")
+    assert cache.stats("teste").bypassed == 1
+
+
+def test_eviction_by_size(tmp_path):
+    """Testa que as entradas mais antigas são descartadas quando o tamanho máximo é atingido."""
+    cache = HttpCache(cache_dir=tmp_path / "http", max_bytes=2500)
+
+    for i in range(5):
+        cache.store(f"{URL}?pagina={i}", b"x" * 1000, {"etag": str(i)})
+
+    assert cache.get(f"{URL}?pagina=0") is None
+    assert cache.get(f"{URL}?pagina=4") is not None
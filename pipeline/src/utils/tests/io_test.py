@@ -1,7 +1,30 @@
+import asyncio
+import hashlib
+import json
+import os
+import zipfile
+from io import BytesIO
+
+import httpx
 import pytest
 import requests
 
-from src.utils.io import fetch_html_many_async
+from src.utils import fetch_many_jsons, io
+from src.utils.camara import assiduidade_archive_key
+from src.utils.http_cache import HttpCache
+from src.utils.io import (
+    ZipMembersNotFound,
+    download_stream_async,
+    fetch_html_many_async,
+    fetch_html_many_to_zip,
+    iter_html_archive,
+    load_html_archive_index,
+    load_jsons_from_manifest,
+    load_manifest,
+    save_bytes,
+    save_manifest,
+    unzip_file,
+)
 
 
 @pytest.fixture
@@ -45,3 +68,185 @@ async def test_fetch_html_many_async(urls_paginas_html_deputados):
     assert items_downloaded == expected_count, (
         f"Esperava por {expected_count} resultados baixados, mas retornaram {items_downloaded}"
     )
+
+
+def test_manifest_selective_read(tmp_path):
+    """
+    Teste da leitura seletiva de JSONs gravados em disco a partir do manifest.
+    """
+    url_1 = "https://dadosabertos.camara.leg.br/api/v2/deputados/1"
+    url_2 = "https://dadosabertos.camara.leg.br/api/v2/deputados/2"
+
+    path_1 = save_bytes(b'{"dados": {"id": 1}}', tmp_path / "1.json")
+    path_2 = save_bytes(b'{"dados": {"id": 2}}', tmp_path / "2.json")
+
+    save_manifest({url_1: {"path": path_1, "status": 200, "bytes": 20}}, tmp_path)
+    save_manifest({url_2: {"path": path_2, "status": 304, "bytes": 20}}, tmp_path)
+
+    manifest = load_manifest(tmp_path)
+    results = load_jsons_from_manifest(tmp_path, urls=[url_2])
+
+    assert set(manifest) == {url_1, url_2}, (
+        "O manifest deve manter as entradas anteriores"
+    )
+    assert results == [{"dados": {"id": 2}}]
+
+
+@pytest.mark.asyncio
+async def test_download_stream_resume(tmp_path, monkeypatch):
+    """Testa se o download continua do .part existente com Range e confere o MD5 do ETag."""
+    data = bytes(range(256)) * 100
+    etag = f'"{hashlib.md5(data).hexdigest()}"'
+    ranges = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        headers = {"accept-ranges": "bytes", "etag": etag}
+        if request.method == "HEAD":
+            return httpx.Response(
+                200, headers={**headers, "content-length": str(len(data))}
+            )
+        ranges.append(request.headers.get("range"))
+        start = int(request.headers["range"].split("=")[1].rstrip("-"))
+        return httpx.Response(206, content=data[start:], headers=headers)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(io, "get_async_client", lambda url: client)
+
+    dest_path = tmp_path / "2024.zip"
+    # Tentativa anterior interrompida no meio do arquivo
+    (tmp_path / "2024.zip.part").write_bytes(data[:1000])
+    (tmp_path / "2024.zip.part.json").write_text(
+        json.dumps({"etag": etag, "size": len(data)})
+    )
+    # .sha256 de um download anterior, ligado por hardlink ao arquivo de um lote
+    (tmp_path / "2024.zip.sha256").write_text("antigo")
+    os.link(tmp_path / "2024.zip.sha256", tmp_path / "lote.sha256")
+
+    result = await download_stream_async(
+        url="https://cdn.tse.jus.br/estatistica/2024.zip",
+        id_lote=1,
+        task="task",
+        dest_path=dest_path,
+        segments=1,
+    )
+
+    assert result == str(dest_path)
+    assert ranges == ["bytes=1000-"]
+    assert dest_path.read_bytes() == data
+    assert (
+        (tmp_path / "2024.zip.sha256")
+        .read_text()
+        .startswith(hashlib.sha256(data).hexdigest())
+    )
+    assert (tmp_path / "lote.sha256").read_text() == "antigo"
+
+
+@pytest.mark.asyncio
+async def test_fetch_html_many_to_zip(tmp_path, monkeypatch):
+    """Testa se cada corpo distinto é gravado uma única vez e indexado pela chave da URL requisitada."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        # Mesmo corpo para todos os deputados no mesmo ano
+        return httpx.Response(200, text=f"<html>{request.url.path[-4:]}</html>")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(io, "get_async_client", lambda url: client)
+    cache = HttpCache(cache_dir=tmp_path / "cache", max_bytes=1024 * 1024)
+    monkeypatch.setattr(io, "get_http_cache", lambda: cache)
+
+    urls = [
+        f"https://www.camara.leg.br/deputados/{id}/presenca-plenario/{ano}"
+        for id in (204554, 220593)
+        for ano in (2023, 2024)
+    ]
+
+    result = await fetch_html_many_to_zip(
+        urls=urls + urls[:1],
+        not_downloaded_urls=[],
+        id_lote=1,
+        task="task",
+        zip_path=tmp_path / "assiduidade.zip",
+        key=assiduidade_archive_key,
+        limit=2,
+    )
+
+    index = load_html_archive_index(result)
+    with zipfile.ZipFile(result) as zf:
+        objects = [n for n in zf.namelist() if n.startswith("objects/")]
+
+    assert sorted(index) == ["204554_2023", "204554_2024", "220593_2023", "220593_2024"]
+    assert len(objects) == 2
+    assert dict(iter_html_archive(result))["220593_2024"] == "<html>2024</html>"
+    assert not (tmp_path / "assiduidade.zip.tmp").exists()
+
+
+def test_unzip_file_members(tmp_path):
+    """Testa se só os arquivos do filtro são extraídos e se o filtro sem nenhum arquivo é um erro."""
+    zip_path = tmp_path / "2024.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("consulta_cand_2024_BRASIL.csv", "NM_CANDIDATO;SG_UF\nJOÃO;SP\n")
+        zf.writestr("consulta_cand_2024_SP.csv", "NM_CANDIDATO;SG_UF\nJOÃO;SP\n")
+        zf.writestr("leiame.pdf", b"%PDF")
+
+    extracted = unzip_file(zip_path, members="*_BRASIL.csv")
+
+    with pytest.raises(ZipMembersNotFound):
+        unzip_file(zip_path, members="*_BR.csv")
+    assert extracted == [str(tmp_path / "consulta_cand_2024_BRASIL.csv")]
+    assert not (tmp_path / "consulta_cand_2024_SP.csv").exists()
+    assert not (tmp_path / "leiame.pdf").exists()
+
+
+@pytest.mark.asyncio
+async def test_download_stream_mantem_zip_sem_arquivos_do_filtro(tmp_path, monkeypatch):
+    """Testa se o zip baixado é mantido e a task falha quando nenhum arquivo passa pelo filtro."""
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("leiame.pdf", b"%PDF")
+    data = buffer.getvalue()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        headers = {"content-length": str(len(data))}
+        return httpx.Response(
+            200, content=b"" if request.method == "HEAD" else data, headers=headers
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(io, "get_async_client", lambda url: client)
+    monkeypatch.setattr(io, "insert_extract_error_db", lambda **kwargs: None)
+
+    dest_path = tmp_path / "2024.zip"
+    with pytest.raises(ZipMembersNotFound):
+        await download_stream_async(
+            url="https://cdn.tse.jus.br/estatistica/2024.zip",
+            id_lote=1,
+            task="task",
+            dest_path=dest_path,
+            unzip=True,
+            members="*_BRASIL.csv",
+            segments=1,
+        )
+
+    assert dest_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_iter_many_jsons_consumidor_para_antes(monkeypatch):
+    """Testa se o produtor termina quando o consumidor para de ler com a fila cheia."""
+
+    async def fake_fetch_many(on_result, **kwargs):
+        for i in range(10):
+            await on_result({"i": i})
+
+    monkeypatch.setattr(fetch_many_jsons, "_fetch_many", fake_fetch_many)
+
+    pages = fetch_many_jsons.iter_many_jsons(
+        urls=[], not_downloaded_urls=[], task="task", id_lote=1, buffer_size=1
+    )
+    assert await anext(pages) == {"i": 0}
+    # Deixa o produtor encher a fila e ficar bloqueado nela
+    await asyncio.sleep(0.01)
+    await pages.aclose()
+    await asyncio.sleep(0.01)
+
+    assert asyncio.all_tasks() == {asyncio.current_task()}
@@ -0,0 +1,52 @@
+import os
+import time
+
+import pytest
+
+from src.utils import lote_archive
+from src.utils.io import save_ndjson
+
+# ============= TESTS =============
+
+
+def test_archive_e_replay_lote(tmp_path, monkeypatch):
+    """Testa se o replay lê os arquivos do lote mesmo após uma nova extração e se a corrupção é detectada."""
+    extract_dir = tmp_path / "extract"
+    monkeypatch.setattr(lote_archive, "extract_dirs", lambda: [extract_dir])
+    monkeypatch.setattr(
+        lote_archive, "lote_dir", lambda id_lote: tmp_path / "lotes" / str(id_lote)
+    )
+
+    # Arquivo de uma task ignorada no lote: ficou no ExtractOutDir de uma execução anterior
+    stale = extract_dir / "orgaos.ndjson"
+    save_ndjson([{"id": 9}], stale)
+    for old_file in extract_dir.iterdir():
+        os.utime(old_file, ns=(0, 0))
+
+    started_ns = time.time_ns()
+    path = extract_dir / "deputados.ndjson"
+    save_ndjson([{"id": 1}, {"id": 2}], path)
+
+    lote_archive.archive_extracts(
+        1, since_ns=started_ns, skipped_tasks=["extract_camara_orgaos"]
+    )
+    manifest = lote_archive.load_lote_manifest(1)
+    assert path.as_posix() in manifest["files"]
+    assert not any(name.startswith(stale.as_posix()) for name in manifest["files"])
+    assert manifest["files"][path.as_posix()]["rows"] == 2
+    assert manifest["skipped_tasks"] == ["extract_camara_orgaos"]
+
+    # Nova extração: o replay do lote 1 continua lendo o arquivo do lote
+    save_ndjson([{"id": 3}], path)
+    lote_archive.check_lote(1)
+    replay_path = lote_archive.extract_path(path, replay_lote=1)
+    assert open(replay_path, "rb").read().count(b"\n") == 2
+    assert lote_archive.extract_path(path) == str(path)
+    with pytest.raises(FileNotFoundError):
+        lote_archive.extract_path(stale, replay_lote=1)
+
+    os.unlink(replay_path)
+    with open(replay_path, "w") as f:
+        f.write('{"id":1}\n')
+    with pytest.raises(ValueError):
+        lote_archive.check_lote(1)
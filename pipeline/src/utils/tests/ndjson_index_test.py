@@ -0,0 +1,63 @@
+import os
+
+from src.check_extracted_data import missing_orgaos_ids
+from src.utils.io import save_ndjson
+from src.utils.ndjson_index import index_path, indexed_ids, load_ndjson_by_ids
+
+# ============= TESTS =============
+
+
+def test_load_ndjson_by_ids(tmp_path):
+    """Testa se o índice gravado pelo save_ndjson permite ler só as entidades pedidas."""
+    path = tmp_path / "deputados.ndjson"
+    records = [
+        {
+            "dados": [
+                {"id": i, "nome": f"Deputado {i}"} for i in range(p * 10, p * 10 + 10)
+            ]
+        }
+        for p in range(5)
+    ]
+
+    save_ndjson(records, path)
+
+    assert index_path(path).exists()
+    assert len(indexed_ids(path)) == 50
+    assert load_ndjson_by_ids(path, [3, 42, 999]) == [
+        {"id": 3, "nome": "Deputado 3"},
+        {"id": 42, "nome": "Deputado 42"},
+    ]
+
+
+def test_load_ndjson_by_ids_indice_desatualizado(tmp_path):
+    """Testa se o índice é remontado quando o NDJSON muda depois de gravado."""
+    path = tmp_path / "orgaos.ndjson"
+    save_ndjson([{"dados": [{"id": 1}]}], path)
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"dados": [{"id": 2, "sigla": "CCJC"}]}\n')
+
+    assert load_ndjson_by_ids(path, [2]) == [{"id": 2, "sigla": "CCJC"}]
+
+
+def test_load_ndjson_by_ids_regravado_com_mesmo_tamanho(tmp_path):
+    """Testa se o índice é remontado quando o NDJSON é regravado com o mesmo tamanho."""
+    path = tmp_path / "orgaos.ndjson"
+    save_ndjson([{"dados": [{"id": 1}]}, {"dados": [{"id": 2}]}], path)
+    size, mtime_ns = path.stat().st_size, path.stat().st_mtime_ns
+
+    path.write_bytes(b'{"dados":[{"id":2}]}\n{"dados":[{"id":1}]}\n')
+    os.utime(path, ns=(mtime_ns + 1_000_000, mtime_ns + 1_000_000))
+
+    assert path.stat().st_size == size
+    assert load_ndjson_by_ids(path, [1]) == [{"id": 1}]
+
+
+def test_missing_orgaos_ids_com_evento_sem_orgaos():
+    """Testa se um evento sem órgãos não faz todos os órgãos aparecerem como ausentes."""
+    eventos = [
+        {"id": 1, "orgaos": [{"id": 180}, {"id": 4}]},
+        {"id": 2, "orgaos": []},
+    ]
+
+    assert missing_orgaos_ids(eventos, {"180"}) == [4]
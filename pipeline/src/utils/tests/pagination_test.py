@@ -0,0 +1,34 @@
+from src.utils.pagination import (
+    PageCountStore,
+    last_page_from_total,
+    page_key,
+    page_urls,
+)
+
+URL = (
+    "https://dadosabertos.camara.leg.br/api/v2/eventos?dataInicio=2024-01-01&itens=100"
+)
+
+
+# ============= TESTS =============
+
+
+def test_page_key_ignora_pagina():
+    """Testa se todas as páginas de uma consulta compartilham a mesma chave."""
+    assert page_key(URL) == page_key(page_urls(URL, 3)[1])
+
+
+def test_last_page_from_total():
+    """Testa o cálculo da última página a partir do x-total-count e do parâmetro itens."""
+    assert last_page_from_total(URL, 250) == 3
+    assert last_page_from_total(URL, 0) == 1
+    # Sem o parâmetro itens o tamanho da página é desconhecido
+    assert last_page_from_total(URL.replace("&itens=100", ""), 250) is None
+
+
+def test_page_count_store(tmp_path):
+    """Testa se o número de páginas persistido é lido de volta por uma nova instância."""
+    path = tmp_path / "page_counts.json"
+    PageCountStore(path).update({page_key(URL): 7})
+
+    assert PageCountStore(path).get(page_key(URL)) == 7
@@ -0,0 +1,22 @@
+from src.utils.rate_limit import TokenBucket
+
+# ============= TESTS =============
+
+
+def test_rajada_sem_espera():
+    """Testa se as primeiras requisições, até o tamanho da rajada, não esperam."""
+    bucket = TokenBucket(rate=10, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+
+def test_espera_proporcional_a_taxa():
+    """Testa se, com a rajada esgotada, cada reserva entra na fila respeitando a taxa."""
+    bucket = TokenBucket(rate=10, burst=1)
+    bucket.reserve()
+
+    first = bucket.reserve()
+    second = bucket.reserve()
+
+    assert 0.05 < first <= 0.1
+    assert 0.15 < second <= 0.2
@@ -0,0 +1,59 @@
+import asyncio
+
+import httpx
+
+from src.utils.retry import RetryScheduler, retry_delay
+
+
+def _status_error(status_code: int, headers: dict | None = None):
+    request = httpx.Request("GET", "https://dadosabertos.camara.leg.br/api/v2/x")
+    response = httpx.Response(status_code, request=request, headers=headers)
+    return httpx.HTTPStatusError("erro", request=request, response=response)
+
+
+# ============= TESTS =============
+
+
+def test_retry_after_respeitado():
+    """Testa se o header Retry-After (em segundos) define a espera até a próxima tentativa."""
+    error = _status_error(429, {"Retry-After": "7"})
+
+    assert retry_delay(error, attempt=0) == 7
+
+
+def test_backoff_com_jitter():
+    """Testa se, sem Retry-After, a espera fica entre metade e o total do backoff exponencial."""
+    error = _status_error(500)
+
+    delays = [retry_delay(error, attempt=3) for _ in range(50)]
+
+    assert all(4 <= delay <= 8 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_scheduler_mantem_join_ate_a_retentativa():
+    """Testa se o queue.join() só termina depois que a retentativa agendada volta para a fila e é processada."""
+    processed = []
+
+    async def run():
+        queue = asyncio.Queue()
+        retries = RetryScheduler(queue)
+        retries.start()
+        await queue.put(("url", 0))
+
+        async def worker():
+            while True:
+                url, attempt = await queue.get()
+                processed.append(attempt)
+                if attempt == 0:
+                    retries.schedule((url, attempt + 1), 0.05)
+                else:
+                    queue.task_done()
+
+        w = asyncio.create_task(worker())
+        await asyncio.wait_for(queue.join(), timeout=2)
+        w.cancel()
+        retries.stop()
+
+    asyncio.run(run())
+    assert processed == [0, 1]